@@ -9,15 +9,152 @@ import random
 import re
 import json
 import logging
-from datetime import date
+import queue
+import atexit
+import pickle
+import heapq
+import codecs
+import math
+import bisect
+import csv
+import io
+import sqlite3
+import sys
+import email.utils
+from logging.handlers import QueueHandler, QueueListener
+from datetime import date, datetime, timedelta, timezone
 from urllib.parse import quote
 import urllib.parse
 import threading
-from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import itertools
+import uuid
+import html
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
 
 app = Flask(__name__)
 
-logging.basicConfig(level=logging.INFO)
+#############################################
+# 로깅 (큐 + 백그라운드 writer 스레드)
+#############################################
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+# 예: 'DEBUG=0.01,INFO=0.1' (기본은 샘플링 없음)
+LOG_SAMPLE_RATES = os.environ.get('LOG_SAMPLE_RATES', '')
+
+# 캐시 히트처럼 요청마다 반복되는 로그에 extra=SAMPLED 로 표시
+SAMPLED = {"sampled": True}
+
+def parse_sample_rates(value):
+    """'DEBUG=0.01,INFO=0.1' → {레벨 번호: 비율}"""
+    rates = {}
+    for part in value.split(","):
+        if "=" not in part:
+            continue
+        level, rate = part.split("=", 1)
+        rates[logging.getLevelName(level.strip().upper())] = float(rate)
+    return rates
+
+class SamplingFilter(logging.Filter):
+    """SAMPLED 표시 로그는 레벨별 비율만 통과시키고, 현재 trace ID 를 기록에 붙임"""
+    
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+    
+    def filter(self, record):
+        if getattr(record, "sampled", False):
+            rate = self.rates.get(record.levelno, 1.0)
+            if rate < 1.0 and random.random() >= rate:
+                return False
+        
+        trace = _current_trace.get()
+        if trace is not None:
+            record.trace_id = trace.trace_id
+        return True
+
+class JsonLogFormatter(logging.Formatter):
+    """한 줄 JSON 로그"""
+    
+    def format(self, record):
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName
+        }
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            payload["trace_id"] = trace_id
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+class DeferredQueueHandler(QueueHandler):
+    """포맷팅은 writer 스레드로 미루고, 큐가 가득 차면 요청 스레드를 막지 않고 버림"""
+    
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.dropped_lock = threading.Lock()
+    
+    def prepare(self, record):
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.dropped_lock:
+                self.dropped += 1
+
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(
+    JsonLogFormatter() if LOG_FORMAT == "json" else logging.Formatter("%(levelname)s:%(name)s:%(message)s")
+)
+log_queue_handler = DeferredQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+log_queue_handler.addFilter(SamplingFilter(parse_sample_rates(LOG_SAMPLE_RATES)))
+log_listener = None
+_log_listener_pid = None
+
+def configure_logging():
+    """루트 로거에 큐 핸들러를 달고 writer 스레드 시작
+    
+    import 시에는 아무것도 하지 않고, 실행 진입점 (__main__, gunicorn post_fork, ASGI lifespan) 에서
+    프로세스마다 한 번 호출한다. fork 된 자식에서 다시 부르면 새 큐/스레드로 시작한다.
+    """
+    global log_listener, _log_listener_pid
+    pid = os.getpid()
+    if _log_listener_pid == pid:
+        return
+    if _log_listener_pid is not None:
+        # 부모의 writer 스레드는 자식에 없으므로 큐만 새로 만듦
+        log_queue_handler.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    else:
+        atexit.register(stop_log_listener)
+    
+    root = logging.getLogger()
+    if log_queue_handler not in root.handlers:
+        root.addHandler(log_queue_handler)
+    root.setLevel(LOG_LEVEL)
+    log_listener = QueueListener(log_queue_handler.queue, log_stream_handler)
+    log_listener.start()
+    _log_listener_pid = pid
+
+def stop_log_listener():
+    """남은 로그를 모두 쓰고 writer 스레드 종료 (이 프로세스가 시작한 경우만)"""
+    global log_listener, _log_listener_pid
+    if log_listener is not None and _log_listener_pid == os.getpid():
+        log_listener.stop()
+        log_listener = None
+        _log_listener_pid = None
+
 logger = logging.getLogger(__name__)
 
 #############################################
@@ -31,6 +168,17 @@ NAVER_CLIENT_SECRET = os.environ.get('NAVER_CLIENT_SECRET', '')
 KAKAO_REST_API_KEY = os.environ.get('KAKAO_REST_API_KEY', '')
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
 
+#############################################
+# 업스트림 주소 (로컬 스텁 서버로 교체 가능)
+#############################################
+SEARCHAD_BASE_URL = os.environ.get('SEARCHAD_BASE_URL', 'https://api.searchad.naver.com')
+NAVER_OPENAPI_BASE_URL = os.environ.get('NAVER_OPENAPI_BASE_URL', 'https://openapi.naver.com')
+NAVER_SEARCH_BASE_URL = os.environ.get('NAVER_SEARCH_BASE_URL', 'https://search.naver.com')
+NAVER_AC_BASE_URL = os.environ.get('NAVER_AC_BASE_URL', 'https://ac.search.naver.com')
+YOUTUBE_AC_BASE_URL = os.environ.get('YOUTUBE_AC_BASE_URL', 'https://suggestqueries.google.com')
+NAVER_PLACE_BASE_URL = os.environ.get('NAVER_PLACE_BASE_URL', 'https://m.place.naver.com')
+GEMINI_BASE_URL = os.environ.get('GEMINI_BASE_URL', 'https://generativelanguage.googleapis.com')
+
 #############################################
 # 사용자 세션 저장소 (메모리 기반)
 #############################################
@@ -42,6 +190,325 @@ user_sessions = {}
 api_cache = {}
 cache_lock = threading.Lock()
 
+#############################################
+# 업스트림 병렬 호출용 공용 스레드풀
+#############################################
+upstream_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('UPSTREAM_WORKERS', 16)),
+    thread_name_prefix="upstream"
+)
+
+#############################################
+# 업스트림 커넥션 풀 (keep-alive 재사용)
+#############################################
+UPSTREAM_POOL_SIZE = int(os.environ.get('UPSTREAM_POOL_SIZE', 32))
+
+def create_upstream_session():
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=UPSTREAM_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+upstream_session = create_upstream_session()
+
+def reset_upstream_session():
+    """fork 된 워커가 부모의 소켓을 공유하지 않도록 새 풀 생성"""
+    global upstream_session
+    upstream_session = create_upstream_session()
+
+os.register_at_fork(after_in_child=reset_upstream_session)
+
+def warm_upstream_connections(timeout=3):
+    """업스트림마다 커넥션을 하나씩 미리 열어 첫 요청의 TLS 핸드셰이크를 없앰"""
+    base_urls = {
+        SEARCHAD_BASE_URL, NAVER_OPENAPI_BASE_URL, NAVER_SEARCH_BASE_URL,
+        NAVER_AC_BASE_URL, YOUTUBE_AC_BASE_URL, NAVER_PLACE_BASE_URL, GEMINI_BASE_URL
+    }
+    
+    def touch(url):
+        try:
+            upstream_session.head(url, timeout=timeout)
+            return True
+        except requests.RequestException:
+            return False
+    
+    results = list(upstream_executor.map(touch, base_urls))
+    logger.info("🔥 업스트림 커넥션 예열: %d/%d", sum(results), len(results))
+    return sum(results)
+
+#############################################
+# 키워드 인기도 (Count-Min Sketch + Space-Saving, 고정 메모리)
+#############################################
+class CountMinSketch:
+    """depth × width 카운터로 임의 키의 빈도를 과대추정 방향으로 근사"""
+    
+    def __init__(self, width=2048, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+    
+    def _indexes(self, key):
+        return [hash((i, key)) % self.width for i in range(self.depth)]
+    
+    def add(self, key, amount=1):
+        """conservative update: 최소값인 칸만 올려 과대추정을 줄임"""
+        indexes = self._indexes(key)
+        target = min(row[j] for row, j in zip(self.rows, indexes)) + amount
+        for row, j in zip(self.rows, indexes):
+            if row[j] < target:
+                row[j] = target
+        return target
+    
+    def estimate(self, key):
+        return min(row[j] for row, j in zip(self.rows, self._indexes(key)))
+    
+    def halve(self):
+        for row in self.rows:
+            for j in range(self.width):
+                row[j] >>= 1
+
+class SpaceSaving:
+    """상위 capacity 개 키만 추적; 가득 차면 최소 항목을 새 키로 교체 (count, error)"""
+    
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.items = {}
+    
+    def add(self, key, amount=1):
+        if key in self.items:
+            count, error = self.items[key]
+            self.items[key] = (count + amount, error)
+        elif len(self.items) < self.capacity:
+            self.items[key] = (amount, 0)
+        else:
+            victim = min(self.items, key=lambda k: self.items[k][0])
+            floor = self.items.pop(victim)[0]
+            self.items[key] = (floor + amount, floor)
+    
+    def top(self, n):
+        return heapq.nlargest(n, ((k, c) for k, (c, _) in self.items.items()), key=lambda kv: kv[1])
+    
+    def halve(self):
+        self.items = {k: (c >> 1, e >> 1) for k, (c, e) in self.items.items() if c >> 1}
+
+class KeywordPopularity:
+    """스킬 요청 키워드 빈도 추적 (전체 + 명령어별 top-K)
+    
+    additions 가 decay_every 에 닿으면 전부 반감해 최근 인기를 더 크게 반영한다.
+    """
+    
+    def __init__(self, width=2048, depth=4, top_k=100, decay_every=20000):
+        self.sketch = CountMinSketch(width, depth)
+        self.top_k = top_k
+        self.overall = SpaceSaving(top_k)
+        self.by_command = {}
+        self.decay_every = decay_every
+        self.additions = 0
+        self.lock = threading.Lock()
+    
+    def record(self, keyword, command="search"):
+        with self.lock:
+            self.sketch.add(keyword)
+            self.overall.add(keyword)
+            tracker = self.by_command.get(command)
+            if tracker is None:
+                tracker = self.by_command[command] = SpaceSaving(self.top_k)
+            tracker.add(keyword)
+            
+            self.additions += 1
+            if self.additions >= self.decay_every:
+                self.sketch.halve()
+                self.overall.halve()
+                for tracker in self.by_command.values():
+                    tracker.halve()
+                self.additions = 0
+    
+    def estimate(self, keyword):
+        """임의 키워드의 (감쇠된) 요청 빈도 추정치"""
+        with self.lock:
+            return self.sketch.estimate(keyword)
+    
+    def top(self, n=10, command=None):
+        """[(keyword, count)] 빈도 내림차순"""
+        with self.lock:
+            tracker = self.overall if command is None else self.by_command.get(command)
+            return tracker.top(n) if tracker else []
+    
+    def snapshot(self, n=10):
+        with self.lock:
+            return {
+                "overall": self.overall.top(n),
+                "by_command": {command: tracker.top(n) for command, tracker in self.by_command.items()}
+            }
+
+keyword_popularity = KeywordPopularity(
+    width=int(os.environ.get('KEYWORD_SKETCH_WIDTH', 2048)),
+    top_k=int(os.environ.get('KEYWORD_TOP_K', 100))
+)
+
+#############################################
+# API 캐시 크기 제한 (인기도 기반 제거)
+#############################################
+API_CACHE_MAX_ENTRIES = int(os.environ.get('API_CACHE_MAX_ENTRIES', 5000))
+
+def cache_key_keyword(key):
+    """캐시 키 → 인기도 조회용 키워드 (dl_ 은 기간 제거)"""
+    namespace, _, rest = key.partition("_")
+    if namespace == "dl":
+        return rest.rsplit("_", 2)[0]
+    if namespace == "perf":
+        return rest.rsplit("_", 1)[0]
+    return rest
+
+def evict_cache_entries_locked():
+    """cache_lock 보유 상태에서 호출; 인기도 낮고 오래된 항목부터 90% 까지 줄임"""
+    excess = len(api_cache) - int(API_CACHE_MAX_ENTRIES * 0.9)
+    if excess <= 0:
+        return 0
+    victims = heapq.nsmallest(
+        excess,
+        api_cache.items(),
+        key=lambda kv: (keyword_popularity.estimate(cache_key_keyword(kv[0])), kv[1][1])
+    )
+    for key, _ in victims:
+        del api_cache[key]
+    logger.info("🧹 캐시 제거: %d건", len(victims))
+    return len(victims)
+
+def store_cache_entry(key, data):
+    with cache_lock:
+        api_cache[key] = (data, time.time())
+        if len(api_cache) > API_CACHE_MAX_ENTRIES:
+            evict_cache_entries_locked()
+
+#############################################
+# 업스트림 호출 속도 제한 (토큰 버킷)
+#############################################
+class TokenBucket:
+    """초당 rate 개씩 채워지고 최대 burst 개까지 모아 쓰는 토큰 버킷"""
+    
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, timeout=None):
+        """토큰 하나를 얻을 때까지 대기, timeout 이 지나면 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+_upstream_limiter = contextvars.ContextVar("upstream_limiter", default=None)
+
+@contextmanager
+def rate_limited(limiter):
+    """이 블록(과 submit_with_context 로 넘긴 작업)의 업스트림 호출을 limiter 로 제한"""
+    token = _upstream_limiter.set(limiter)
+    try:
+        yield
+    finally:
+        _upstream_limiter.reset(token)
+
+#############################################
+# API 캐시 스냅샷 (워커 재시작 시 복원)
+#############################################
+CACHE_SNAPSHOT_PATH = os.environ.get('CACHE_SNAPSHOT_PATH', '')
+CACHE_SNAPSHOT_MAX_AGE = int(os.environ.get('CACHE_SNAPSHOT_MAX_AGE', 3600))
+# 캐시 값 형식이 바뀌면 올림 (이전 형식 스냅샷은 버림)
+CACHE_SNAPSHOT_VERSION = 2
+
+def save_cache_snapshot(path=None):
+    """api_cache 를 파일로 저장 (임시 파일 → rename 으로 원자적 교체)"""
+    path = path or CACHE_SNAPSHOT_PATH
+    if not path:
+        return 0
+    
+    now = time.time()
+    with cache_lock:
+        entries = {k: v for k, v in api_cache.items() if now - v[1] < CACHE_SNAPSHOT_MAX_AGE}
+    
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": CACHE_SNAPSHOT_VERSION, "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError) as e:
+        logger.error("❌ 캐시 스냅샷 저장 실패: %s", e)
+        return 0
+    
+    logger.info("💾 캐시 스냅샷 저장: %d건", len(entries))
+    return len(entries)
+
+def load_cache_snapshot(path=None):
+    """저장된 스냅샷 중 아직 유효한 항목만 api_cache 로 복원"""
+    path = path or CACHE_SNAPSHOT_PATH
+    if not path or not os.path.exists(path):
+        return 0
+    
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+        logger.error("❌ 캐시 스냅샷 로드 실패: %s", e)
+        return 0
+    
+    if not isinstance(snapshot, dict) or snapshot.get("version") != CACHE_SNAPSHOT_VERSION:
+        logger.warning("⚠️ 캐시 스냅샷 형식이 달라 무시: %s", path)
+        return 0
+    entries = snapshot["entries"]
+    
+    now = time.time()
+    loaded = 0
+    with cache_lock:
+        for key, (data, ts) in entries.items():
+            if now - ts >= CACHE_SNAPSHOT_MAX_AGE:
+                continue
+            current = api_cache.get(key)
+            if current is None or current[1] < ts:
+                api_cache[key] = (data, ts)
+                loaded += 1
+    
+    logger.info("💾 캐시 스냅샷 복원: %d건", loaded)
+    return loaded
+
+#############################################
+# 로컬 sqlite 저장소
+#############################################
+def local_sqlite(path, schema, local):
+    """스레드(와 프로세스)별 sqlite 연결 (autocommit), 처음 열 때 스키마 생성"""
+    conn = getattr(local, "conn", None)
+    if conn is None or local.pid != os.getpid():
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(schema)
+        local.conn = conn
+        local.pid = os.getpid()
+    return conn
+
+#############################################
+# 렌더링 응답 캐시 (직렬화된 카카오 JSON)
+#############################################
+rendered_cache = {}
+rendered_cache_lock = threading.Lock()
+RENDERED_CACHE_TTL = 300
+RENDERED_CACHE_MAX_ENTRIES = int(os.environ.get('RENDERED_CACHE_MAX_ENTRIES', 2000))
+
 #############################################
 # 순위별 노출 점유율 데이터
 #############################################
@@ -68,7 +535,7 @@ def validate_required_keys():
     }
     missing = [k for k, v in required.items() if not v]
     if missing:
-        logger.warning(f"⚠️ Missing required keys: {', '.join(missing)}")
+        logger.warning("⚠️ Missing required keys: %s", ', '.join(missing))
         return False
     return True
 
@@ -95,6 +562,50 @@ def parse_count(value):
             return 0
     return 0
 
+def parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+class KeywordStat:
+    """keywordstool 한 행을 받을 때 한 번만 파싱해 둔 레코드
+    
+    검색량은 정수 ('< 10' → 5), 클릭수/CTR 은 float, 경쟁도 문자열은 intern 해 공유한다.
+    """
+    
+    __slots__ = ("keyword", "pc", "mobile", "pc_clicks", "mobile_clicks", "pc_ctr", "mobile_ctr", "comp_idx")
+    
+    def __init__(self, keyword, pc, mobile, pc_clicks=0.0, mobile_clicks=0.0, pc_ctr=0.0, mobile_ctr=0.0, comp_idx=""):
+        self.keyword = keyword
+        self.pc = pc
+        self.mobile = mobile
+        self.pc_clicks = pc_clicks
+        self.mobile_clicks = mobile_clicks
+        self.pc_ctr = pc_ctr
+        self.mobile_ctr = mobile_ctr
+        self.comp_idx = comp_idx
+    
+    @classmethod
+    def from_row(cls, row):
+        return cls(
+            row.get("relKeyword", ""),
+            parse_count(row.get("monthlyPcQcCnt")),
+            parse_count(row.get("monthlyMobileQcCnt")),
+            parse_float(row.get("monthlyAvePcClkCnt")),
+            parse_float(row.get("monthlyAveMobileClkCnt")),
+            parse_float(row.get("monthlyAvePcCtr")),
+            parse_float(row.get("monthlyAveMobileCtr")),
+            sys.intern(row.get("compIdx") or "")
+        )
+    
+    @property
+    def total(self):
+        return self.pc + self.mobile
+    
+    def __repr__(self):
+        return f"KeywordStat({self.keyword!r}, pc={self.pc}, mobile={self.mobile}, comp_idx={self.comp_idx!r})"
+
 def format_won(value):
     try:
         value = int(value)
@@ -111,60 +622,482 @@ def clean_keyword(keyword):
     return keyword.replace(" ", "")
 
 #############################################
-# 캐시 함수
+# 메트릭 (Prometheus 텍스트 포맷)
 #############################################
-def get_with_cache(key, fetch_func, *args, ttl=300):
-    """캐시 조회 → 없으면 fetch_func 실행"""
-    with cache_lock:
-        if key in api_cache:
-            data, ts = api_cache[key]
-            if time.time() - ts < ttl:
-                logger.info(f"✅ 캐시 히트: {key}")
-                return data
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0)
+
+metrics_registry = []
+
+class ShardedMetric:
+    """스레드별 샤드에 기록하고 수집 시 합산 (기록 경로에 락 없음)"""
     
-    logger.info(f"📡 API 호출: {key}")
-    data = fetch_func(*args)
+    type_name = "untyped"
     
-    with cache_lock:
-        api_cache[key] = (data, time.time())
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._collect_lock = threading.Lock()
+        metrics_registry.append(self)
+    
+    def _shard(self):
+        shard = getattr(self._local, "values", None)
+        if shard is None:
+            shard = self._local.values = {}
+            self._shards.append((threading.current_thread(), shard))
+        return shard
+    
+    def _merge(self, target, labels, value):
+        raise NotImplementedError
+    
+    def collect(self):
+        """라벨별 합산 값 (종료된 스레드의 샤드는 retired 로 병합)"""
+        with self._collect_lock:
+            totals = {}
+            for labels, value in self._retired.items():
+                self._merge(totals, labels, value)
+            
+            for shard_entry in list(self._shards):
+                thread, shard = shard_entry
+                snapshot = dict(shard)
+                for labels, value in snapshot.items():
+                    self._merge(totals, labels, value)
+                if not thread.is_alive():
+                    for labels, value in snapshot.items():
+                        self._merge(self._retired, labels, value)
+                    self._shards.remove(shard_entry)
+            
+            return totals
+
+class MetricCounter(ShardedMetric):
+    type_name = "counter"
+    
+    def inc(self, *labels, amount=1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+    
+    def _merge(self, target, labels, value):
+        target[labels] = target.get(labels, 0) + value
+
+class MetricHistogram(ShardedMetric):
+    type_name = "histogram"
+    
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        super().__init__(name, help_text, labelnames)
     
-    return data
+    def observe(self, value, *labels):
+        """state = [버킷별 개수..., +Inf 개수, 합계]"""
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            state = shard[labels] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+                break
+        else:
+            state[len(self.buckets)] += 1
+        state[-1] += value
+    
+    def _merge(self, target, labels, value):
+        state = target.setdefault(labels, [0] * (len(self.buckets) + 2))
+        for i, v in enumerate(value):
+            state[i] += v
+
+class MetricGauge:
+    """수집 시점에 콜백으로 값을 계산하는 게이지"""
+    
+    type_name = "gauge"
+    
+    def __init__(self, name, help_text, func, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.func = func
+        metrics_registry.append(self)
+    
+    def collect(self):
+        value = self.func()
+        return value if isinstance(value, dict) else {(): value}
+
+def _escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labelnames, labels, extra=None):
+    pairs = list(zip(labelnames, labels))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+def render_metrics():
+    """등록된 메트릭 → Prometheus 텍스트"""
+    lines = []
+    for metric in metrics_registry:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        
+        for labels, value in sorted(metric.collect().items()):
+            if metric.type_name != "histogram":
+                lines.append(f"{metric.name}{_format_labels(metric.labelnames, labels)} {value}")
+                continue
+            
+            cumulative = 0
+            for bound, count in zip(metric.buckets, value):
+                cumulative += count
+                lines.append(f"{metric.name}_bucket{_format_labels(metric.labelnames, labels, ('le', bound))} {cumulative}")
+            count = cumulative + value[len(metric.buckets)]
+            lines.append(f"{metric.name}_bucket{_format_labels(metric.labelnames, labels, ('le', '+Inf'))} {count}")
+            lines.append(f"{metric.name}_sum{_format_labels(metric.labelnames, labels)} {value[-1]}")
+            lines.append(f"{metric.name}_count{_format_labels(metric.labelnames, labels)} {count}")
+    
+    return "\n".join(lines) + "\n"
+
+UPSTREAM_LATENCY = MetricHistogram(
+    "upstream_request_duration_seconds",
+    "Upstream HTTP call latency by endpoint and outcome (ok, error, timeout)",
+    ("endpoint", "outcome")
+)
+COMMAND_LATENCY = MetricHistogram(
+    "kakao_command_duration_seconds",
+    "Kakao skill request latency by command",
+    ("command",)
+)
+CACHE_REQUESTS = MetricCounter(
+    "cache_requests_total",
+    "Cache lookups by namespace and result (hit, miss)",
+    ("namespace", "result")
+)
+FAST_PATH_RACES = MetricCounter(
+    "fast_path_race_total",
+    "Latency-budget races by name and winning path (primary, fallback_timeout, fallback_failed)",
+    ("name", "path")
+)
+FAST_PATH_LATENCY = MetricHistogram(
+    "fast_path_race_duration_seconds",
+    "Time to answer a latency-budget race by name and winning path",
+    ("name", "path")
+)
+FAST_PATH_LATE = MetricCounter(
+    "fast_path_late_total",
+    "Primary calls that finished after the fallback was served, by outcome (ok, failed)",
+    ("name", "outcome")
+)
+MetricGauge("user_sessions", "Active ad-analysis sessions", lambda: len(user_sessions))
+MetricGauge("upstream_executor_queue_depth", "Tasks waiting in the upstream thread pool",
+            lambda: upstream_executor._work_queue.qsize())
+MetricGauge("api_cache_entries", "Entries in the API data cache", lambda: len(api_cache))
+MetricGauge("log_queue_depth", "Log records waiting for the writer thread", lambda: log_queue_handler.queue.qsize())
+MetricGauge("log_records_dropped", "Log records dropped because the queue was full", lambda: log_queue_handler.dropped)
+
+def cache_namespace(key):
+    return key.split("_", 1)[0]
+
+@contextmanager
+def observe_upstream(endpoint):
+    """업스트림 호출 시간 기록; 블록 안에서 outcome[0] 을 바꿔 결과 지정"""
+    outcome = ["ok"]
+    start = time.perf_counter()
+    try:
+        with span(f"upstream:{endpoint}"):
+            yield outcome
+    except requests.Timeout:
+        outcome[0] = "timeout"
+        raise
+    except Exception:
+        outcome[0] = "error"
+        raise
+    finally:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, endpoint, outcome[0])
+
+def upstream_request(endpoint, method, url, **kwargs):
+    """계측된 업스트림 HTTP 호출"""
+    limiter = _upstream_limiter.get()
+    if limiter is not None:
+        limiter.acquire()
+    with observe_upstream(endpoint) as outcome:
+        response = upstream_session.request(method, url, **kwargs)
+        if response.status_code >= 400:
+            outcome[0] = "error"
+        return response
+
+
+STREAM_CHUNK_SIZE = 16384
+
+def upstream_stream(endpoint, url, matcher, **kwargs):
+    """GET 본문을 조각 단위로 matcher.feed 에 넣다가 True 가 나오면 나머지를 읽지 않고 연결 종료
+    
+    (상태코드, 읽은 바이트 수) 를 반환하며 추출 결과는 matcher 에 남는다.
+    """
+    limiter = _upstream_limiter.get()
+    if limiter is not None:
+        limiter.acquire()
+    received = 0
+    with observe_upstream(endpoint) as outcome:
+        with upstream_session.get(url, stream=True, **kwargs) as response:
+            if response.status_code >= 400:
+                outcome[0] = "error"
+            elif response.status_code == 200:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    received += len(chunk)
+                    if matcher.feed(decoder.decode(chunk)):
+                        break
+            return response.status_code, received
 
 #############################################
-# 네이버 검색광고 API
+# 요청 단위 트레이싱
 #############################################
-def get_naver_api_headers(method="GET", uri="/keywordstool"):
-    timestamp = str(int(time.time() * 1000))
-    message = f"{timestamp}.{method}.{uri}"
-    signature = hmac.new(NAVER_SECRET_KEY.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).digest()
-    signature_base64 = base64.b64encode(signature).decode('utf-8')
+TRACE_SLOW_THRESHOLD = float(os.environ.get('TRACE_SLOW_THRESHOLD', 1.0))
+TRACE_BUFFER_SIZE = int(os.environ.get('TRACE_BUFFER_SIZE', 50))
+TRACE_EXPORT_PATH = os.environ.get('TRACE_EXPORT_PATH', '')
+
+slow_traces = deque(maxlen=TRACE_BUFFER_SIZE)
+trace_listeners = []
+trace_export_lock = threading.Lock()
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_span_id = contextvars.ContextVar("current_span_id", default=None)
+
+class Trace:
+    """요청 하나의 span 모음 (시작 시각 기준 상대 시간으로 기록)"""
+    
+    def __init__(self, name, attrs=None):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.attrs = attrs or {}
+        self.start_wall = time.time()
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.spans = []
+        self._span_ids = itertools.count(1)
+    
+    def next_span_id(self):
+        return f"{next(self._span_ids):016x}"
+
+@contextmanager
+def span(name, **attrs):
+    """현재 트레이스에 span 기록; 트레이스 밖에서는 아무 것도 하지 않음
+    
+    yield 된 dict 에 값을 넣으면 span 속성으로 저장된다.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield attrs
+        return
+    
+    span_id = trace.next_span_id()
+    parent_id = _current_span_id.get()
+    token = _current_span_id.set(span_id)
+    start = time.perf_counter()
+    try:
+        yield attrs
+    except Exception as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        _current_span_id.reset(token)
+        trace.spans.append({
+            "span_id": span_id,
+            "parent_id": parent_id,
+            "name": name,
+            "start": start - trace.start,
+            "duration": time.perf_counter() - start,
+            "attrs": attrs
+        })
+
+@contextmanager
+def start_trace(name, **attrs):
+    """새 트레이스 시작 (이미 트레이스 안이면 하위 span 으로 기록)"""
+    if _current_trace.get() is not None:
+        with span(name, **attrs) as span_attrs:
+            yield span_attrs
+        return
+    
+    trace = Trace(name, attrs)
+    token = _current_trace.set(trace)
+    try:
+        with span(name, **attrs) as span_attrs:
+            yield span_attrs
+    finally:
+        _current_trace.reset(token)
+        finish_trace(trace)
+
+def finish_trace(trace):
+    trace.duration = time.perf_counter() - trace.start
+    
+    if trace.duration >= TRACE_SLOW_THRESHOLD:
+        slow_traces.append(trace)
+        logger.info("🐢 느린 요청: %s %.2fs (trace %s)", trace.name, trace.duration, trace.trace_id)
+    
+    if TRACE_EXPORT_PATH:
+        try:
+            export_trace_otlp(trace, TRACE_EXPORT_PATH)
+        except OSError as e:
+            logger.error("❌ 트레이스 저장 실패: %s", e)
+    
+    for listener in trace_listeners:
+        listener(trace)
+
+def submit_with_context(func, *args, executor=None):
+    """현재 트레이스 컨텍스트를 유지한 채 executor (기본 upstream_executor) 에 제출"""
+    return (executor or upstream_executor).submit(contextvars.copy_context().run, func, *args)
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def trace_to_otlp(trace):
+    """OTLP/JSON (ExportTraceServiceRequest) 형식으로 변환"""
+    start_ns = int(trace.start_wall * 1e9)
+    spans = []
+    for item in trace.spans:
+        otlp_span = {
+            "traceId": trace.trace_id,
+            "spanId": item["span_id"],
+            "name": item["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(start_ns + int(item["start"] * 1e9)),
+            "endTimeUnixNano": str(start_ns + int((item["start"] + item["duration"]) * 1e9)),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in item["attrs"].items()],
+            "status": {"code": 2} if "error" in item["attrs"] else {}
+        }
+        if item["parent_id"]:
+            otlp_span["parentSpanId"] = item["parent_id"]
+        spans.append(otlp_span)
+    
     return {
-        "Content-Type": "application/json; charset=UTF-8",
-        "X-Timestamp": timestamp,
-        "X-API-KEY": NAVER_API_KEY,
-        "X-Customer": str(NAVER_CUSTOMER_ID),
-        "X-Signature": signature_base64
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "kakao-keyword-bot"}}]},
+            "scopeSpans": [{"scope": {"name": "app"}, "spans": spans}]
+        }]
     }
 
+def export_trace_otlp(trace, path):
+    """트레이스를 OTLP/JSON 한 줄로 파일에 추가"""
+    line = json.dumps(trace_to_otlp(trace), ensure_ascii=False)
+    with trace_export_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+#############################################
+# 캐시 함수
+#############################################
+def get_with_cache(key, fetch_func, *args, ttl=300):
+    """캐시 조회 → 없으면 fetch_func 실행"""
+    with span("cache", key=key) as span_attrs:
+        with cache_lock:
+            if key in api_cache:
+                data, ts = api_cache[key]
+                if time.time() - ts < ttl:
+                    CACHE_REQUESTS.inc(cache_namespace(key), "hit")
+                    span_attrs["hit"] = True
+                    logger.info("✅ 캐시 히트: %s", key, extra=SAMPLED)
+                    return data
+        
+        CACHE_REQUESTS.inc(cache_namespace(key), "miss")
+        span_attrs["hit"] = False
+        logger.info("📡 API 호출: %s", key, extra=SAMPLED)
+        data = fetch_func(*args)
+        store_cache_entry(key, data)
+        
+        return data
+
+#############################################
+# 네이버 검색광고 API
+#############################################
+NAVER_CLOCK_SKEW_TOLERANCE = float(os.environ.get('NAVER_CLOCK_SKEW_TOLERANCE', 2))
+
+class NaverAdSigner(requests.auth.AuthBase):
+    """검색광고 API 서명 (requests auth 훅)
+    
+    비밀키를 넣은 HMAC 을 스레드마다 한 번 만들어 두고 서명할 때마다 copy 하며,
+    고정 헤더 템플릿에 타임스탬프/서명만 채운다. 응답의 Date 헤더로 서버와의
+    시계 차이를 재서 허용치를 넘으면 타임스탬프를 보정한다.
+    """
+    
+    def __init__(self, api_key, secret_key, customer_id, base_url):
+        self.secret = secret_key.encode("utf-8")
+        self.template = {
+            "Content-Type": "application/json; charset=UTF-8",
+            "X-API-KEY": api_key,
+            "X-Customer": str(customer_id)
+        }
+        self.base_path = urllib.parse.urlsplit(base_url).path.rstrip("/")
+        self.local = threading.local()
+        self.clock_offset = 0.0
+    
+    def _mac(self):
+        base = getattr(self.local, "mac", None)
+        if base is None:
+            base = self.local.mac = hmac.new(self.secret, digestmod=hashlib.sha256)
+        return base.copy()
+    
+    def headers(self, method, uri):
+        timestamp = str(int((time.time() + self.clock_offset) * 1000))
+        mac = self._mac()
+        mac.update(f"{timestamp}.{method}.{uri}".encode("utf-8"))
+        headers = self.template.copy()
+        headers["X-Timestamp"] = timestamp
+        headers["X-Signature"] = base64.b64encode(mac.digest()).decode("ascii")
+        return headers
+    
+    def observe_date(self, response, *args, **kwargs):
+        """서버 Date 헤더 (초 단위) 로 시계 차이 측정, 허용치 안이면 보정하지 않음"""
+        date_header = response.headers.get("Date")
+        if not date_header:
+            return response
+        try:
+            server_time = email.utils.parsedate_to_datetime(date_header).timestamp() + 0.5
+        except (TypeError, ValueError):
+            return response
+        skew = server_time - time.time()
+        offset = skew if abs(skew) > NAVER_CLOCK_SKEW_TOLERANCE else 0.0
+        if (offset == 0.0) != (self.clock_offset == 0.0):
+            logger.warning("⏱️ 검색광고 API 시계 보정: %+.1fs", offset)
+        self.clock_offset = offset
+        return response
+    
+    def __call__(self, request):
+        path = urllib.parse.urlsplit(request.url).path
+        uri = path[len(self.base_path):] if self.base_path and path.startswith(self.base_path) else path
+        request.headers.update(self.headers(request.method, uri))
+        request.register_hook("response", self.observe_date)
+        return request
+
+naver_signer = NaverAdSigner(NAVER_API_KEY, NAVER_SECRET_KEY, NAVER_CUSTOMER_ID, SEARCHAD_BASE_URL)
+
+def get_naver_api_headers(method="GET", uri="/keywordstool"):
+    """auth 훅을 쓸 수 없는 클라이언트 (ASGI httpx) 용 헤더"""
+    return naver_signer.headers(method, uri)
+
 def get_keyword_data(keyword, retry=1):
     """키워드 데이터 조회"""
     if not validate_required_keys():
         return {"success": False, "error": "API 키가 설정되지 않았습니다."}
     
-    base_url = "https://api.searchad.naver.com"
+    base_url = SEARCHAD_BASE_URL
     uri = "/keywordstool"
     params = {"hintKeywords": keyword, "showDetail": "1"}
     
     for attempt in range(retry + 1):
         try:
-            headers = get_naver_api_headers("GET", uri)
-            response = requests.get(base_url + uri, headers=headers, params=params, timeout=2)
+            response = upstream_request("keywordstool", "GET", base_url + uri, auth=naver_signer, params=params, timeout=2)
             
             if response.status_code == 200:
                 data = response.json()
                 keyword_list = data.get("keywordList", [])
                 if keyword_list:
-                    return {"success": True, "data": keyword_list}
+                    return {"success": True, "data": keyword_records(keyword_list)}
                 return {"success": False, "error": "검색 결과가 없습니다."}
             
             if attempt < retry:
@@ -179,13 +1112,13 @@ def get_keyword_data(keyword, retry=1):
                 continue
             return {"success": False, "error": "요청 시간 초과"}
         except Exception as e:
-            logger.error(f"키워드 조회 오류: {str(e)}")
+            logger.error("키워드 조회 오류: %s", e)
             return {"success": False, "error": str(e)}
 
 def get_performance_estimate(keyword, bids, device='MOBILE', retry=1):
     """성과 예측 API"""
     uri = '/estimate/performance/keyword'
-    url = f'https://api.searchad.naver.com{uri}'
+    url = f'{SEARCHAD_BASE_URL}{uri}'
     payload = {
         "device": device,
         "keywordplus": False,
@@ -195,8 +1128,7 @@ def get_performance_estimate(keyword, bids, device='MOBILE', retry=1):
     
     for attempt in range(retry + 1):
         try:
-            headers = get_naver_api_headers('POST', uri)
-            response = requests.post(url, headers=headers, json=payload, timeout=3)
+            response = upstream_request("performance", "POST", url, auth=naver_signer, json=payload, timeout=3)
             
             if response.status_code == 200:
                 return {"success": True, "data": response.json()}
@@ -213,9 +1145,112 @@ def get_performance_estimate(keyword, bids, device='MOBILE', retry=1):
                 continue
             return {"success": False, "error": "요청 시간 초과"}
         except Exception as e:
-            logger.error(f"성과 예측 오류: {str(e)}")
+            logger.error("성과 예측 오류: %s", e)
             return {"success": False, "error": str(e)}
 
+#############################################
+# 성과 곡선 (키워드·디바이스별 요청 병합 + 입찰가 단위 캐시)
+#############################################
+PERF_BATCH_WINDOW = float(os.environ.get('PERF_BATCH_WINDOW', 0.01))
+
+class _PerformanceBatch:
+    """한 번의 성과 예측 호출로 묶일 입찰가 집합"""
+    
+    def __init__(self):
+        self.bids = set()
+        self.sent = False
+        self.error = None
+        self.done = threading.Event()
+
+performance_batches = {}
+performance_lock = threading.Lock()
+
+def performance_curve_key(keyword, device):
+    return f"perf_{keyword}_{device}"
+
+def _cached_performance_points(key, bids, ttl):
+    """cache_lock 보유 상태에서 호출; {bid: estimate} 중 ttl 안의 것만"""
+    entry = api_cache.get(key)
+    if entry is None:
+        return {}
+    now = time.time()
+    points = entry[0]
+    return {bid: points[bid][0] for bid in bids if bid in points and now - points[bid][1] < ttl}
+
+def cached_performance_points(key, bids, ttl):
+    with cache_lock:
+        return _cached_performance_points(key, bids, ttl)
+
+def merge_performance_points(keyword, device, estimates):
+    """성과 예측 결과를 입찰가별로 perf_ 캐시에 병합 (동기/비동기 경로 공용)"""
+    now = time.time()
+    key = performance_curve_key(keyword, device)
+    with cache_lock:
+        entry = api_cache.get(key)
+        points = dict(entry[0]) if entry else {}
+    for estimate in estimates:
+        points[estimate.get("bid")] = (estimate, now)
+    store_cache_entry(key, points)
+
+def _send_performance_batch(keyword, device, batch):
+    """모인 입찰가 합집합으로 한 번 호출하고 입찰가별로 캐시에 병합"""
+    time.sleep(PERF_BATCH_WINDOW)
+    with performance_lock:
+        batch.sent = True
+        bids = sorted(batch.bids)
+    
+    try:
+        result = get_performance_estimate(keyword, bids, device)
+        if not result.get("success"):
+            batch.error = result.get("error", "성과 예측 실패")
+            return
+        merge_performance_points(keyword, device, result["data"].get("estimate", []))
+    except Exception as e:
+        batch.error = str(e)
+    finally:
+        with performance_lock:
+            if performance_batches.get((keyword, device)) is batch:
+                del performance_batches[(keyword, device)]
+        batch.done.set()
+
+def get_performance_curve(keyword, bids, device='MOBILE', ttl=300):
+    """get_performance_estimate 와 같은 형태로 반환하되, 캐시에 없는 입찰가만 조회
+    
+    같은 키워드·디바이스로 동시에 들어온 요청은 PERF_BATCH_WINDOW 동안 모아
+    입찰가 합집합으로 한 번만 호출한다.
+    """
+    bids = bids if isinstance(bids, list) else [bids]
+    key = performance_curve_key(keyword, device)
+    
+    with span("perf_curve", keyword=keyword, device=device) as span_attrs:
+        points = cached_performance_points(key, bids, ttl)
+        missing = [bid for bid in bids if bid not in points]
+        span_attrs["missing"] = len(missing)
+        
+        if missing:
+            CACHE_REQUESTS.inc("perf", "partial" if points else "miss")
+            with performance_lock:
+                batch = performance_batches.get((keyword, device))
+                leader = batch is None or (batch.sent and not batch.bids.issuperset(missing))
+                if leader:
+                    batch = performance_batches[(keyword, device)] = _PerformanceBatch()
+                if not batch.sent:
+                    batch.bids.update(missing)
+            
+            if leader:
+                _send_performance_batch(keyword, device, batch)
+            elif not batch.done.wait(timeout=5):
+                return {"success": False, "error": "요청 시간 초과"}
+            
+            if batch.error:
+                return {"success": False, "error": batch.error}
+            
+            points = cached_performance_points(key, bids, ttl)
+        else:
+            CACHE_REQUESTS.inc("perf", "hit")
+        
+        return {"success": True, "data": {"estimate": [points[bid] for bid in bids if bid in points]}}
+
 #############################################
 # 실시간 순위별 입찰가 API
 #############################################
@@ -226,7 +1261,7 @@ def get_real_rank_bids(keyword):
         return {"success": False, "error": "API 키가 설정되지 않았습니다."}
     
     uri = '/estimate/average-position-bid/keyword'
-    url = f'https://api.searchad.naver.com{uri}'
+    url = f'{SEARCHAD_BASE_URL}{uri}'
     
     results = {}
     
@@ -240,26 +1275,37 @@ def get_real_rank_bids(keyword):
         }
         
         try:
-            headers = get_naver_api_headers('POST', uri)
-            logger.info(f"📡 Average Position Bid 요청: {keyword} ({device})")
+            logger.info("📡 Average Position Bid 요청: %s (%s)", keyword, device)
             
-            response = requests.post(url, headers=headers, json=payload, timeout=3)
+            response = upstream_request("average-position-bid", "POST", url, auth=naver_signer, json=payload, timeout=3)
             
-            logger.info(f"📥 상태코드 ({device}): {response.status_code}")
+            logger.info("📥 상태코드 (%s): %s", device, response.status_code)
             
             if response.status_code == 200:
                 data = response.json()
                 results[device] = data.get("estimate", [])
-                logger.info(f"✅ {device} 응답 성공: {len(results[device])}개")
+                logger.info("✅ %s 응답 성공: %s개", device, len(results[device]))
             else:
-                logger.error(f"❌ {device} API 오류: {response.status_code}")
-                logger.error(f"응답: {response.text}")
+                logger.error("❌ %s API 오류: %s", device, response.status_code)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("응답: %.500s", response.text)
                 return {"success": False, "error": f"API 오류 ({response.status_code})", "detail": response.text}
         
         except Exception as e:
-            logger.error(f"❌ {device} 예외: {str(e)}", exc_info=True)
+            logger.error("❌ %s 예외: %s", device, e, exc_info=True)
             return {"success": False, "error": str(e)}
     
+    data = rank_bids_data(results)
+    
+    logger.info("✅ 순위별 입찰가 생성: %s개", len(data["bidLandscape"]))
+    
+    return {
+        "success": True,
+        "data": data
+    }
+
+def build_bid_landscape(results):
+    """디바이스별 estimate 목록 → 순위별 입찰가 목록"""
     bid_landscape = []
     
     mobile_estimates = results.get('MOBILE', [])
@@ -287,16 +1333,194 @@ def get_real_rank_bids(keyword):
                 "pcBid": pc_bid
             })
     
-    logger.info(f"✅ 순위별 입찰가 생성: {len(bid_landscape)}개")
+    return bid_landscape
+
+#############################################
+# 순위별 입찰가 일괄 조회 (여러 키워드 → 한 요청)
+#############################################
+RANK_BID_POSITIONS = 5
+RANK_BID_DEVICES = ('MOBILE', 'PC')
+RANK_BID_MAX_ITEMS = int(os.environ.get('RANK_BID_MAX_ITEMS', 100))
+RANK_BID_CONCURRENCY = int(os.environ.get('RANK_BID_CONCURRENCY', 4))
+
+# 청크 작업은 더 이상 작업을 제출하지 않으므로 공용 풀과 분리해 중첩 대기를 피함
+rank_bid_executor = ThreadPoolExecutor(max_workers=RANK_BID_CONCURRENCY, thread_name_prefix="rank-bid")
+
+def fetch_position_bids(keywords, device):
+    """키워드 여러 개를 items 하나에 담아 조회 → {keyword: [순위1..5 입찰가]}, 실패 시 None"""
+    uri = '/estimate/average-position-bid/keyword'
+    payload = {
+        "device": device,
+        "items": [{"key": keyword, "position": pos} for keyword in keywords for pos in range(1, RANK_BID_POSITIONS + 1)]
+    }
+    response = upstream_request("average-position-bid", "POST", f"{SEARCHAD_BASE_URL}{uri}", auth=naver_signer, json=payload, timeout=5)
+    if response.status_code != 200:
+        logger.error("❌ 일괄 입찰가 오류 (%s, %d개): %s", device, len(keywords), response.status_code)
+        return None
+    
+    bids = {keyword: [0] * RANK_BID_POSITIONS for keyword in keywords}
+    for item in response.json().get("estimate", []):
+        keyword, position = item.get("key"), item.get("position")
+        if keyword in bids and position and 1 <= position <= RANK_BID_POSITIONS:
+            bids[keyword][position - 1] = item.get("bid", 0)
+    return bids
+
+def fetch_rank_bids_batch(keywords):
+    """N개 키워드를 항목 한도로 나눠 (청크 × 디바이스) 병렬 조회
+    
+    {keyword: {"MOBILE": [...], "PC": [...]}} 를 반환하며, 실패한 청크의 키워드는 빠진다.
+    """
+    keywords = list(dict.fromkeys(keywords))
+    per_chunk = max(1, RANK_BID_MAX_ITEMS // RANK_BID_POSITIONS)
+    chunks = [keywords[i:i + per_chunk] for i in range(0, len(keywords), per_chunk)]
+    
+    def fetch(chunk, device):
+        try:
+            return fetch_position_bids(chunk, device)
+        except Exception as e:
+            logger.error("❌ 일괄 입찰가 예외 (%s): %s", device, e)
+            return None
     
+    futures = {
+        (index, device): submit_with_context(fetch, chunk, device, executor=rank_bid_executor)
+        for index, chunk in enumerate(chunks)
+        for device in RANK_BID_DEVICES
+    }
+    
+    results = {}
+    for index, chunk in enumerate(chunks):
+        by_device = {device: futures[(index, device)].result() for device in RANK_BID_DEVICES}
+        if any(bids is None for bids in by_device.values()):
+            continue
+        for keyword in chunk:
+            results[keyword] = {device: by_device[device][keyword] for device in RANK_BID_DEVICES}
+    return results
+
+def rank_bids_result(bids_by_device):
+    """일괄 조회 결과 → get_real_rank_bids 와 같은 형태"""
     return {
         "success": True,
-        "data": {
-            "bidLandscape": bid_landscape
-        }
+        "data": rank_bids_data({
+            device: [{"bid": bid} for bid in bids] for device, bids in bids_by_device.items()
+        })
     }
 
-def estimate_rank_from_bid(keyword, user_bid):
+def get_rank_bids_bulk(keywords, ttl=300):
+    """여러 키워드의 순위별 입찰가; 캐시에 없는 것만 일괄 조회 후 bid_ 캐시로 나눠 저장"""
+    if not validate_required_keys():
+        return {keyword: {"success": False, "error": "API 키가 설정되지 않았습니다."} for keyword in keywords}
+    
+    now = time.time()
+    results = {}
+    missing = []
+    with cache_lock:
+        for keyword in keywords:
+            entry = api_cache.get(f"bid_{keyword}")
+            if entry is not None and now - entry[1] < ttl and entry[0].get("success"):
+                results[keyword] = entry[0]
+            else:
+                missing.append(keyword)
+    
+    for keyword, bids_by_device in fetch_rank_bids_batch(missing).items():
+        result = rank_bids_result(bids_by_device)
+        store_cache_entry(f"bid_{keyword}", result)
+        results[keyword] = result
+    
+    for keyword in missing:
+        results.setdefault(keyword, {"success": False, "error": "입찰가 일괄 조회 실패"})
+    return results
+
+class RankIndex:
+    """bidLandscape 를 디바이스별 (오름차순 입찰가, 순위) 배열로 변환해 둔 조회용 색인
+    
+    순위 r 의 기준 입찰가는 1~r 위 입찰가의 최소값이라 순위가 내려갈수록 줄어들고,
+    뒤집으면 오름차순이 되어 bisect 로 '입찰가가 기준 이상인 가장 높은 순위' 를 찾는다.
+    """
+    
+    __slots__ = ("devices",)
+    
+    def __init__(self, devices):
+        self.devices = devices
+    
+    @classmethod
+    def from_landscape(cls, bid_landscape):
+        devices = {}
+        for device, field in (('MOBILE', 'mobileBid'), ('PC', 'pcBid')):
+            points = []
+            for item in bid_landscape:
+                try:
+                    rank = int(item.get("rank") or 0)
+                    bid = int(item.get(field) or 0)
+                except (ValueError, TypeError):
+                    continue
+                if rank > 0 and bid > 0:
+                    points.append((rank, bid))
+            
+            thresholds = []
+            floor = None
+            for rank, bid in sorted(points):
+                floor = bid if floor is None else min(floor, bid)
+                thresholds.append((floor, rank))
+            thresholds.reverse()
+            devices[device] = (array('i', [t for t, _ in thresholds]), array('b', [r for _, r in thresholds]))
+        return cls(devices)
+    
+    def lookup(self, user_bid, device='MOBILE'):
+        """{"rank", "rank_text", "share"[, "min_bid"]}; 순위 사이 입찰가는 점유율을 선형 보간"""
+        bids, ranks = self.devices.get(device, ((), ()))
+        if not bids:
+            return {"rank": 99, "rank_text": "미확인", "share": 10}
+        
+        i = bisect.bisect_right(bids, user_bid)
+        if i == 0:
+            return {"rank": 99, "rank_text": "광고 미노출 가능", "share": 5, "min_bid": bids[0]}
+        
+        rank = ranks[i - 1]
+        share = IMPRESSION_SHARE_BY_RANK.get(rank, 20)
+        if i < len(bids) and bids[i] > bids[i - 1]:
+            upper_share = IMPRESSION_SHARE_BY_RANK.get(ranks[i], share)
+            share += (upper_share - share) * (user_bid - bids[i - 1]) / (bids[i] - bids[i - 1])
+        
+        return {"rank": rank, "rank_text": f"{rank}위", "share": int(share)}
+    
+    def lookup_many(self, user_bids, device='MOBILE'):
+        """오름차순 입찰가 목록을 한 번의 병합 순회로 처리 → (순위 목록, 점유율 목록)
+        
+        기준 아래 입찰가는 순위 99, 점유율 5.
+        """
+        bids, ranks = self.devices.get(device, ((), ()))
+        out_ranks = []
+        out_shares = []
+        i = 0
+        for user_bid in user_bids:
+            while i < len(bids) and bids[i] <= user_bid:
+                i += 1
+            if i == 0:
+                out_ranks.append(99)
+                out_shares.append(5 if bids else 10)
+                continue
+            rank = ranks[i - 1]
+            share = IMPRESSION_SHARE_BY_RANK.get(rank, 20)
+            if i < len(bids) and bids[i] > bids[i - 1]:
+                upper_share = IMPRESSION_SHARE_BY_RANK.get(ranks[i], share)
+                share += (upper_share - share) * (user_bid - bids[i - 1]) / (bids[i] - bids[i - 1])
+            out_ranks.append(rank)
+            out_shares.append(int(share))
+        return out_ranks, out_shares
+
+def rank_bids_data(results):
+    """디바이스별 estimate 목록 → bid_ 캐시에 넣을 data (목록 + 순위 색인)"""
+    bid_landscape = build_bid_landscape(results)
+    return {
+        "bidLandscape": bid_landscape,
+        "rankIndex": RankIndex.from_landscape(bid_landscape)
+    }
+
+def rank_index_of(data):
+    """색인이 없는 예전 캐시 항목이면 그 자리에서 생성"""
+    return data.get("rankIndex") or RankIndex.from_landscape(data.get("bidLandscape", []))
+
+def estimate_rank_from_bid(keyword, user_bid, device='MOBILE'):
     """입찰가로 예상 순위 추정"""
     
     try:
@@ -308,82 +1532,34 @@ def estimate_rank_from_bid(keyword, user_bid):
         )
         
         if not result.get("success"):
-            logger.warning(f"⚠️ 순위 추정 실패: {keyword}")
-            return {"rank": 99, "rank_text": "미확인", "share": 10}
-        
-        data = result["data"]
-        bid_list = data.get("bidLandscape", [])
-        
-        if not bid_list:
+            logger.warning("⚠️ 순위 추정 실패: %s", keyword)
             return {"rank": 99, "rank_text": "미확인", "share": 10}
         
-        for item in bid_list:
-            rank_raw = item.get("rank")
-            
-            try:
-                rank = int(rank_raw) if rank_raw is not None else 0
-            except (ValueError, TypeError):
-                continue
-            
-            if rank <= 0:
-                continue
-            
-            mobile_bid_raw = item.get("mobileBid", 0)
-            
-            try:
-                mobile_bid = int(mobile_bid_raw) if mobile_bid_raw else 0
-            except (ValueError, TypeError):
-                mobile_bid = 0
-            
-            if mobile_bid > 0 and user_bid >= mobile_bid:
-                share = IMPRESSION_SHARE_BY_RANK.get(rank, 20)
-                return {
-                    "rank": rank,
-                    "rank_text": f"{rank}위",
-                    "share": share
-                }
-        
-        lowest_rank = bid_list[-1] if bid_list else {}
-        lowest_bid = int(lowest_rank.get("mobileBid", 0))
-        
-        if user_bid < lowest_bid:
-            return {
-                "rank": 99,
-                "rank_text": "광고 미노출 가능",
-                "share": 5,
-                "min_bid": lowest_bid
-            }
-        
-        return {
-            "rank": 6,
-            "rank_text": "6위 이하",
-            "share": 15
-        }
+        return rank_index_of(result["data"]).lookup(user_bid, device)
     
     except Exception as e:
-        logger.error(f"❌ estimate_rank_from_bid 오류: {str(e)}", exc_info=True)
+        logger.error("❌ estimate_rank_from_bid 오류: %s", e, exc_info=True)
         return {"rank": 99, "rank_text": "미확인", "share": 10}
 
 def format_real_rank_bids(keyword):
     """순위별 입찰가 포맷팅"""
     
     try:
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            bid_future = executor.submit(
-                get_with_cache,
-                f"bid_{keyword}",
-                get_real_rank_bids,
-                keyword
-            )
-            kw_future = executor.submit(
-                get_with_cache,
-                f"kw_{keyword}",
-                get_keyword_data,
-                keyword
-            )
-            
-            bid_result = bid_future.result(timeout=3)
-            kw_result = kw_future.result(timeout=3)
+        bid_future = submit_with_context(
+            get_with_cache,
+            f"bid_{keyword}",
+            get_real_rank_bids,
+            keyword
+        )
+        kw_future = submit_with_context(
+            get_with_cache,
+            f"kw_{keyword}",
+            get_keyword_data,
+            keyword
+        )
+        
+        bid_result = bid_future.result(timeout=3)
+        kw_result = kw_future.result(timeout=3)
         
         if not bid_result.get("success"):
             return f"[순위별 입찰가] 조회 실패\n\n{bid_result.get('error', '알 수 없는 오류')}"
@@ -396,11 +1572,9 @@ def format_real_rank_bids(keyword):
         
         if kw_result.get("success"):
             kw = kw_result["data"][0]
-            keyword_name = kw.get('relKeyword', keyword)
-            pc_qc = parse_count(kw.get("monthlyPcQcCnt"))
-            mobile_qc = parse_count(kw.get("monthlyMobileQcCnt"))
-            total_qc = pc_qc + mobile_qc
-            comp_idx = kw.get("compIdx", "")
+            keyword_name = kw.keyword or keyword
+            total_qc = kw.total
+            comp_idx = kw.comp_idx
         
         lines = [f"[{keyword_name}] 순위별 최소 입찰가", ""]
         
@@ -445,7 +1619,7 @@ def format_real_rank_bids(keyword):
         return "\n".join(lines)
         
     except Exception as e:
-        logger.error(f"❌ format_real_rank_bids 오류: {str(e)}", exc_info=True)
+        logger.error("❌ format_real_rank_bids 오류: %s", e, exc_info=True)
         return f"[{keyword}] 조회 시간 초과\n\n잠시 후 다시 시도해주세요"
 
 #############################################
@@ -458,19 +1632,16 @@ def get_search_volume(keyword):
             return "최대 5개 키워드까지만 조회 가능합니다."
         return get_multi_search_volume(keywords[:5])
     
-    result = get_keyword_data(keyword)
+    result = get_with_cache(f"kw_{keyword}", get_keyword_data, keyword)
     if not result["success"]:
         return f"조회 실패: {result['error']}"
     
     kw = result["data"][0]
-    pc = parse_count(kw.get("monthlyPcQcCnt"))
-    mobile = parse_count(kw.get("monthlyMobileQcCnt"))
-    total = pc + mobile
     
-    return f"""[검색량] {kw.get('relKeyword', keyword)}
-월간 총 {format_number(total)}회
-ㄴ 모바일: {format_number(mobile)}회
-ㄴ PC: {format_number(pc)}회
+    return f"""[검색량] {kw.keyword or keyword}
+월간 총 {format_number(kw.total)}회
+ㄴ 모바일: {format_number(kw.mobile)}회
+ㄴ PC: {format_number(kw.pc)}회
 
 ※ 도움말: "도움말" 입력"""
 
@@ -480,18 +1651,15 @@ def get_multi_search_volume(keywords):
     
     for i, keyword in enumerate(keywords):
         keyword = keyword.replace(" ", "")
-        result = get_keyword_data(keyword)
+        result = get_with_cache(f"kw_{keyword}", get_keyword_data, keyword)
         
         if result["success"]:
             kw = result["data"][0]
-            pc = parse_count(kw.get("monthlyPcQcCnt"))
-            mobile = parse_count(kw.get("monthlyMobileQcCnt"))
-            total = pc + mobile
-            
-            lines.append(f"[검색량] {kw.get('relKeyword', keyword)}")
-            lines.append(f"월간 총 {format_number(total)}회")
-            lines.append(f"ㄴ 모바일: {format_number(mobile)}회")
-            lines.append(f"ㄴ PC: {format_number(pc)}회")
+            
+            lines.append(f"[검색량] {kw.keyword or keyword}")
+            lines.append(f"월간 총 {format_number(kw.total)}회")
+            lines.append(f"ㄴ 모바일: {format_number(kw.mobile)}회")
+            lines.append(f"ㄴ PC: {format_number(kw.pc)}회")
         else:
             lines.append(f"[검색량] {keyword}")
             lines.append("조회 실패")
@@ -507,36 +1675,66 @@ def get_multi_search_volume(keywords):
 #############################################
 # 기본 기능: 연관 키워드
 #############################################
-def get_related_keywords(keyword):
+def related_keywords_url(keyword):
+    return f"{NAVER_SEARCH_BASE_URL}/search.naver?where=nexearch&query={requests.utils.quote(keyword)}"
+
+class RelatedKeywordMatcher:
+    """검색 결과 HTML 조각에서 '<div class="tit">' 연관검색어를 모으다 10개가 되면 종료"""
+    
+    PATTERN = re.compile(r'<div class="tit">([^<]+)</div>')
+    OPEN_TAG = '<div class="tit">'
+    
+    def __init__(self, keyword, limit=10):
+        self.keyword = keyword
+        self.limit = limit
+        self.buffer = ""
+        self.related = []
+    
+    def feed(self, text):
+        self.buffer += text
+        last_end = 0
+        for match in self.PATTERN.finditer(self.buffer):
+            last_end = match.end()
+            kw = match.group(1).strip()
+            if kw and kw != self.keyword and kw not in self.related and len(kw) > 1:
+                self.related.append(kw)
+                if len(self.related) >= self.limit:
+                    return True
+        
+        # 조각 경계에 걸친 태그만 남김
+        cut = self.buffer.rfind(self.OPEN_TAG, last_end)
+        if cut == -1:
+            cut = max(last_end, len(self.buffer) - len(self.OPEN_TAG))
+        self.buffer = self.buffer[cut:]
+        return False
+
+def fetch_related_keywords(keyword):
+    """네이버 검색 결과 연관검색어 스크래핑"""
     try:
-        url = f"https://search.naver.com/search.naver?where=nexearch&query={requests.utils.quote(keyword)}"
         headers = {"User-Agent": "Mozilla/5.0", "Accept-Language": "ko-KR,ko;q=0.9"}
-        response = requests.get(url, headers=headers, timeout=5)
+        matcher = RelatedKeywordMatcher(keyword)
+        status_code, _ = upstream_stream("related", related_keywords_url(keyword), matcher, headers=headers, timeout=5)
         
-        if response.status_code == 200:
-            pattern = re.findall(r'<div class="tit">([^<]+)</div>', response.text)
-            seen = set()
-            related = []
-            for kw in pattern:
-                kw = kw.strip()
-                if kw and kw != keyword and kw not in seen and len(kw) > 1:
-                    seen.add(kw)
-                    related.append(kw)
-                    if len(related) >= 10:
-                        break
-            
-            if related:
-                result = f"[연관검색어] {keyword}\n\n"
-                for i, kw in enumerate(related, 1):
-                    result += f"{i}. {kw}\n"
-                return result.strip()
+        if status_code == 200 and matcher.related:
+            return {"success": True, "data": matcher.related}
         
+        return {"success": False, "error": f"상태코드 {status_code}"}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def get_related_keywords(keyword):
+    result = get_with_cache(f"rel_{keyword}", fetch_related_keywords, keyword)
+    
+    if not result.get("success"):
         return get_related_keywords_api(keyword)
-    except:
-        return get_related_keywords_api(keyword)
+    
+    response = f"[연관검색어] {keyword}\n\n"
+    for i, kw in enumerate(result["data"], 1):
+        response += f"{i}. {kw}\n"
+    return response.strip()
 
 def get_related_keywords_api(keyword):
-    result = get_keyword_data(keyword)
+    result = get_with_cache(f"kw_{keyword}", get_keyword_data, keyword)
     if not result["success"]:
         return f"조회 실패: {result['error']}"
     
@@ -544,28 +1742,32 @@ def get_related_keywords_api(keyword):
     response = f"[연관키워드] {keyword}\n\n"
     
     for i, kw in enumerate(keyword_list, 1):
-        name = kw.get("relKeyword", "")
-        total = parse_count(kw.get("monthlyPcQcCnt")) + parse_count(kw.get("monthlyMobileQcCnt"))
-        response += f"{i}. {name} ({format_number(total)})\n"
+        response += f"{i}. {kw.keyword} ({format_number(kw.total)})\n"
     
     return response.strip()
 
 #############################################
 # 광고 단가 분석 - 전체 분석
 #############################################
+FULL_ANALYSIS_TEST_BIDS = [
+    100, 200, 300, 400, 500, 600, 700, 800, 900, 1000,
+    1200, 1500, 1800, 2000, 2200, 2500, 3000, 3500, 4000, 5000,
+    6000, 7000, 8000, 10000, 15000
+]
+
 def get_ad_cost_full(keyword):
     """광고 단가 전체 분석"""
-    result = get_keyword_data(keyword)
+    result = get_with_cache(f"kw_{keyword}", get_keyword_data, keyword)
     if not result["success"]:
         return f"조회 실패: {result['error']}"
     
     kw = result["data"][0]
-    keyword_name = kw.get('relKeyword', keyword)
-    pc_qc = parse_count(kw.get("monthlyPcQcCnt"))
-    mobile_qc = parse_count(kw.get("monthlyMobileQcCnt"))
-    total_qc = pc_qc + mobile_qc
+    keyword_name = kw.keyword or keyword
+    pc_qc = kw.pc
+    mobile_qc = kw.mobile
+    total_qc = kw.total
     mobile_ratio = (mobile_qc * 100 // total_qc) if total_qc > 0 else 0
-    comp_idx = kw.get("compIdx", "중간")
+    comp_idx = kw.comp_idx or "중간"
     
     comp_emoji = "🔴" if comp_idx == "높음" else "🟡" if comp_idx == "중간" else "🟢"
     
@@ -581,13 +1783,9 @@ def get_ad_cost_full(keyword):
     lines.append(f"└ PC: {format_number(pc_qc)}회 ({100-mobile_ratio}%)")
     lines.append("")
     
-    test_bids = [
-        100, 200, 300, 400, 500, 600, 700, 800, 900, 1000,
-        1200, 1500, 1800, 2000, 2200, 2500, 3000, 3500, 4000, 5000,
-        6000, 7000, 8000, 10000, 15000
-    ]
+    test_bids = FULL_ANALYSIS_TEST_BIDS
     
-    mobile_perf = get_performance_estimate(keyword_name, test_bids, 'MOBILE')
+    mobile_perf = get_performance_curve(keyword_name, test_bids, 'MOBILE')
     
     efficient_bid = None
     efficient_clicks = 0
@@ -738,7 +1936,7 @@ def get_ad_cost_full(keyword):
         
         lines.append("")
     
-    pc_perf = get_performance_estimate(keyword_name, test_bids, 'PC')
+    pc_perf = get_performance_curve(keyword_name, test_bids, 'PC')
     
     if pc_perf.get("success"):
         pc_estimates = pc_perf["data"].get("estimate", [])
@@ -807,25 +2005,27 @@ def get_ad_cost_full(keyword):
 #############################################
 # 광고 단가 분석 - 맞춤 분석
 #############################################
+CUSTOM_ANALYSIS_MIN_BIDS = [500, 700, 1000, 1500, 2000]
+
 def get_ad_cost_custom(keyword, user_bid):
     """사용자 지정 입찰가 성과 분석"""
     
     try:
-        logger.info(f"🎯 맞춤 분석: {keyword} / 입찰가: {user_bid}원")
+        logger.info("🎯 맞춤 분석: %s / 입찰가: %s원", keyword, user_bid)
         
-        result = get_keyword_data(keyword)
+        result = get_with_cache(f"kw_{keyword}", get_keyword_data, keyword)
         if not result["success"]:
             return f"조회 실패: {result['error']}"
         
         kw = result["data"][0]
-        keyword_name = kw.get('relKeyword', keyword)
-        pc_qc = parse_count(kw.get("monthlyPcQcCnt"))
-        mobile_qc = parse_count(kw.get("monthlyMobileQcCnt"))
-        total_qc = pc_qc + mobile_qc
+        keyword_name = kw.keyword or keyword
+        pc_qc = kw.pc
+        mobile_qc = kw.mobile
+        total_qc = kw.total
         mobile_ratio = (mobile_qc * 100 / total_qc) if total_qc > 0 else 75
-        comp_idx = kw.get("compIdx", "중간")
+        comp_idx = kw.comp_idx or "중간"
         
-        perf = get_performance_estimate(keyword_name, [user_bid], 'MOBILE')
+        perf = get_performance_curve(keyword_name, [user_bid], 'MOBILE')
         
         if not perf.get("success"):
             return f"❌ 입찰가 {format_number(user_bid)}원 조회 실패\n\n다른 금액으로 시도해주세요."
@@ -842,10 +2042,12 @@ def get_ad_cost_custom(keyword, user_bid):
             cost = int(clicks * user_bid * 0.8)
         
         rank_info = {"rank": 99, "rank_text": "미확인", "share": 10}
+        pc_rank_info = rank_info
         try:
             rank_info = estimate_rank_from_bid(keyword_name, user_bid)
+            pc_rank_info = estimate_rank_from_bid(keyword_name, user_bid, 'PC')
         except Exception as e:
-            logger.error(f"❌ 순위 추정 실패: {str(e)}")
+            logger.error("❌ 순위 추정 실패: %s", e)
         
         comp_emoji = "🔴" if comp_idx == "높음" else "🟡" if comp_idx == "중간" else "🟢"
         
@@ -873,6 +2075,8 @@ def get_ad_cost_custom(keyword, user_bid):
             
             lines.append(f"✅ 예상 순위: {rank_text}")
             lines.append(f"✅ 노출 점유율: 약 {share}%")
+            if pc_rank_info.get('rank', 99) < 99:
+                lines.append(f"✅ PC 예상 순위: {pc_rank_info['rank_text']} (점유율 약 {pc_rank_info['share']}%)")
             
             if rank >= 99:
                 min_bid = rank_info.get('min_bid', 0)
@@ -964,7 +2168,7 @@ def get_ad_cost_custom(keyword, user_bid):
                             if mobile_bid_1st > 0:
                                 lines.append(f"💡 1위 하려면: {format_number(mobile_bid_1st)}원 필요")
                 except Exception as e:
-                    logger.error(f"❌ 1위 입찰가 조회 실패: {str(e)}")
+                    logger.error("❌ 1위 입찰가 조회 실패: %s", e)
         else:
             lines.append("❌ 예상 클릭 0회")
             lines.append("")
@@ -973,8 +2177,8 @@ def get_ad_cost_custom(keyword, user_bid):
             lines.append("")
             
             try:
-                test_bids = [500, 700, 1000, 1500, 2000]
-                min_perf = get_performance_estimate(keyword_name, test_bids, 'MOBILE')
+                test_bids = CUSTOM_ANALYSIS_MIN_BIDS
+                min_perf = get_performance_curve(keyword_name, test_bids, 'MOBILE')
                 
                 if min_perf.get("success"):
                     min_estimates = min_perf["data"].get("estimate", [])
@@ -984,7 +2188,7 @@ def get_ad_cost_custom(keyword, user_bid):
                             lines.append(f"💡 추천: 최소 {format_number(min_bid)}원부터 시작")
                             break
             except Exception as e:
-                logger.error(f"❌ 최소 입찰가 조회 실패: {str(e)}")
+                logger.error("❌ 최소 입찰가 조회 실패: %s", e)
         
         lines.append("")
         lines.append("━━━━━━━━━━━━━━")
@@ -994,79 +2198,391 @@ def get_ad_cost_custom(keyword, user_bid):
         return "\n".join(lines)
     
     except Exception as e:
-        logger.error(f"❌ get_ad_cost_custom 전체 오류: {str(e)}", exc_info=True)
+        logger.error("❌ get_ad_cost_custom 전체 오류: %s", e, exc_info=True)
         return f"❌ 오류 발생\n\n키워드: {keyword}\n입찰가: {user_bid}원\n\n잠시 후 다시 시도해주세요."
 
+#############################################
+# 자동완성 로컬 색인 (자모 단위 trie)
+#############################################
+AC_INDEX_TOP_K = 10
+AC_INDEX_TTL = int(os.environ.get('AC_INDEX_TTL', 86400))
+AC_INDEX_MAX_WORDS = int(os.environ.get('AC_INDEX_MAX_WORDS', 20000))
+# 노드가 생기는 최대 자모 깊이 (12 ≈ 4음절), 더 긴 접두사는 색인에서 답하지 않음
+AC_INDEX_MAX_DEPTH = int(os.environ.get('AC_INDEX_MAX_DEPTH', 12))
+# 실시간 조회 시각을 기억하는 접두사 수 (LRU)
+AC_INDEX_MAX_PREFIXES = int(os.environ.get('AC_INDEX_MAX_PREFIXES', 50000))
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ", "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ", "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 단독 입력된 겹모음/겹받침 자모도 같은 형태로 풀어 씀
+COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ"
+}
+
+def decompose_jamo(text):
+    """'강남' → 'ㄱㅏㅇㄴㅏㅁ' (공백 제거, 소문자). 덜 친 음절도 접두사로 맞도록 겹자모까지 분해"""
+    out = []
+    for ch in text.lower():
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(CHOSEONG[code // 588])
+            out.append(JUNGSEONG[(code % 588) // 28])
+            out.append(JONGSEONG[code % 28])
+        elif not ch.isspace():
+            out.append(COMPOUND_JAMO.get(ch, ch))
+    return "".join(out)
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+    
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+class JamoTrie:
+    """자모 접두사 → 가중치 상위 제안어. 노드마다 상위 top_k 개를 들고 있어 조회는 경로 길이만큼
+    
+    노드는 단어를 넣을 때만 생겨 max_words × max_depth 개를 넘지 않는다. 단어가 가득 차면
+    가중치 낮은 단어부터 90% 까지 지우고 trie 를 다시 쌓으며, 접두사별 실시간 조회 시각은
+    노드가 아닌 max_prefixes 개짜리 LRU 에 둔다.
+    """
+    
+    def __init__(self, max_words=AC_INDEX_MAX_WORDS, max_depth=AC_INDEX_MAX_DEPTH, top_k=AC_INDEX_TOP_K,
+                 max_prefixes=AC_INDEX_MAX_PREFIXES):
+        self.root = _TrieNode()
+        # 단어 → (가중치, 자모 키)
+        self.words = {}
+        # 자모 접두사 → 마지막 실시간 조회 시각 (오래된 순)
+        self.fetched = OrderedDict()
+        self.max_words = max_words
+        self.max_depth = max_depth
+        self.top_k = top_k
+        self.max_prefixes = max_prefixes
+        self.lock = threading.Lock()
+    
+    def _node(self, key):
+        node = self.root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+    
+    def _insert_locked(self, word, key, total):
+        # 경로의 모든 노드가 같은 튜플을 공유
+        entry = (total, word, key)
+        node = self.root
+        for ch in key[:self.max_depth]:
+            node = node.children.setdefault(ch, _TrieNode())
+            top = [item for item in node.top if item[1] != word]
+            top.append(entry)
+            top.sort(reverse=True)
+            del top[self.top_k:]
+            node.top = top
+    
+    def _evict_words_locked(self):
+        """가중치 낮은 단어부터 max_words 의 90% 까지 지우고 남은 단어로 trie 재구성"""
+        keep = heapq.nlargest(int(self.max_words * 0.9), self.words.items(), key=lambda kv: kv[1][0])
+        self.words = dict(keep)
+        self.root = _TrieNode()
+        for word, (total, key) in keep:
+            self._insert_locked(word, key, total)
+    
+    def add(self, word, weight=1.0):
+        word = word.strip()
+        key = decompose_jamo(word)
+        if not key:
+            return
+        with self.lock:
+            if word not in self.words and len(self.words) >= self.max_words:
+                self._evict_words_locked()
+            total = self.words.get(word, (0.0, key))[0] + weight
+            self.words[word] = (total, key)
+            self._insert_locked(word, key, total)
+    
+    def learn(self, prefix, suggestions):
+        """실시간 응답을 반영하고 이 접두사를 조회 완료로 표시 (상위 제안어일수록 가중치 큼)"""
+        for rank, suggestion in enumerate(suggestions):
+            self.add(suggestion, 1.0 - rank / (2 * self.top_k))
+        key = decompose_jamo(prefix)
+        if not key or len(key) > self.max_depth:
+            return
+        with self.lock:
+            self.fetched[key] = time.time()
+            self.fetched.move_to_end(key)
+            if len(self.fetched) > self.max_prefixes:
+                self.fetched.popitem(last=False)
+    
+    def lookup(self, prefix, limit=AC_INDEX_TOP_K):
+        """AC_INDEX_TTL 안에 실시간 조회한 접두사면 제안어 목록, 아니면 None
+        
+        keywordstool 연관 키워드만으로는 답하지 않는다 (가중치에만 반영).
+        """
+        key = decompose_jamo(prefix)
+        if len(key) > self.max_depth:
+            return None
+        with self.lock:
+            fetched_at = self.fetched.get(key)
+            if fetched_at is None or time.time() - fetched_at >= AC_INDEX_TTL:
+                return None
+            self.fetched.move_to_end(key)
+            node = self._node(key)
+            if node is None:
+                return None
+            words = [word for _, word, word_key in node.top if word_key != key][:limit]
+        return words or None
+
+autocomplete_indexes = {"naver": JamoTrie(), "youtube": JamoTrie()}
+
+def observe_keyword_records(records):
+    """keywordstool 연관 키워드를 검색량 로그 가중치로 네이버 색인에 추가"""
+    index = autocomplete_indexes["naver"]
+    for record in records:
+        if record.keyword:
+            index.add(record.keyword, math.log10(1 + record.total) / 10)
+
+def keyword_records(keyword_list):
+    """keywordstool keywordList → [KeywordStat] (자동완성 색인에도 반영)"""
+    records = [KeywordStat.from_row(row) for row in keyword_list]
+    observe_keyword_records(records)
+    return records
+
+# 실시간 조회를 이미 기다린 호출자 (ASGI 프리페치) 는 False 로 두고 캐시/색인만 사용
+autocomplete_live = contextvars.ContextVar("autocomplete_live", default=True)
+
+def autocomplete_cache_key(provider, keyword):
+    return f"{'ac' if provider == 'naver' else 'yt'}_{keyword}"
+
+def fetch_and_learn_autocomplete(provider, fetch_func, keyword):
+    """실시간 조회 결과를 색인에 병합 (캐시 미스일 때만 호출됨)"""
+    result = fetch_func(keyword)
+    if result.get("success"):
+        autocomplete_indexes[provider].learn(keyword, result["data"])
+    return result
+
+def lookup_autocomplete(provider, keyword, fetch_func):
+    """최근 실시간 조회한 접두사는 로컬 색인이 바로 답하고, 처음 보는 접두사만 실시간 조회 (캐시)
+    
+    실시간 결과는 캐시와 색인에 병합된다.
+    """
+    local = autocomplete_indexes[provider].lookup(keyword)
+    if local is not None:
+        CACHE_REQUESTS.inc(f"autocomplete_{provider}_index", "hit")
+        return {"success": True, "data": local}
+    CACHE_REQUESTS.inc(f"autocomplete_{provider}_index", "miss")
+    
+    cache_key = autocomplete_cache_key(provider, keyword)
+    if not autocomplete_live.get():
+        with cache_lock:
+            entry = api_cache.get(cache_key)
+        if entry is not None and time.time() - entry[1] < CACHE_TTL and entry[0].get("success"):
+            return entry[0]
+        return {"success": False, "error": "자동완성 조회 실패"}
+    
+    return get_with_cache(cache_key, fetch_and_learn_autocomplete, provider, fetch_func, keyword)
+
 #############################################
 # 기본 기능: 자동완성어
 #############################################
-def get_autocomplete(keyword):
+NAVER_AC_URL = f"{NAVER_AC_BASE_URL}/nx/ac"
+NAVER_AC_HEADERS = {"User-Agent": "Mozilla/5.0", "Referer": "https://www.naver.com/"}
+
+def autocomplete_params(keyword):
+    return {"q": keyword, "con": "1", "frm": "nv", "ans": "2", "r_format": "json", "r_enc": "UTF-8", "r_unicode": "0", "t_koreng": "1", "run": "2", "rev": "4", "q_enc": "UTF-8", "st": "100"}
+
+def parse_autocomplete_items(payload, keyword):
+    """자동완성 응답 JSON → 제안어 (최대 10개)"""
+    suggestions = []
+    for item_group in payload.get("items", []):
+        if isinstance(item_group, list):
+            for item in item_group:
+                if isinstance(item, list) and item:
+                    kw = item[0][0] if isinstance(item[0], list) else item[0]
+                    if kw and kw != keyword and kw not in suggestions:
+                        suggestions.append(kw)
+                        if len(suggestions) >= 10:
+                            break
+    return suggestions
+
+def fetch_autocomplete(keyword):
+    """네이버 자동완성 조회"""
     try:
-        params = {"q": keyword, "con": "1", "frm": "nv", "ans": "2", "r_format": "json", "r_enc": "UTF-8", "r_unicode": "0", "t_koreng": "1", "run": "2", "rev": "4", "q_enc": "UTF-8", "st": "100"}
-        headers = {"User-Agent": "Mozilla/5.0", "Referer": "https://www.naver.com/"}
-        response = requests.get("https://ac.search.naver.com/nx/ac", params=params, headers=headers, timeout=3)
+        response = upstream_request("ac", "GET", NAVER_AC_URL, params=autocomplete_params(keyword), headers=NAVER_AC_HEADERS, timeout=3)
         
         if response.status_code == 200:
-            suggestions = []
-            for item_group in response.json().get("items", []):
-                if isinstance(item_group, list):
-                    for item in item_group:
-                        if isinstance(item, list) and item:
-                            kw = item[0][0] if isinstance(item[0], list) else item[0]
-                            if kw and kw != keyword and kw not in suggestions:
-                                suggestions.append(kw)
-                                if len(suggestions) >= 10:
-                                    break
-            
+            suggestions = parse_autocomplete_items(response.json(), keyword)
             if suggestions:
-                result = f"[자동완성] {keyword}\n\n"
-                for i, s in enumerate(suggestions, 1):
-                    result += f"{i}. {s}\n"
-                result += f"\n※ 띄어쓰기에 따라 결과 다름"
-                return result
-    except:
-        pass
+                return {"success": True, "data": suggestions}
+        
+        return {"success": False, "error": f"상태코드 {response.status_code}"}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def get_autocomplete(keyword):
+    result = lookup_autocomplete("naver", keyword, fetch_autocomplete)
+    
+    if result.get("success"):
+        response = f"[자동완성] {keyword}\n\n"
+        for i, s in enumerate(result["data"], 1):
+            response += f"{i}. {s}\n"
+        response += f"\n※ 띄어쓰기에 따라 결과 다름"
+        return response
     
     return f"[자동완성] {keyword}\n\n결과 없음"
 
 #############################################
 # 기본 기능: 유튜브 자동완성
 #############################################
-def get_youtube_autocomplete(keyword):
+YOUTUBE_AC_URL = f"{YOUTUBE_AC_BASE_URL}/complete/search"
+
+def youtube_autocomplete_params(keyword):
+    return {"client": "youtube", "ds": "yt", "q": keyword, "hl": "ko", "gl": "kr"}
+
+def parse_youtube_suggestions(text, keyword):
+    """JSONP 응답 → 제안어 (최대 10개)"""
+    start_idx = text.find('(')
+    end_idx = text.rfind(')')
+    if start_idx == -1 or end_idx == -1:
+        return []
+    
+    data = json.loads(text[start_idx + 1:end_idx])
+    
+    suggestions = []
+    if len(data) > 1 and isinstance(data[1], list):
+        for item in data[1]:
+            if isinstance(item, list) and len(item) > 0:
+                suggestion = item[0]
+                if suggestion and suggestion != keyword:
+                    suggestions.append(suggestion)
+    return suggestions[:10]
+
+def fetch_youtube_autocomplete(keyword):
+    """유튜브 자동완성 조회"""
     try:
-        url = "https://suggestqueries.google.com/complete/search"
-        params = {"client": "youtube", "ds": "yt", "q": keyword, "hl": "ko", "gl": "kr"}
         headers = {"User-Agent": "Mozilla/5.0"}
-        
-        response = requests.get(url, params=params, headers=headers, timeout=3)
+        response = upstream_request("youtube-ac", "GET", YOUTUBE_AC_URL, params=youtube_autocomplete_params(keyword), headers=headers, timeout=3)
         
         if response.status_code == 200:
-            text = response.text
-            start_idx = text.find('(')
-            end_idx = text.rfind(')')
-            if start_idx != -1 and end_idx != -1:
-                json_str = text[start_idx + 1:end_idx]
-                data = json.loads(json_str)
-                
-                suggestions = []
-                if len(data) > 1 and isinstance(data[1], list):
-                    for item in data[1]:
-                        if isinstance(item, list) and len(item) > 0:
-                            suggestion = item[0]
-                            if suggestion and suggestion != keyword:
-                                suggestions.append(suggestion)
-                
-                if suggestions:
-                    result = f"[유튜브 자동완성] {keyword}\n\n"
-                    for i, s in enumerate(suggestions[:10], 1):
-                        result += f"{i}. {s}\n"
-                    result += f"\n※ 띄어쓰기에 따라 결과 다름"
-                    return result.strip()
+            suggestions = parse_youtube_suggestions(response.text, keyword)
+            if suggestions:
+                return {"success": True, "data": suggestions}
+        
+        return {"success": False, "error": f"상태코드 {response.status_code}"}
     except Exception as e:
-        logger.error(f"유튜브 자동완성 오류: {str(e)}")
+        logger.error("유튜브 자동완성 오류: %s", e)
+        return {"success": False, "error": str(e)}
+
+def get_youtube_autocomplete(keyword):
+    result = lookup_autocomplete("youtube", keyword, fetch_youtube_autocomplete)
+    
+    if result.get("success"):
+        response = f"[유튜브 자동완성] {keyword}\n\n"
+        for i, s in enumerate(result["data"], 1):
+            response += f"{i}. {s}\n"
+        response += f"\n※ 띄어쓰기에 따라 결과 다름"
+        return response.strip()
     
     return f"[유튜브 자동완성] {keyword}\n\n결과 없음"
 
+#############################################
+# 기본 기능: 통합 자동완성 (네이버 + 유튜브 + 검색량)
+#############################################
+AC_COMBINED_DEADLINE = float(os.environ.get('AC_COMBINED_DEADLINE', 2.5))
+KEYWORDSTOOL_MAX_HINTS = 5
+
+def normalize_suggestion(text):
+    return text.replace(" ", "").upper()
+
+def fetch_keyword_volumes(keywords):
+    """keywordstool hintKeywords 에 최대 5개씩 담아 조회 → {정규화 키워드: 월간 검색량}"""
+    result = get_keyword_data(",".join(keywords))
+    if not result.get("success"):
+        return {"success": False, "error": result.get("error")}
+    volumes = {normalize_suggestion(record.keyword): record.total for record in result["data"]}
+    return {"success": True, "data": volumes}
+
+def get_keyword_volumes(keywords, timeout=None, executor=None):
+    """여러 키워드 검색량 (vol_ 캐시 → 없는 것만 5개 단위 병렬 일괄 조회, 기본 upstream_executor)"""
+    volumes = {}
+    missing = []
+    with cache_lock:
+        now = time.time()
+        for keyword in keywords:
+            key = normalize_suggestion(keyword)
+            entry = api_cache.get(f"vol_{key}")
+            if entry is not None and now - entry[1] < CACHE_TTL:
+                volumes[keyword] = entry[0]
+            else:
+                missing.append(keyword)
+    
+    chunks = [missing[i:i + KEYWORDSTOOL_MAX_HINTS] for i in range(0, len(missing), KEYWORDSTOOL_MAX_HINTS)]
+    futures = [
+        submit_with_context(fetch_keyword_volumes, [normalize_suggestion(k) for k in chunk], executor=executor)
+        for chunk in chunks
+    ]
+    done, _ = wait(futures, timeout=timeout)
+    
+    for chunk, future in zip(chunks, futures):
+        if future not in done or not future.result().get("success"):
+            continue
+        found = future.result()["data"]
+        for keyword in chunk:
+            key = normalize_suggestion(keyword)
+            if key in found:
+                volumes[keyword] = found[key]
+                store_cache_entry(f"vol_{key}", found[key])
+    return volumes
+
+def get_combined_suggestions(keyword, deadline=None):
+    """두 제공자를 동시에 호출해 마감 안에 온 결과만 병합·순위화, 검색량은 일괄 조회
+    
+    [(제안어, 점수, 제공자 목록, 검색량 또는 None)]
+    """
+    deadline_at = time.monotonic() + (deadline or AC_COMBINED_DEADLINE)
+    futures = {
+        "N": submit_with_context(lookup_autocomplete, "naver", keyword, fetch_autocomplete),
+        "Y": submit_with_context(lookup_autocomplete, "youtube", keyword, fetch_youtube_autocomplete)
+    }
+    wait(futures.values(), timeout=max(0, deadline_at - time.monotonic()))
+    
+    merged = {}
+    for provider, future in futures.items():
+        if not future.done() or not future.result().get("success"):
+            continue
+        suggestions = future.result()["data"]
+        for rank, suggestion in enumerate(suggestions):
+            key = normalize_suggestion(suggestion)
+            if key == normalize_suggestion(keyword):
+                continue
+            item = merged.setdefault(key, {"text": suggestion, "score": 0.0, "providers": []})
+            item["score"] += 1.0 - rank / (2 * len(suggestions))
+            item["providers"].append(provider)
+    
+    ranked = sorted(merged.values(), key=lambda item: item["score"], reverse=True)[:10]
+    volumes = get_keyword_volumes(
+        [item["text"] for item in ranked],
+        timeout=max(0, deadline_at - time.monotonic())
+    ) if ranked else {}
+    return [(item["text"], item["score"], item["providers"], volumes.get(item["text"])) for item in ranked]
+
+def get_combined_autocomplete(keyword):
+    with span("combined_autocomplete", keyword=keyword):
+        items = get_combined_suggestions(keyword)
+    
+    if not items:
+        return f"[통합 자동완성] {keyword}\n\n결과 없음"
+    
+    lines = [f"[통합 자동완성] {keyword}", "(N 네이버 · Y 유튜브 · 월간 검색량)", ""]
+    for i, (text, _, providers, volume) in enumerate(items, 1):
+        volume_text = f"{format_number(volume)}회" if volume is not None else "-"
+        lines.append(f"{i}. {text} · {volume_text} ({'·'.join(providers)})")
+    lines.append("")
+    lines.append("※ 띄어쓰기에 따라 결과 다름")
+    return "\n".join(lines)
+
 #############################################
 # 기본 기능: 대표키워드
 #############################################
@@ -1084,24 +2600,249 @@ def extract_place_id_from_url(url_or_id):
     match = re.search(r'\d{7,}', url_or_id)
     return match.group(0) if match else None
 
-def get_place_keywords(place_id):
-    headers = {"User-Agent": "Mozilla/5.0 (iPhone)", "Accept-Language": "ko-KR,ko;q=0.9"}
+PLACE_CATEGORIES = ['restaurant', 'place', 'cafe']
+PLACE_HEADERS = {"User-Agent": "Mozilla/5.0 (iPhone)", "Accept-Language": "ko-KR,ko;q=0.9"}
+
+def place_home_url(category, place_id):
+    return f"{NAVER_PLACE_BASE_URL}/{category}/{place_id}/home"
+
+class PlaceKeywordMatcher:
+    """플레이스 HTML 조각에서 '"keywordList":[...]' 가 완성되면 (또는 cancel 이 설정되면) 종료"""
     
-    for category in ['restaurant', 'place', 'cafe']:
+    KEY = '"keywordList"'
+    PREFIX = re.compile(r'"keywordList"\s*:\s*')
+    PATTERN = re.compile(r'"keywordList"\s*:\s*\[((?:"[^"]*",?\s*)*)\]')
+    MAX_PENDING = 65536
+    
+    def __init__(self, cancel=None):
+        self.buffer = ""
+        self.keywords = []
+        self.cancel = cancel
+    
+    def feed(self, text):
+        # 동시 조회 중 다른 카테고리가 먼저 성공하면 읽기 중단
+        if self.cancel is not None and self.cancel.is_set():
+            return True
+        self.buffer += text
+        while True:
+            start = self.buffer.find(self.KEY)
+            if start == -1:
+                self.buffer = self.buffer[-len(self.KEY):]
+                return False
+            self.buffer = self.buffer[start:]
+            
+            prefix = self.PREFIX.match(self.buffer)
+            if prefix is None or prefix.end() == len(self.buffer):
+                return False
+            
+            match = self.PATTERN.match(self.buffer)
+            if match:
+                self.keywords = json.loads("[" + match.group(1) + "]")
+                return True
+            
+            # 목록이 아니거나 너무 길게 안 닫히면 이 위치는 버리고 다음 등장 위치 탐색
+            if self.buffer[prefix.end()] != "[" or len(self.buffer) > self.MAX_PENDING:
+                self.buffer = self.buffer[1:]
+                continue
+            return False
+
+#############################################
+# 플레이스 캐시 (플레이스 ID → 카테고리, 대표키워드, 조회 시각)
+#############################################
+PLACE_CACHE_DB_PATH = os.environ.get('PLACE_CACHE_DB_PATH', 'place_cache.db')
+PLACE_CACHE_TTL = int(os.environ.get('PLACE_CACHE_TTL', 7 * 86400))
+PLACE_PROBE_TIMEOUT = float(os.environ.get('PLACE_PROBE_TIMEOUT', 5))
+PLACE_BULK_MAX = int(os.environ.get('PLACE_BULK_MAX', 20))
+PLACE_KAKAO_BULK_MAX = 5
+PLACE_BULK_WORKERS = int(os.environ.get('PLACE_BULK_WORKERS', 4))
+# 여러 곳 조회 한 건이 동시에 진행하는 플레이스 수
+PLACE_BULK_CONCURRENCY = int(os.environ.get('PLACE_BULK_CONCURRENCY', 2))
+
+# 카테고리 동시 조회용 (요청당 최대 3개, upstream_executor 작업 안에서 기다려도 교착 없음)
+place_probe_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('PLACE_PROBE_WORKERS', 12)),
+    thread_name_prefix="place-probe"
+)
+# 여러 곳 조회 (대표 a,b / /api/place-keywords) 는 건당 최대 10초씩 걸리는 조회를 여러 개 띄우므로
+# 실시간 요청이 쓰는 upstream_executor / place_probe_executor 와 분리
+place_bulk_executor = ThreadPoolExecutor(max_workers=PLACE_BULK_WORKERS, thread_name_prefix="place-bulk")
+place_bulk_probe_executor = ThreadPoolExecutor(
+    max_workers=PLACE_BULK_WORKERS * len(PLACE_CATEGORIES),
+    thread_name_prefix="place-bulk-probe"
+)
+_place_db_local = threading.local()
+
+PLACE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS place_cache (
+    place_id TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+def place_db():
+    return local_sqlite(PLACE_CACHE_DB_PATH, PLACE_SCHEMA, _place_db_local)
+
+def load_place_record(place_id):
+    """{"category", "keywords", "fetched_at"} 또는 None"""
+    try:
+        row = place_db().execute(
+            "SELECT category, keywords, fetched_at FROM place_cache WHERE place_id = ?", (place_id,)
+        ).fetchone()
+    except sqlite3.Error as e:
+        logger.error("❌ 플레이스 캐시 조회 실패: %s", e)
+        return None
+    if row is None:
+        return None
+    return {"category": row[0], "keywords": json.loads(row[1]), "fetched_at": row[2]}
+
+def save_place_record(place_id, category, keywords):
+    try:
+        place_db().execute(
+            "INSERT OR REPLACE INTO place_cache (place_id, category, keywords, fetched_at) VALUES (?, ?, ?, ?)",
+            (place_id, category, json.dumps(keywords, ensure_ascii=False), time.time())
+        )
+    except sqlite3.Error as e:
+        logger.error("❌ 플레이스 캐시 저장 실패: %s", e)
+
+def place_record_result(record):
+    return {"success": True, "keywords": record["keywords"], "category": record["category"]}
+
+def place_probe_rounds(record):
+    """알려진 카테고리가 있으면 그것만 먼저, 실패하면 나머지를 동시에 (없으면 전부 동시에)"""
+    known = record["category"] if record else None
+    if known not in PLACE_CATEGORIES:
+        return [list(PLACE_CATEGORIES)]
+    return [[known], [category for category in PLACE_CATEGORIES if category != known]]
+
+PLACE_NOT_FOUND = {"success": False, "error": "대표키워드를 찾을 수 없습니다."}
+
+def probe_place_category(place_id, category, cancel):
+    matcher = PlaceKeywordMatcher(cancel)
+    status_code, _ = upstream_stream(
+        "place", place_home_url(category, place_id), matcher,
+        headers=PLACE_HEADERS, timeout=PLACE_PROBE_TIMEOUT
+    )
+    if cancel.is_set() or status_code != 200:
+        return category, []
+    return category, matcher.keywords
+
+def probe_place_categories(place_id, categories, executor=None):
+    """카테고리 URL 을 동시에 요청해 먼저 대표키워드가 나온 것을 채택, 나머지는 중단"""
+    if len(categories) == 1:
         try:
-            url = f"https://m.place.naver.com/{category}/{place_id}/home"
-            response = requests.get(url, headers=headers, timeout=5)
-            if response.status_code == 200:
-                html = response.content.decode('utf-8', errors='ignore')
-                match = re.search(r'"keywordList"\s*:\s*\[((?:"[^"]*",?\s*)*)\]', html)
-                if match:
-                    keywords = json.loads("[" + match.group(1) + "]")
-                    if keywords:
-                        return {"success": True, "keywords": keywords}
-        except:
-            pass
+            return probe_place_category(place_id, categories[0], threading.Event())
+        except Exception:
+            return None, []
+    
+    cancel = threading.Event()
+    futures = [
+        submit_with_context(probe_place_category, place_id, category, cancel, executor=executor or place_probe_executor)
+        for category in categories
+    ]
+    try:
+        for future in as_completed(futures, timeout=PLACE_PROBE_TIMEOUT * 2):
+            try:
+                category, keywords = future.result()
+            except Exception:
+                continue
+            if keywords:
+                return category, keywords
+    except FuturesTimeoutError:
+        pass
+    finally:
+        cancel.set()
+        for future in futures:
+            future.cancel()
+    return None, []
+
+def get_place_keywords(place_id, probe_executor=None):
+    """플레이스 캐시 → 카테고리 동시 조회 (실패 시 만료된 캐시라도 반환)"""
+    record = load_place_record(place_id)
+    if record and time.time() - record["fetched_at"] < PLACE_CACHE_TTL:
+        return place_record_result(record)
+    
+    with span("place_probe", place_id=place_id) as span_attrs:
+        for categories in place_probe_rounds(record):
+            category, keywords = probe_place_categories(place_id, categories, probe_executor)
+            if keywords:
+                span_attrs["category"] = category
+                save_place_record(place_id, category, keywords)
+                return {"success": True, "keywords": keywords, "category": category}
+    
+    return place_record_result(record) if record else PLACE_NOT_FOUND
+
+def split_place_inputs(input_str):
+    """쉼표/공백/줄바꿈으로 나눈 플레이스 ID·URL 목록 (순서 유지, 중복 제거)"""
+    return list(dict.fromkeys(token for token in re.split(r'[,\s]+', input_str) if token))
+
+def get_place_keywords_bulk(inputs, on_progress=None, executor=None, probe_executor=None):
+    """여러 플레이스 ID/URL → 대표키워드 + 검색량 (검색량은 전체 키워드 합집합으로 한 번에 조회)
+    
+    [{"input", "place_id", "success", "category", "keywords": [(키워드, 검색량 또는 None)], "error"}]
+    조회는 executor / probe_executor (기본 place_bulk_*) 에서 요청당 PLACE_BULK_CONCURRENCY 곳씩 진행하고,
+    on_progress(완료 수, 전체 수) 는 플레이스 하나가 끝날 때마다 호출된다.
+    """
+    executor = executor or place_bulk_executor
+    probe_executor = probe_executor or place_bulk_probe_executor
+    place_ids = {text: extract_place_id_from_url(text) for text in inputs}
+    pending = deque(dict.fromkeys(p for p in place_ids.values() if p))
+    total = len(pending)
+    running = {}
+    results = {}
+    while pending or running:
+        while pending and len(running) < PLACE_BULK_CONCURRENCY:
+            place_id = pending.popleft()
+            future = submit_with_context(
+                get_with_cache, f"place_{place_id}", get_place_keywords, place_id, probe_executor, executor=executor
+            )
+            running[future] = place_id
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            place_id = running.pop(future)
+            try:
+                results[place_id] = future.result()
+            except Exception as e:
+                results[place_id] = {"success": False, "error": str(e)}
+            if on_progress is not None:
+                on_progress(len(results), total)
+    
+    all_keywords = list(dict.fromkeys(
+        keyword for result in results.values() if result["success"] for keyword in result["keywords"]
+    ))
+    volumes = get_keyword_volumes(all_keywords, executor=executor) if all_keywords else {}
+    
+    items = []
+    for text, place_id in place_ids.items():
+        result = results.get(place_id, {"success": False, "error": "플레이스 ID를 찾을 수 없습니다."})
+        item = {"input": text, "place_id": place_id, "success": result["success"]}
+        if result["success"]:
+            item["category"] = result.get("category")
+            item["keywords"] = [(keyword, volumes.get(keyword)) for keyword in result["keywords"]]
+        else:
+            item["error"] = result["error"]
+        items.append(item)
+    return items
+
+def format_place_keywords_bulk(inputs):
+    inputs = inputs[:PLACE_KAKAO_BULK_MAX]
+    with span("place_bulk", places=len(inputs)):
+        items = get_place_keywords_bulk(inputs)
     
-    return {"success": False, "error": "대표키워드를 찾을 수 없습니다."}
+    lines = [f"[대표키워드] {len(items)}곳 (월간 검색량)", "━━━━━━━━━━━━━━"]
+    for item in items:
+        lines.append("")
+        if not item["success"]:
+            lines.append(f"📍 {item['place_id'] or item['input']}: {item['error']}")
+            continue
+        lines.append(f"📍 {item['place_id']}")
+        for keyword, volume in item["keywords"]:
+            volume_text = f"{format_number(volume)}회" if volume is not None else "-"
+            lines.append(f"· {keyword} {volume_text}")
+    lines.append("")
+    lines.append(f"※ 한 번에 최대 {PLACE_KAKAO_BULK_MAX}곳")
+    return "\n".join(lines)
 
 def format_place_keywords(input_str):
     place_id = extract_place_id_from_url(input_str.strip())
@@ -1109,7 +2850,7 @@ def format_place_keywords(input_str):
     if not place_id:
         return f"[대표키워드] 조회 실패\n\n플레이스 ID를 찾을 수 없습니다.\n\n예) 대표 1529801174"
     
-    result = get_place_keywords(place_id)
+    result = get_with_cache(f"place_{place_id}", get_place_keywords, place_id)
     
     if not result["success"]:
         return f"[대표키워드] 조회 실패\n\n{result['error']}"
@@ -1125,22 +2866,35 @@ def format_place_keywords(input_str):
 #############################################
 # 재미 기능: 운세
 #############################################
-def get_fortune(birthdate=None):
-    if not GEMINI_API_KEY:
-        return get_fortune_fallback(birthdate)
-    
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={GEMINI_API_KEY}"
+def gemini_url():
+    return f"{GEMINI_BASE_URL}/v1beta/models/gemini-1.5-flash:generateContent?key={GEMINI_API_KEY}"
+
+def gemini_payload(prompt, temperature, max_output_tokens):
+    return {
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": {"temperature": temperature, "maxOutputTokens": max_output_tokens}
+    }
+
+def parse_gemini_text(payload):
+    return payload["candidates"][0]["content"]["parts"][0]["text"]
+
+def parse_birthdate(birthdate):
+    """6자리/8자리 생년월일 → (년, 월, 일), 형식이 다르면 None"""
+    if not birthdate:
+        return None
+    if len(birthdate) == 6:
+        year = f"19{birthdate[:2]}" if int(birthdate[:2]) > 30 else f"20{birthdate[:2]}"
+        return year, birthdate[2:4], birthdate[4:6]
+    if len(birthdate) == 8:
+        return birthdate[:4], birthdate[4:6], birthdate[6:8]
+    return None
+
+def build_fortune_prompt(birthdate=None):
+    parsed = parse_birthdate(birthdate)
     
-    if birthdate:
-        if len(birthdate) == 6:
-            year = f"19{birthdate[:2]}" if int(birthdate[:2]) > 30 else f"20{birthdate[:2]}"
-            month, day = birthdate[2:4], birthdate[4:6]
-        elif len(birthdate) == 8:
-            year, month, day = birthdate[:4], birthdate[4:6], birthdate[6:8]
-        else:
-            return get_fortune()
-        
-        prompt = f"""생년월일 {year}년 {month}월 {day}일생의 오늘 운세를 알려줘.
+    if parsed:
+        year, month, day = parsed
+        return f"""생년월일 {year}년 {month}월 {day}일생의 오늘 운세를 알려줘.
 형식:
 [운세] {year}년 {month}월 {day}일생
 
@@ -1153,8 +2907,8 @@ def get_fortune(birthdate=None):
 행운의 색: (1개)
 
 재미있고 긍정적으로. 이모티콘 없이."""
-    else:
-        prompt = """오늘의 운세를 알려줘.
+    
+    return """오늘의 운세를 알려줘.
 형식:
 [오늘의 운세]
 
@@ -1167,61 +2921,293 @@ def get_fortune(birthdate=None):
 행운의 색: (1개)
 
 재미있고 긍정적으로. 이모티콘 없이."""
+
+def get_fortune(birthdate=None):
+    """캐시 → Gemini 와 대체 문구 경쟁 (내보낸 쪽을 그날 답으로 저장)"""
+    day, subject = fortune_key(birthdate)
+    return cached_fortune(day, subject) or race_fortune(birthdate, day, subject)
+
+def race_fortune(birthdate, day, subject):
+    if not GEMINI_API_KEY:
+        return get_fortune_fallback(birthdate, day)
+    text = race_with_fallback(
+        "fortune",
+        lambda: generate_fortune(day, subject),
+        lambda: get_fortune_fallback(birthdate, day)
+    )
+    # 대체 문구는 저장하지 않음: 늦게 끝난 Gemini 응답이 generate_fortune 에서 저장돼 다음 요청부터 나가고,
+    # 그 전까지는 날짜·생년월일 시드라 같은 대체 문구가 나감
+    return text
+
+FORTUNE_PHRASES = (
+    ["오늘은 새로운 기회가 찾아오는 날!", "좋은 소식이 들려올 예정이에요."],
+    ["설레는 만남이 있을 수 있어요", "소중한 사람과 대화를 나눠보세요"],
+    ["작은 횡재수가 있어요", "절약이 미덕인 날"],
+    ["집중력이 높아지는 시간", "새 프로젝트에 도전해보세요"],
+)
+FORTUNE_COLORS = ["빨간색", "파란색", "노란색", "초록색", "보라색"]
+# 총운~직장운 문구 조합을 미리 완성해 두고 하나만 고름
+FORTUNE_FALLBACK_BODIES = [
+    f"총운: {overall}\n애정운: {love}\n금전운: {money}\n직장운: {work}"
+    for overall, love, money, work in itertools.product(*FORTUNE_PHRASES)
+]
+
+def get_fortune_fallback(birthdate=None, day=None):
+    """날짜·생년월일로 시드를 고정해 같은 날 같은 사람에게는 같은 문구"""
+    rng = random.Random(f"{day or kst_today().isoformat()}:{fortune_key(birthdate)[1]}")
+    body = rng.choice(FORTUNE_FALLBACK_BODIES)
+    lucky_numbers = sorted(rng.sample(range(1, 46), 3))
+    
+    parsed = parse_birthdate(birthdate)
+    if parsed:
+        year, month, day = parsed
+        title = f"[운세] {year}년 {month}월 {day}일생"
+    else:
+        title = "[오늘의 운세]"
     
+    return f"""{title}
+{body}
+
+행운의 숫자: {lucky_numbers[0]}, {lucky_numbers[1]}, {lucky_numbers[2]}
+행운의 색: {rng.choice(FORTUNE_COLORS)}"""
+
+#############################################
+# Gemini 호출 (동시 호출 수 제한)
+#############################################
+GEMINI_MAX_CONCURRENCY = int(os.environ.get('GEMINI_MAX_CONCURRENCY', 4))
+# 동기 경로와 asgi (acquire_gemini_slot) 가 함께 쓰는 프로세스 전체 한도
+gemini_semaphore = threading.BoundedSemaphore(GEMINI_MAX_CONCURRENCY)
+
+def gemini_text(prompt, temperature, max_output_tokens, timeout=4):
+    """Gemini 응답 텍스트, 키 없음/실패/슬롯 대기 초과 시 None"""
+    if not GEMINI_API_KEY:
+        return None
+    if not gemini_semaphore.acquire(timeout=timeout):
+        logger.warning("⚠️ Gemini 동시 호출 한도 (%d) 대기 초과", GEMINI_MAX_CONCURRENCY)
+        return None
     try:
-        response = requests.post(url, json={
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {"temperature": 0.9, "maxOutputTokens": 500}
-        }, timeout=4)
+        response = upstream_request("gemini", "POST", gemini_url(), json=gemini_payload(prompt, temperature, max_output_tokens), timeout=timeout)
         if response.status_code == 200:
-            return response.json()["candidates"][0]["content"]["parts"][0]["text"]
-    except:
+            return parse_gemini_text(response.json())
+    except Exception:
         pass
-    
-    return get_fortune_fallback(birthdate)
+    finally:
+        gemini_semaphore.release()
+    return None
+
+#############################################
+# 지연 예산 경쟁 (느린 호출 vs 즉시 계산되는 대체값)
+#############################################
+LLM_LATENCY_BUDGET = float(os.environ.get('LLM_LATENCY_BUDGET', 1.2))
+
+def record_race(name, path, start):
+    FAST_PATH_RACES.inc(name, path)
+    FAST_PATH_LATENCY.observe(time.perf_counter() - start, name, path)
+
+def finish_late_primary(name, value, on_late=None):
+    """대체값을 이미 반환한 뒤 끝난 primary 결과 처리 (다음 요청용 캐시 채우기)"""
+    FAST_PATH_LATE.inc(name, "ok" if value else "failed")
+    if value and on_late is not None:
+        try:
+            on_late(value)
+        except Exception as e:
+            logger.error("❌ %s 늦은 응답 처리 실패: %s", name, e)
 
-def get_fortune_fallback(birthdate=None):
-    fortunes = ["오늘은 새로운 기회가 찾아오는 날!", "좋은 소식이 들려올 예정이에요."]
-    love = ["설레는 만남이 있을 수 있어요", "소중한 사람과 대화를 나눠보세요"]
-    money = ["작은 횡재수가 있어요", "절약이 미덕인 날"]
-    work = ["집중력이 높아지는 시간", "새 프로젝트에 도전해보세요"]
-    lucky_numbers = sorted(random.sample(range(1, 46), 3))
-    colors = ["빨간색", "파란색", "노란색", "초록색", "보라색"]
+def race_with_fallback(name, primary, fallback, budget=None, on_late=None):
+    """primary 를 백그라운드에서 시작하고 fallback 을 동시에 계산
     
-    if birthdate and len(birthdate) in [6, 8]:
-        if len(birthdate) == 6:
-            year = f"19{birthdate[:2]}" if int(birthdate[:2]) > 30 else f"20{birthdate[:2]}"
-            month, day = birthdate[2:4], birthdate[4:6]
-        else:
-            year, month, day = birthdate[:4], birthdate[4:6], birthdate[6:8]
-        
-        return f"""[운세] {year}년 {month}월 {day}일생
-총운: {random.choice(fortunes)}
-애정운: {random.choice(love)}
-금전운: {random.choice(money)}
-직장운: {random.choice(work)}
+    budget 초 안에 primary 가 값을 내면 그 값을, 아니면 fallback 값을 반환한다.
+    늦은 primary 는 계속 진행되고 끝나면 on_late(값) 으로 넘겨진다.
+    """
+    budget = LLM_LATENCY_BUDGET if budget is None else budget
+    start = time.perf_counter()
+    future = submit_with_context(primary)
+    fallback_value = fallback()
+    
+    try:
+        value = future.result(timeout=max(0, budget - (time.perf_counter() - start)))
+    except FuturesTimeoutError:
+        future.add_done_callback(
+            lambda f: finish_late_primary(name, f.exception() is None and f.result(), on_late)
+        )
+        record_race(name, "fallback_timeout", start)
+        return fallback_value
+    except Exception:
+        value = None
+    
+    if value:
+        record_race(name, "primary", start)
+        return value
+    record_race(name, "fallback_failed", start)
+    return fallback_value
 
-행운의 숫자: {lucky_numbers[0]}, {lucky_numbers[1]}, {lucky_numbers[2]}
-행운의 색: {random.choice(colors)}"""
+#############################################
+# 운세 캐시 (날짜 × 생년월일, 워커 간 공유 sqlite)
+#############################################
+FORTUNE_DB_PATH = os.environ.get('FORTUNE_DB_PATH', 'fortune.db')
+FORTUNE_PREGEN_ENABLED = os.environ.get('FORTUNE_PREGEN_ENABLED', '1') == '1'
+FORTUNE_PREGEN_INTERVAL = int(os.environ.get('FORTUNE_PREGEN_INTERVAL', 600))
+FORTUNE_PREGEN_MAX = int(os.environ.get('FORTUNE_PREGEN_MAX', 200))
+FORTUNE_PREGEN_BATCH = int(os.environ.get('FORTUNE_PREGEN_BATCH', GEMINI_MAX_CONCURRENCY))
+# 사전 생성 대상 생년월일 보관 기간 (마지막 요청 후 일수, 지나면 사전 생성 때 삭제)
+FORTUNE_SUBJECT_DAYS = int(os.environ.get('FORTUNE_SUBJECT_DAYS', 7))
+FORTUNE_SUBJECTS_PENDING_MAX = 5000
+
+_fortune_db_local = threading.local()
+
+# 요청 경로에서는 메모리에만 모으고 사전 생성 주기마다 한 번에 기록 (대상 → 마지막 요청 시각)
+pending_fortune_subjects = {}
+pending_fortune_subjects_lock = threading.Lock()
+
+FORTUNE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fortune_cache (
+    day TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (day, subject)
+);
+CREATE TABLE IF NOT EXISTS fortune_subjects (
+    subject TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fortune_meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+def fortune_db():
+    return local_sqlite(FORTUNE_DB_PATH, FORTUNE_SCHEMA, _fortune_db_local)
+
+# 서버 (Render) 는 UTC 라 date.today() 면 한국 시각 00~09시에 전날 운세가 나감
+KST = timezone(timedelta(hours=9))
+
+def kst_today():
+    return datetime.now(KST).date()
+
+def fortune_key(birthdate=None):
+    """(오늘 날짜 (KST), 'YYYYMMDD' 또는 'generic')"""
+    parsed = parse_birthdate(birthdate)
+    return kst_today().isoformat(), "".join(parsed) if parsed else "generic"
+
+def note_fortune_subject(subject):
+    """사전 생성 대상 후보로 메모리에 기록 (사전 생성이 꺼져 있으면 생년월일을 남기지 않음)"""
+    if subject == "generic" or not (FORTUNE_PREGEN_ENABLED and GEMINI_API_KEY):
+        return
+    with pending_fortune_subjects_lock:
+        if subject in pending_fortune_subjects or len(pending_fortune_subjects) < FORTUNE_SUBJECTS_PENDING_MAX:
+            pending_fortune_subjects[subject] = time.time()
+
+def flush_fortune_subjects():
+    """모아 둔 대상을 fortune_subjects 에 한 번에 기록, 기록한 수 반환"""
+    with pending_fortune_subjects_lock:
+        batch = list(pending_fortune_subjects.items())
+        pending_fortune_subjects.clear()
+    if not batch:
+        return 0
+    conn = fortune_db()
+    try:
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO fortune_subjects (subject, last_seen) VALUES (?, ?) "
+            "ON CONFLICT(subject) DO UPDATE SET last_seen = MAX(last_seen, excluded.last_seen)",
+            batch
+        )
+        conn.execute("COMMIT")
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.rollback()
+        logger.error("❌ 운세 대상 기록 실패: %s", e)
+        return 0
+    return len(batch)
+
+def cached_fortune(day, subject):
+    """요청된 대상을 기록하고 캐시된 운세 반환 (없으면 None)"""
+    note_fortune_subject(subject)
+    try:
+        row = fortune_db().execute(
+            "SELECT text FROM fortune_cache WHERE day = ? AND subject = ?", (day, subject)
+        ).fetchone()
+    except sqlite3.Error as e:
+        logger.error("❌ 운세 캐시 조회 실패: %s", e)
+        return None
+    CACHE_REQUESTS.inc("fortune", "hit" if row else "miss")
+    return row[0] if row else None
+
+def save_fortune(day, subject, text):
+    """먼저 저장된 답을 유지 (같은 날 같은 사람에게 다른 운세가 나가지 않도록), 저장된 답 반환"""
+    try:
+        conn = fortune_db()
+        conn.execute(
+            "INSERT OR IGNORE INTO fortune_cache (day, subject, text, created) VALUES (?, ?, ?, ?)",
+            (day, subject, text, time.time())
+        )
+        row = conn.execute("SELECT text FROM fortune_cache WHERE day = ? AND subject = ?", (day, subject)).fetchone()
+    except sqlite3.Error as e:
+        logger.error("❌ 운세 캐시 저장 실패: %s", e)
+        return text
+    return row[0] if row else text
+
+def generate_fortune(day, subject):
+    """Gemini 로 생성해 저장 (이미 저장된 답이 있으면 그 답), 실패 시 None"""
+    birthdate = None if subject == "generic" else subject
+    text = gemini_text(build_fortune_prompt(birthdate), 0.9, 500)
+    if text:
+        return save_fortune(day, subject, text)
+    return text
+
+def pregenerate_fortunes(day=None):
+    """오늘 운세가 없는 대상 (generic + 최근 요청된 생년월일) 을 배치 단위로 미리 생성, 피크가 되면 중단"""
+    day = day or kst_today().isoformat()
+    flush_fortune_subjects()
+    conn = fortune_db()
+    conn.execute("DELETE FROM fortune_cache WHERE day < ?", (day,))
+    conn.execute("DELETE FROM fortune_subjects WHERE last_seen < ?", (time.time() - FORTUNE_SUBJECT_DAYS * 86400,))
+    subjects = ["generic"] + [row[0] for row in conn.execute(
+        "SELECT subject FROM fortune_subjects WHERE subject != 'generic' ORDER BY last_seen DESC LIMIT ?",
+        (FORTUNE_PREGEN_MAX,)
+    )]
+    cached = {row[0] for row in conn.execute("SELECT subject FROM fortune_cache WHERE day = ?", (day,))}
+    missing = [subject for subject in subjects if subject not in cached]
     
-    return f"""[오늘의 운세]
-총운: {random.choice(fortunes)}
-애정운: {random.choice(love)}
-금전운: {random.choice(money)}
-직장운: {random.choice(work)}
+    generated = 0
+    for i in range(0, len(missing), FORTUNE_PREGEN_BATCH):
+        if is_peak_traffic():
+            break
+        futures = [submit_with_context(generate_fortune, day, subject) for subject in missing[i:i + FORTUNE_PREGEN_BATCH]]
+        generated += sum(1 for future in futures if future.result())
+    
+    if missing:
+        logger.info("🔮 운세 사전 생성: %d/%d (%s)", generated, len(missing), day)
+    return {"day": day, "missing": len(missing), "generated": generated}
 
-행운의 숫자: {lucky_numbers[0]}, {lucky_numbers[1]}, {lucky_numbers[2]}
-행운의 색: {random.choice(colors)}"""
+def claim_fortune_pregen(now=None):
+    """여러 워커 중 한 곳만 이번 주기 사전 생성을 맡도록 sqlite 에서 선점"""
+    now = now or time.time()
+    conn = fortune_db()
+    conn.execute("INSERT OR IGNORE INTO fortune_meta (key, value) VALUES ('last_pregen', 0)")
+    cursor = conn.execute(
+        "UPDATE fortune_meta SET value = ? WHERE key = 'last_pregen' AND value <= ?",
+        (now, now - FORTUNE_PREGEN_INTERVAL + 1)
+    )
+    return cursor.rowcount == 1
+
+def fortune_pregen_loop():
+    while True:
+        time.sleep(FORTUNE_PREGEN_INTERVAL)
+        try:
+            # 선점하지 못한 워커도 자기가 모은 대상은 기록
+            flush_fortune_subjects()
+            if not is_peak_traffic() and claim_fortune_pregen():
+                pregenerate_fortunes()
+        except Exception as e:
+            logger.error("❌ 운세 사전 생성 루프 오류: %s", e, exc_info=True)
 
 #############################################
 # 재미 기능: 로또
 #############################################
-def get_lotto():
-    if not GEMINI_API_KEY:
-        return get_lotto_fallback()
-    
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={GEMINI_API_KEY}"
-    prompt = """로또 번호 5세트 추천. 1~45, 각 6개, 오름차순.
+LOTTO_PROMPT = """로또 번호 5세트 추천. 1~45, 각 6개, 오름차순.
 형식:
 [로또 번호 추천]
 
@@ -1232,18 +3218,36 @@ def get_lotto():
 00, 00, 00, 00, 00, 00
 
 행운을 빕니다!"""
+
+# 기본값이면 보충 한 번 (약 150개) 에 Gemini 추천은 3개뿐이라 로또 응답의 약 98% 가 로컬 난수.
+# LOTTO_POOL_GEMINI_BATCH 로 비율을 올리거나, LOTTO_POOL_SIZE=0 으로 풀을 끄면 예전처럼 요청마다 Gemini 와 경쟁
+LOTTO_POOL_SIZE = int(os.environ.get('LOTTO_POOL_SIZE', 200))
+LOTTO_POOL_LOW_WATER = int(os.environ.get('LOTTO_POOL_LOW_WATER', 50))
+LOTTO_POOL_GEMINI_BATCH = int(os.environ.get('LOTTO_POOL_GEMINI_BATCH', 3))
+
+def get_lotto():
+    """풀이 비었을 때의 경로: Gemini 와 대체 번호 경쟁 (늦은 추천은 풀로)"""
+    if not GEMINI_API_KEY:
+        return get_lotto_fallback()
+    return race_with_fallback(
+        "lotto",
+        lambda: gemini_text(LOTTO_PROMPT, 1.0, 400),
+        get_lotto_fallback,
+        on_late=lambda text: lotto_pool.push([text])
+    )
+
+def generate_lotto_batch(count):
+    """풀 보충용: Gemini 추천 최대 LOTTO_POOL_GEMINI_BATCH 개 (동시) + 나머지는 로컬 난수
     
-    try:
-        response = requests.post(url, json={
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {"temperature": 1.0, "maxOutputTokens": 400}
-        }, timeout=4)
-        if response.status_code == 200:
-            return response.json()["candidates"][0]["content"]["parts"][0]["text"]
-    except:
-        pass
-    
-    return get_lotto_fallback()
+    Gemini 비율은 LOTTO_POOL_GEMINI_BATCH / count 라서 기본 설정에서는 대부분 로컬 난수다.
+    """
+    texts = []
+    if GEMINI_API_KEY:
+        futures = [submit_with_context(gemini_text, LOTTO_PROMPT, 1.0, 400) for _ in range(min(count, LOTTO_POOL_GEMINI_BATCH))]
+        texts = [text for text in (future.result() for future in futures) if text]
+    texts += [get_lotto_fallback() for _ in range(count - len(texts))]
+    random.shuffle(texts)
+    return texts
 
 def get_lotto_fallback():
     result = "[로또 번호 추천]\n\n"
@@ -1256,33 +3260,48 @@ def get_lotto_fallback():
 #############################################
 # DataLab API
 #############################################
-def get_datalab_trend(keyword, start_date, end_date):
-    """DataLab 트렌드 조회"""
-    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
-        logger.warning("⚠️ DataLab API 키 미설정")
-        return {"success": False, "error": "DataLab API 키 미설정"}
-    
-    url = "https://openapi.naver.com/v1/datalab/search"
-    
-    payload = {
+DATALAB_URL = f"{NAVER_OPENAPI_BASE_URL}/v1/datalab/search"
+
+def datalab_payload(keyword, start_date, end_date):
+    return {
         "startDate": start_date,
         "endDate": end_date,
         "timeUnit": "month",
         "keywordGroups": [{"groupName": keyword, "keywords": [keyword]}]
     }
+
+def datalab_headers():
+    return {
+        "X-Naver-Client-Id": NAVER_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
+        "Content-Type": "application/json"
+    }
+
+def datalab_periods(today=None):
+    """비교 분석용 (올해 기간, 작년 기간)"""
+    today = today or date.today()
+    last_year = today.year - 1
+    return (
+        (f"{today.year}-01-01", f"{today.year}-11-30"),
+        (f"{last_year}-01-01", f"{last_year}-11-30"),
+    )
+
+def get_datalab_trend(keyword, start_date, end_date):
+    """DataLab 트렌드 조회"""
+    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        logger.warning("⚠️ DataLab API 키 미설정")
+        return {"success": False, "error": "DataLab API 키 미설정"}
     
-    headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
-        "Content-Type": "application/json"
-    }
+    url = DATALAB_URL
+    payload = datalab_payload(keyword, start_date, end_date)
+    headers = datalab_headers()
     
     try:
-        logger.info(f"📡 DataLab 요청: {keyword} ({start_date} ~ {end_date})")
+        logger.info("📡 DataLab 요청: %s (%s ~ %s)", keyword, start_date, end_date)
         
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
+        response = upstream_request("datalab", "POST", url, headers=headers, json=payload, timeout=10)
         
-        logger.info(f"📥 상태코드: {response.status_code}")
+        logger.info("📥 상태코드: %s", response.status_code)
         
         if response.status_code == 200:
             data = response.json()
@@ -1290,12 +3309,12 @@ def get_datalab_trend(keyword, start_date, end_date):
             results = data.get("results", [])
             if results and results[0].get("data"):
                 data_count = len(results[0]["data"])
-                logger.info(f"✅ 데이터 {data_count}개 수신")
+                logger.info("✅ 데이터 %s개 수신", data_count)
                 return {"success": True, "data": results[0]["data"]}
             else:
-                logger.warning(f"⚠️ 빈 결과")
+                logger.warning("⚠️ 빈 결과")
         else:
-            logger.error(f"❌ API 오류 {response.status_code}")
+            logger.error("❌ API 오류 %s", response.status_code)
         
         return {"success": False, "error": f"상태코드 {response.status_code}"}
         
@@ -1303,49 +3322,50 @@ def get_datalab_trend(keyword, start_date, end_date):
         logger.error("❌ 타임아웃 (10초)")
         return {"success": False, "error": "요청 시간 초과"}
     except Exception as e:
-        logger.error(f"❌ 예외: {str(e)}")
+        logger.error("❌ 예외: %s", e)
         return {"success": False, "error": str(e)}
 
 def get_comparison_analysis(keyword):
     """검색량 전년 비교 분석"""
     
-    logger.info(f"🔍 비교 분석 시작: {keyword}")
+    logger.info("🔍 비교 분석 시작: %s", keyword)
     
-    current_data = get_keyword_data(keyword)
+    current_data = get_with_cache(f"kw_{keyword}", get_keyword_data, keyword)
     
     if not current_data["success"]:
-        logger.error(f"❌ 검색광고 API 실패: {keyword}")
+        logger.error("❌ 검색광고 API 실패: %s", keyword)
         return None
     
     kw = current_data["data"][0]
-    pc_qc = parse_count(kw.get("monthlyPcQcCnt"))
-    mobile_qc = parse_count(kw.get("monthlyMobileQcCnt"))
-    total_volume_2025 = pc_qc + mobile_qc
+    pc_qc = kw.pc
+    mobile_qc = kw.mobile
+    total_volume_2025 = kw.total
     mobile_ratio = (mobile_qc * 100 / total_volume_2025) if total_volume_2025 > 0 else 75
     
-    logger.info(f"✅ 현재 검색량: {total_volume_2025:,}회")
-    
-    today = date.today()
-    
-    this_year_start = f"{today.year}-01-01"
-    this_year_end = f"{today.year}-11-30"
+    logger.info("✅ 현재 검색량: %d회", total_volume_2025)
     
-    last_year = today.year - 1
-    last_year_start = f"{last_year}-01-01"
-    last_year_end = f"{last_year}-11-30"
+    (this_year_start, this_year_end), (last_year_start, last_year_end) = datalab_periods()
     
-    trend_2025 = get_datalab_trend(keyword, this_year_start, this_year_end)
-    trend_2024 = get_datalab_trend(keyword, last_year_start, last_year_end)
+    trend_2025 = get_with_cache(
+        f"dl_{keyword}_{this_year_start}_{this_year_end}",
+        get_datalab_trend,
+        keyword, this_year_start, this_year_end
+    )
+    trend_2024 = get_with_cache(
+        f"dl_{keyword}_{last_year_start}_{last_year_end}",
+        get_datalab_trend,
+        keyword, last_year_start, last_year_end
+    )
     
     if not trend_2025["success"] or not trend_2024["success"]:
-        logger.warning(f"⚠️ DataLab API 실패")
+        logger.warning("⚠️ DataLab API 실패")
         return create_fallback_comparison(keyword, total_volume_2025, mobile_ratio)
     
     data_2025 = trend_2025["data"]
     data_2024 = trend_2024["data"]
     
     if not data_2025 or not data_2024:
-        logger.warning(f"⚠️ DataLab 빈 데이터")
+        logger.warning("⚠️ DataLab 빈 데이터")
         return create_fallback_comparison(keyword, total_volume_2025, mobile_ratio)
     
     avg_ratio_2025 = sum(d.get("ratio", 0) for d in data_2025) / len(data_2025)
@@ -1355,7 +3375,7 @@ def get_comparison_analysis(keyword):
     
     volume_2024 = int(total_volume_2025 / (1 + change_rate / 100)) if change_rate != 0 else total_volume_2025
     
-    logger.info(f"✅ 증감률: {change_rate:+.1f}% → 2024년 추정: {volume_2024:,}회")
+    logger.info("✅ 증감률: %+.1f%% → 2024년 추정: %d회", change_rate, volume_2024)
     
     recent_6_months_2025 = data_2025[-6:] if len(data_2025) >= 6 else data_2025
     recent_6_months_2024 = data_2024[-6:] if len(data_2024) >= 6 else data_2024
@@ -1392,7 +3412,7 @@ def create_fallback_comparison(keyword, current_volume, mobile_ratio):
             "ratio": random.uniform(30, 80)
         })
     
-    logger.warning(f"⚠️ 가상 데이터 사용: {keyword}")
+    logger.warning("⚠️ 가상 데이터 사용: %s", keyword)
     
     return {
         "keyword": keyword,
@@ -1481,12 +3501,12 @@ def create_comparison_chart_url(analysis):
         
         url = f"https://quickchart.io/chart?c={encoded}&width=800&height=450&backgroundColor=white"
         
-        logger.info(f"✅ 비교 차트 URL 생성: {len(url)}자")
+        logger.info("✅ 비교 차트 URL 생성: %s자", len(url))
         
         return url
         
     except Exception as e:
-        logger.error(f"❌ 비교 차트 생성 오류: {str(e)}")
+        logger.error("❌ 비교 차트 생성 오류: %s", e)
         return None
 
 def format_comparison_text(analysis):
@@ -1649,6 +3669,9 @@ def get_help():
 ▶ '유튜브' 자동완성어
 예) 유튜브 부평맛집
 
+▶ 네이버+유튜브 통합 (검색량 포함)
+예) 통합 부평맛집
+
 ▶ 광고 분석 ⭐
 예) 광고 부평맛집
 → 입찰가/전체/순위 선택
@@ -1656,9 +3679,15 @@ def get_help():
 ▶ 대표 키워드
 예) 대표 1234567890
 예) 대표 플레이스URL
+예) 대표 1234567890, 2345678901 (검색량 포함)
 
 ▶ 검색량 비교
 예) 비교 부평맛집
+
+▶ 입찰가 추이 (관심 키워드)
+예) 관심 부평맛집
+예) 추이 부평맛집
+예) 관심목록 / 관심해제 부평맛집
 ━━━━━━━━━━━━━━━
 🎲 재미 기능
 ━━━━━━━━━━━━━━━
@@ -1668,12 +3697,160 @@ def get_help():
 ━━━━━━━━━━━━━━━"""
 
 #############################################
-# 카카오 스킬 - 통합 엔드포인트
+# /skill 트래픽 캡처 (리플레이 부하 테스트용)
 #############################################
+SKILL_CAPTURE_PATH = os.environ.get('SKILL_CAPTURE_PATH', '')
+SKILL_CAPTURE_SALT = os.environ.get('SKILL_CAPTURE_SALT', '')
+capture_lock = threading.Lock()
+
+def sanitize_utterance(utterance):
+    """운세 생년월일은 같은 길이의 고정값으로 마스킹"""
+    if utterance.startswith("운세"):
+        birthdate = ''.join(filter(str.isdigit, utterance))
+        if len(birthdate) == 6:
+            return "운세 900101"
+        if len(birthdate) == 8:
+            return "운세 19900101"
+    return utterance
+
+def capture_skill_request(request_data, command, latency, status):
+    """사용자 ID 는 해시, 발화만 남겨 JSONL 로 추가"""
+    if not SKILL_CAPTURE_PATH or not isinstance(request_data, dict):
+        return
+    
+    user_request = request_data.get("userRequest", {})
+    user_id = str(user_request.get("user", {}).get("id", "unknown"))
+    record = {
+        "ts": round(time.time(), 3),
+        "user": hashlib.sha256((SKILL_CAPTURE_SALT + user_id).encode('utf-8')).hexdigest()[:16],
+        "utterance": sanitize_utterance(str(user_request.get("utterance", "")).strip()),
+        "command": command,
+        "latency": round(latency, 4),
+        "status": status
+    }
+    line = json.dumps(record, ensure_ascii=False)
+    
+    try:
+        with capture_lock:
+            with open(SKILL_CAPTURE_PATH, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except OSError as e:
+        logger.error("❌ 캡처 저장 실패: %s", e)
+
+HELP_COMMANDS = ["도움말", "도움", "사용법", "help", "?"]
+SKILL_COMMAND_PREFIXES = [
+    ("운세 ", "fortune"),
+    ("비교 ", "compare"),
+    ("유튜브 ", "youtube"),
+    ("자동 ", "autocomplete"),
+    ("통합 ", "combined"),
+    ("대표 ", "place"),
+    ("연관 ", "related"),
+    ("광고 ", "ad"),
+    ("관심 ", "watch"),
+    ("관심해제 ", "unwatch"),
+    ("추이 ", "trend"),
+]
+WATCHLIST_COMMANDS = ["관심목록", "관심"]
+
+def classify_skill_command(request_data):
+    """메트릭 라벨용 명령어 분류 (세션은 읽기만 함)"""
+    if not isinstance(request_data, dict):
+        return "invalid"
+    
+    user_request = request_data.get("userRequest", {})
+    user_id = user_request.get("user", {}).get("id", "unknown")
+    utterance = user_request.get("utterance", "").strip()
+    lower_input = utterance.lower()
+    
+    if not utterance:
+        return "empty"
+    if lower_input in HELP_COMMANDS:
+        return "help"
+    if lower_input in ["운세", "오늘운세"]:
+        return "fortune"
+    if lower_input in ["로또", "로또번호"]:
+        return "lotto"
+    if lower_input in WATCHLIST_COMMANDS:
+        return "watchlist"
+    for prefix, command in SKILL_COMMAND_PREFIXES:
+        if lower_input.startswith(prefix):
+            return command
+    
+    session = user_sessions.get(user_id)
+    if session and session.get("state") == "waiting_for_ad_choice":
+        if lower_input == "순위":
+            return "ad_rank"
+        if lower_input == "전체":
+            return "ad_full"
+        return "ad_custom"
+    
+    if lower_input == "순위" or utterance.isdigit():
+        return "usage"
+    
+    return "search"
+
+def skill_keywords(command, request_data):
+    """캐시 키에 쓰이는 형태의 요청 키워드 목록 (키워드 없는 명령은 빈 목록)"""
+    user_request = request_data.get("userRequest", {})
+    utterance = user_request.get("utterance", "").strip()
+    rest = utterance.split(" ", 1)[1].strip() if " " in utterance else ""
+    
+    if command == "search":
+        keywords = [k.strip().replace(" ", "") for k in utterance.split(",")]
+        return [k for k in keywords[:5] if k]
+    if command in ("ad", "related", "watch", "trend"):
+        keyword = clean_keyword(rest)
+        return [keyword] if keyword else []
+    if command == "compare":
+        return [rest] if rest else []
+    if command in ("ad_rank", "ad_full", "ad_custom"):
+        user_id = user_request.get("user", {}).get("id", "unknown")
+        keyword = user_sessions.get(user_id, {}).get("keyword")
+        return [keyword] if keyword else []
+    return []
+
 @app.route('/skill', methods=['POST'])
 def kakao_skill():
+    return handle_skill_request(request.get_json(silent=True))
+
+def note_skill_request(command, request_data):
+    """트래픽·인기 키워드 기록, 백그라운드 워커 시작 (요청당 한 번)"""
+    skill_request_times.append(time.time())
+    if command not in ("invalid", "empty"):
+        for keyword in skill_keywords(command, request_data):
+            keyword_popularity.record(keyword, command)
+    if CACHE_WARMER_ENABLED:
+        ensure_background_worker("cache-warmer", cache_warmer_loop)
+    if WATCHLIST_ENABLED:
+        ensure_background_worker("watchlist", watchlist_loop)
+    if FORTUNE_PREGEN_ENABLED and GEMINI_API_KEY:
+        ensure_background_worker("fortune-pregen", fortune_pregen_loop)
+
+def handle_skill_request(request_data, record=True):
+    """카카오 스킬 요청 처리 (동기/비동기 서빙 공용)
+    
+    record=False 면 요청 기록/지연 메트릭/캡처를 호출한 쪽(ASGI)에서 직접 한다.
+    """
+    command = classify_skill_command(request_data)
+    start = time.perf_counter()
+    response = None
+    
+    if record:
+        note_skill_request(command, request_data)
+    
+    try:
+        with start_trace("skill", command=command):
+            response = dispatch_skill_request(request_data)
+            return response
+    finally:
+        if record:
+            latency = time.perf_counter() - start
+            COMMAND_LATENCY.observe(latency, command)
+            capture_skill_request(request_data, command, latency, response.status_code if response is not None else 500)
+
+def dispatch_skill_request(request_data):
     try:
-        request_data = request.get_json()
         if request_data is None:
             logger.error("❌ 요청 데이터 None")
             return create_kakao_response("요청 데이터 오류")
@@ -1681,27 +3858,27 @@ def kakao_skill():
         user_id = request_data.get("userRequest", {}).get("user", {}).get("id", "unknown")
         user_utterance = request_data.get("userRequest", {}).get("utterance", "").strip()
         
-        logger.info(f"📥 요청 - 사용자: {user_id} / 입력: '{user_utterance}'")
+        logger.info("📥 요청 - 사용자: %s / 입력: '%s'", user_id, user_utterance)
         
         if not user_utterance:
             return create_kakao_response("명령어를 입력해주세요!\n\n'도움말' 입력")
         
         lower_input = user_utterance.lower()
         
-        if lower_input in ["도움말", "도움", "사용법", "help", "?"]:
+        if lower_input in HELP_COMMANDS:
             return create_kakao_response(get_help())
         
         if lower_input.startswith("운세 "):
             birthdate = ''.join(filter(str.isdigit, user_utterance))
             if birthdate and len(birthdate) in [6, 8]:
-                return create_kakao_response(get_fortune(birthdate))
+                return fortune_response(birthdate)
             return create_kakao_response("예) 운세 870114")
         
         if lower_input in ["운세", "오늘운세"]:
-            return create_kakao_response(get_fortune())
+            return fortune_response()
         
         if lower_input in ["로또", "로또번호"]:
-            return create_kakao_response(get_lotto())
+            return lotto_response()
         
         if lower_input.startswith("비교 "):
             keyword = user_utterance.split(" ", 1)[1].strip() if " " in user_utterance else ""
@@ -1713,18 +3890,29 @@ def kakao_skill():
         if lower_input.startswith("유튜브 "):
             keyword = user_utterance.split(" ", 1)[1].strip() if " " in user_utterance else ""
             if keyword:
-                return create_kakao_response(get_youtube_autocomplete(keyword))
+                return create_cached_kakao_response("yt", keyword)
             return create_kakao_response("예) 유튜브 부평맛집")
         
+        if lower_input.startswith("통합 "):
+            keyword = user_utterance.split(" ", 1)[1].strip() if " " in user_utterance else ""
+            if keyword:
+                return create_kakao_response(get_combined_autocomplete(keyword))
+        
         if lower_input.startswith("자동 "):
             keyword = user_utterance.split(" ", 1)[1].strip() if " " in user_utterance else ""
             if keyword:
-                return create_kakao_response(get_autocomplete(keyword))
+                return create_cached_kakao_response("ac", keyword)
             return create_kakao_response("예) 자동 부평맛집")
         
         if lower_input.startswith("대표 "):
             input_text = user_utterance.split(" ", 1)[1].strip() if " " in user_utterance else ""
             if input_text:
+                place_inputs = split_place_inputs(input_text)
+                if len(place_inputs) > 1:
+                    return create_kakao_response(format_place_keywords_bulk(place_inputs))
+                place_id = extract_place_id_from_url(input_text)
+                if place_id:
+                    return create_cached_kakao_response("place", place_id)
                 return create_kakao_response(format_place_keywords(input_text))
             return create_kakao_response("예) 대표 1234567890")
         
@@ -1732,9 +3920,29 @@ def kakao_skill():
             keyword = user_utterance.split(" ", 1)[1].strip() if " " in user_utterance else ""
             keyword = clean_keyword(keyword)
             if keyword:
-                return create_kakao_response(get_related_keywords(keyword))
+                return create_cached_kakao_response("related", keyword)
             return create_kakao_response("예) 연관 부평맛집")
         
+        if lower_input.startswith("관심 "):
+            keyword = clean_keyword(user_utterance.split(" ", 1)[1].strip())
+            if keyword:
+                return create_kakao_response(format_watch_add(user_id, keyword))
+        
+        if lower_input.startswith("관심해제 "):
+            keyword = clean_keyword(user_utterance.split(" ", 1)[1].strip())
+            if keyword:
+                if remove_watch_keyword(user_id, keyword):
+                    return create_kakao_response(f"[{keyword}] 관심 키워드에서 삭제했습니다.")
+                return create_kakao_response(f"[{keyword}] 등록된 관심 키워드가 아닙니다.\n\n'관심목록' 으로 확인하세요.")
+        
+        if lower_input in WATCHLIST_COMMANDS:
+            return create_kakao_response(format_watch_list(user_id))
+        
+        if lower_input.startswith("추이 "):
+            keyword = clean_keyword(user_utterance.split(" ", 1)[1].strip())
+            if keyword:
+                return create_kakao_response(format_bid_trend(keyword))
+        
         if lower_input.startswith("광고 "):
             keyword = user_utterance.split(" ", 1)[1].strip() if " " in user_utterance else ""
             keyword = clean_keyword(keyword)
@@ -1748,7 +3956,7 @@ def kakao_skill():
                 "timestamp": time.time()
             }
             
-            logger.info(f"🎯 광고 1단계: {keyword} (사용자: {user_id})")
+            logger.info("🎯 광고 1단계: %s (사용자: %s)", keyword, user_id)
             
             return create_kakao_response(
                 f"[{keyword}] 광고 분석\n\n"
@@ -1773,11 +3981,11 @@ def kakao_skill():
             del user_sessions[user_id]
             
             if lower_input == "순위":
-                logger.info(f"🎯 광고 2단계(순위): {keyword}")
-                return create_kakao_response(format_real_rank_bids(keyword))
+                logger.info("🎯 광고 2단계(순위): %s", keyword)
+                return create_cached_kakao_response("rank", keyword)
             
             elif lower_input == "전체":
-                logger.info(f"🎯 광고 2단계(전체): {keyword}")
+                logger.info("🎯 광고 2단계(전체): %s", keyword)
                 return create_kakao_response(get_ad_cost_full(keyword))
             
             else:
@@ -1786,7 +3994,7 @@ def kakao_skill():
                 if bid_input:
                     user_bid = int(bid_input)
                     
-                    logger.info(f"🎯 광고 2단계(맞춤): {keyword} / {user_bid}원")
+                    logger.info("🎯 광고 2단계(맞춤): %s / %s원", keyword, user_bid)
                     
                     if user_bid < 70:
                         user_sessions[user_id] = session
@@ -1821,26 +4029,741 @@ def kakao_skill():
                 "→ 입찰가 입력"
             )
         
-        keyword = user_utterance.strip()
-        if "," in keyword:
-            return create_kakao_response(get_search_volume(keyword))
-        else:
-            return create_kakao_response(get_search_volume(clean_keyword(keyword)))
+        keyword = clean_keyword(user_utterance.strip())
+        return create_cached_kakao_response("search", keyword)
         
     except Exception as e:
-        logger.error(f"❌ 스킬 최상위 오류: {str(e)}", exc_info=True)
+        logger.error("❌ 스킬 최상위 오류: %s", e, exc_info=True)
         return create_kakao_response("오류 발생\n\n잠시 후 다시 시도해주세요.")
 
-def create_kakao_response(text):
-    """카카오 스킬 기본 응답 생성"""
+def kakao_payload(text):
     if len(text) > 1000:
         text = text[:997] + "..."
-    return jsonify({
+    return {
         "version": "2.0",
         "template": {
             "outputs": [{"simpleText": {"text": text}}]
         }
-    })
+    }
+
+def create_kakao_response(text):
+    """카카오 스킬 기본 응답 생성"""
+    with span("serialize"):
+        return jsonify(kakao_payload(text))
+
+def serialize_kakao_response(text):
+    """create_kakao_response 와 같은 JSON 바이트 (앱 컨텍스트 불필요)"""
+    return app.json.response(kakao_payload(text)).get_data()
+
+def kakao_bytes_response(body):
+    return app.response_class(body, mimetype=app.json.mimetype)
+
+#############################################
+# 미리 만든 응답 풀 (로또, 운세)
+#############################################
+response_pools = []
+# 풀 보충은 upstream_executor 작업을 기다리므로 별도 스레드에서
+pool_refill_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pool-refill")
+
+class ResponsePool:
+    """직렬화된 카카오 응답 링 버퍼
+    
+    pop 은 O(1) 이고, 남은 수가 low_water 아래로 내려가면 refill(개수) 이 만든
+    텍스트 목록으로 백그라운드에서 한 번에 채운다.
+    """
+    
+    def __init__(self, name, refill, capacity, low_water):
+        self.name = name
+        self.refill = refill
+        self.capacity = capacity
+        self.low_water = low_water
+        self.items = deque(maxlen=capacity)
+        self.refilling = False
+        self.lock = threading.Lock()
+        response_pools.append(self)
+    
+    def pop(self):
+        """응답 바이트, 비었으면 None"""
+        try:
+            body = self.items.popleft()
+        except IndexError:
+            body = None
+        CACHE_REQUESTS.inc(f"{self.name}_pool", "miss" if body is None else "hit")
+        if len(self.items) < self.low_water:
+            self.schedule_refill()
+        return body
+    
+    def push(self, texts):
+        self.items.extend(serialize_kakao_response(text) for text in texts)
+    
+    def schedule_refill(self):
+        if self.capacity <= 0:
+            return
+        with self.lock:
+            if self.refilling:
+                return
+            self.refilling = True
+        submit_with_context(self._refill, executor=pool_refill_executor)
+    
+    def _refill(self):
+        try:
+            with start_trace("pool_refill", pool=self.name):
+                self.push(self.refill(self.capacity - len(self.items)))
+            logger.info("🎱 %s 풀 보충: %d개", self.name, len(self.items), extra=SAMPLED)
+        except Exception as e:
+            logger.error("❌ %s 풀 보충 실패: %s", self.name, e)
+        finally:
+            self.refilling = False
+
+MetricGauge("response_pool_size", "Prebuilt responses left in each pool",
+            lambda: {(pool.name,): len(pool.items) for pool in response_pools}, ("pool",))
+
+lotto_pool = ResponsePool("lotto", generate_lotto_batch, LOTTO_POOL_SIZE, LOTTO_POOL_LOW_WATER)
+
+def lotto_response():
+    body = lotto_pool.pop()
+    if body is not None:
+        return kakao_bytes_response(body)
+    return create_kakao_response(get_lotto())
+
+# (날짜, 대상) → 직렬화된 운세 응답 (캐시/Gemini 결과만)
+# 키에 날짜가 있어 지난 항목은 다시 조회되지 않고, 한도에 차면 통째로 비움
+FORTUNE_RESPONSES_MAX = int(os.environ.get('FORTUNE_RESPONSES_MAX', 5000))
+fortune_responses = {}
+fortune_responses_lock = threading.Lock()
+
+def fortune_response_body(day, subject, text):
+    body = serialize_kakao_response(text)
+    with fortune_responses_lock:
+        if len(fortune_responses) >= FORTUNE_RESPONSES_MAX:
+            fortune_responses.clear()
+        fortune_responses[(day, subject)] = body
+    return body
+
+def fortune_response(birthdate=None):
+    day, subject = fortune_key(birthdate)
+    body = fortune_responses.get((day, subject))
+    if body is not None:
+        CACHE_REQUESTS.inc("fortune_rendered", "hit")
+        return kakao_bytes_response(body)
+    
+    CACHE_REQUESTS.inc("fortune_rendered", "miss")
+    text = cached_fortune(day, subject)
+    if text is None:
+        return create_kakao_response(race_fortune(birthdate, day, subject))
+    return kakao_bytes_response(fortune_response_body(day, subject, text))
+
+#############################################
+# 렌더링 응답 캐시 함수
+#############################################
+def search_volume_cache_keys(keyword):
+    keywords = [k.strip().replace(" ", "") for k in keyword.split(",")]
+    return [f"kw_{k}" for k in keywords[:5]] if len(keywords) <= 5 else []
+
+RENDERED_COMMANDS = {
+    "search": (get_search_volume, search_volume_cache_keys),
+    "rank": (format_real_rank_bids, lambda kw: [f"bid_{kw}", f"kw_{kw}"]),
+    "related": (get_related_keywords, lambda kw: [f"rel_{kw}", f"kw_{kw}"]),
+    "ac": (get_autocomplete, lambda kw: [f"ac_{kw}"]),
+    "yt": (get_youtube_autocomplete, lambda kw: [f"yt_{kw}"]),
+    "place": (format_place_keywords, lambda place_id: [f"place_{place_id}"]),
+}
+
+def snapshot_cache_versions(keys):
+    """의존 캐시 키별 저장 시각 (없으면 None); 실패 결과가 캐시돼 있으면 None 반환"""
+    versions = []
+    with cache_lock:
+        for key in keys:
+            entry = api_cache.get(key)
+            if entry is not None and isinstance(entry[0], dict) and not entry[0].get("success", True):
+                return None
+            versions.append((key, entry[1] if entry else None))
+    return tuple(versions)
+
+def is_rendered_entry_valid(versions):
+    """의존 데이터 캐시가 그대로이고 만료 전이면 유효"""
+    now = time.time()
+    with cache_lock:
+        for key, ts in versions:
+            entry = api_cache.get(key)
+            current_ts = entry[1] if entry else None
+            if current_ts != ts:
+                return False
+            if ts is not None and now - ts >= RENDERED_CACHE_TTL:
+                return False
+    return True
+
+def evict_rendered_entries_locked():
+    """rendered_cache_lock 보유 상태에서 호출; api_cache 와 같이 인기도 낮고 오래된 항목부터 90% 까지 줄임"""
+    excess = len(rendered_cache) - int(RENDERED_CACHE_MAX_ENTRIES * 0.9)
+    if excess <= 0:
+        return 0
+    victims = heapq.nsmallest(
+        excess,
+        rendered_cache.items(),
+        key=lambda kv: (keyword_popularity.estimate(kv[0][1]), kv[1][2])
+    )
+    for key, _ in victims:
+        del rendered_cache[key]
+    logger.info("🧹 렌더링 캐시 제거: %d건", len(victims))
+    return len(victims)
+
+def create_cached_kakao_response(command, keyword):
+    """명령어 결과를 직렬화된 JSON 바이트로 캐시
+    
+    데이터 캐시(kw_, bid_ 등) 항목이 갱신/만료되면 렌더링 결과도 무효화되고,
+    의존 데이터가 실패 결과이면 캐시하지 않는다.
+    """
+    render_func, deps_func = RENDERED_COMMANDS[command]
+    cache_key = (command, keyword)
+    
+    with rendered_cache_lock:
+        entry = rendered_cache.get(cache_key)
+    
+    if entry and is_rendered_entry_valid(entry[1]):
+        CACHE_REQUESTS.inc("rendered", "hit")
+        logger.info("✅ 렌더링 캐시 히트: %s/%s", command, keyword, extra=SAMPLED)
+        return kakao_bytes_response(entry[0])
+    
+    CACHE_REQUESTS.inc("rendered", "miss")
+    with span("format", command=command):
+        text = render_func(keyword)
+    response = create_kakao_response(text)
+    versions = snapshot_cache_versions(deps_func(keyword))
+    
+    if versions and any(ts is not None for _, ts in versions):
+        with rendered_cache_lock:
+            rendered_cache[cache_key] = (response.get_data(), versions, time.time())
+            if len(rendered_cache) > RENDERED_CACHE_MAX_ENTRIES:
+                evict_rendered_entries_locked()
+    
+    return response
+
+#############################################
+# 백그라운드 작업 스레드 (워커 프로세스별)
+#############################################
+background_workers = {}
+background_workers_lock = threading.Lock()
+
+def ensure_background_worker(name, target):
+    """첫 요청 시 워커 프로세스마다 한 번 데몬 스레드 시작"""
+    if name in background_workers:
+        return
+    with background_workers_lock:
+        if name in background_workers:
+            return
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        background_workers[name] = thread
+
+# fork 된 자식에는 스레드가 따라오지 않으므로 다시 시작하도록 비움
+os.register_at_fork(after_in_child=background_workers.clear)
+
+#############################################
+# 인기 키워드 캐시 예열 (한가할 때, 속도 제한 하에)
+#############################################
+CACHE_WARMER_ENABLED = os.environ.get('CACHE_WARMER_ENABLED', '1') == '1'
+CACHE_WARMER_INTERVAL = int(os.environ.get('CACHE_WARMER_INTERVAL', 240))
+CACHE_WARMER_TOP_N = int(os.environ.get('CACHE_WARMER_TOP_N', 30))
+CACHE_WARMER_RATE = float(os.environ.get('CACHE_WARMER_RATE', 2))
+CACHE_WARMER_BUSY_RPM = int(os.environ.get('CACHE_WARMER_BUSY_RPM', 60))
+CACHE_TTL = 300
+
+warmer_rate_limiter = TokenBucket(CACHE_WARMER_RATE, burst=max(1, int(CACHE_WARMER_RATE)))
+skill_request_times = deque(maxlen=max(1, CACHE_WARMER_BUSY_RPM))
+cache_warm_lock = threading.Lock()
+cache_warmer_state = {"last_run": None, "last_result": None}
+
+def is_peak_traffic():
+    """최근 1분 요청이 CACHE_WARMER_BUSY_RPM 이상이면 피크로 간주"""
+    if len(skill_request_times) < skill_request_times.maxlen:
+        return False
+    try:
+        return time.time() - skill_request_times[0] < 60
+    except IndexError:
+        return False
+
+def cache_entry_age(key):
+    with cache_lock:
+        entry = api_cache.get(key)
+    return None if entry is None else time.time() - entry[1]
+
+def refresh_cache_entry(key, fetch_func, *args):
+    """캐시를 거치지 않고 새로 받아 저장 (실패 응답으로 기존 값을 덮지 않음)"""
+    data = fetch_func(*args)
+    if isinstance(data, dict) and data.get("success") is False:
+        return False
+    store_cache_entry(key, data)
+    return True
+
+def plan_cache_warm(keywords):
+    """만료가 다음 주기 전에 오는 (key, fetch_func, args) 목록
+
+    kw_ 는 인기 키워드면 항상, bid_/dl_ 는 한 번이라도 조회된 키워드만 갱신한다.
+    """
+    (this_year_start, this_year_end), (last_year_start, last_year_end) = datalab_periods()
+    with cache_lock:
+        cached_keys = list(api_cache.keys())
+    
+    def stale(key):
+        age = cache_entry_age(key)
+        return age is None or age + CACHE_WARMER_INTERVAL >= CACHE_TTL
+    
+    plan = []
+    for keyword in keywords:
+        if stale(f"kw_{keyword}"):
+            plan.append((f"kw_{keyword}", get_keyword_data, (keyword,)))
+        
+        if f"bid_{keyword}" in cached_keys and stale(f"bid_{keyword}"):
+            plan.append((f"bid_{keyword}", get_real_rank_bids, (keyword,)))
+        
+        if any(k.startswith(f"dl_{keyword}_") for k in cached_keys):
+            for start_date, end_date in ((this_year_start, this_year_end), (last_year_start, last_year_end)):
+                key = f"dl_{keyword}_{start_date}_{end_date}"
+                if stale(key):
+                    plan.append((key, get_datalab_trend, (keyword, start_date, end_date)))
+    return plan
+
+def run_cache_warm_cycle(top_n=None):
+    """인기 키워드 상위 N개의 곧 만료될 캐시 갱신 (동시에 한 번만 실행)"""
+    if not cache_warm_lock.acquire(blocking=False):
+        return {"skipped": "running"}
+    try:
+        if is_peak_traffic():
+            logger.info("⏸️ 캐시 예열 건너뜀 (피크 트래픽)")
+            result = {"skipped": "peak"}
+        else:
+            keywords = [keyword for keyword, _ in keyword_popularity.top(top_n or CACHE_WARMER_TOP_N)]
+            plan = plan_cache_warm(keywords)
+            refreshed = 0
+            
+            with start_trace("cache_warm", keywords=len(keywords)), rate_limited(warmer_rate_limiter):
+                for key, fetch_func, args in plan:
+                    if is_peak_traffic():
+                        break
+                    try:
+                        refreshed += refresh_cache_entry(key, fetch_func, *args)
+                    except Exception as e:
+                        logger.error("❌ 캐시 예열 실패: %s (%s)", key, e)
+            
+            logger.info("🔥 캐시 예열: 키워드 %d개, 갱신 %d/%d", len(keywords), refreshed, len(plan))
+            result = {"keywords": len(keywords), "planned": len(plan), "refreshed": refreshed}
+        
+        cache_warmer_state["last_run"] = time.time()
+        cache_warmer_state["last_result"] = result
+        return result
+    finally:
+        cache_warm_lock.release()
+
+def cache_warmer_loop():
+    while True:
+        time.sleep(CACHE_WARMER_INTERVAL)
+        try:
+            run_cache_warm_cycle()
+        except Exception as e:
+            logger.error("❌ 캐시 예열 루프 오류: %s", e, exc_info=True)
+
+#############################################
+# 관심 키워드 입찰가 추적 (워커 간 공유 sqlite)
+#############################################
+WATCHLIST_ENABLED = os.environ.get('WATCHLIST_ENABLED', '1') == '1'
+WATCHLIST_DB_PATH = os.environ.get('WATCHLIST_DB_PATH', 'watchlist.db')
+WATCH_REFRESH_INTERVAL = int(os.environ.get('WATCH_REFRESH_INTERVAL', 3600))
+WATCH_MAX_KEYWORDS = int(os.environ.get('WATCH_MAX_KEYWORDS', 20))
+WATCH_HISTORY_POINTS = int(os.environ.get('WATCH_HISTORY_POINTS', 24 * 14))
+
+watch_rate_limiter = TokenBucket(float(os.environ.get('WATCH_RATE', 1)), burst=2)
+_watch_db_local = threading.local()
+
+WATCH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watchlist (
+    user TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (user, keyword)
+);
+CREATE INDEX IF NOT EXISTS watchlist_keyword ON watchlist (keyword);
+CREATE TABLE IF NOT EXISTS bid_history (
+    keyword TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    bids BLOB NOT NULL,
+    PRIMARY KEY (keyword, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS watch_meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+def watch_db():
+    return local_sqlite(WATCHLIST_DB_PATH, WATCH_SCHEMA, _watch_db_local)
+
+def pack_bids(mobile_bids, pc_bids):
+    """순위 1~5 모바일/PC 입찰가 → 40바이트"""
+    return array('i', list(mobile_bids) + list(pc_bids)).tobytes()
+
+def unpack_bids(blob):
+    values = array('i')
+    values.frombytes(blob)
+    return list(values[:RANK_BID_POSITIONS]), list(values[RANK_BID_POSITIONS:])
+
+def add_watch_keyword(user_id, keyword):
+    """True=등록, False=이미 등록, None=한도 초과"""
+    conn = watch_db()
+    # 한도 확인과 삽입을 한 문장으로 해 동시에 등록해도 한도를 넘지 않음
+    cursor = conn.execute(
+        "INSERT OR IGNORE INTO watchlist (user, keyword, created) "
+        "SELECT ?, ?, ? WHERE (SELECT COUNT(*) FROM watchlist WHERE user = ?) < ?",
+        (user_id, keyword, time.time(), user_id, WATCH_MAX_KEYWORDS)
+    )
+    if cursor.rowcount == 1:
+        return True
+    exists = conn.execute("SELECT 1 FROM watchlist WHERE user = ? AND keyword = ?", (user_id, keyword)).fetchone()
+    return False if exists else None
+
+def remove_watch_keyword(user_id, keyword):
+    cursor = watch_db().execute("DELETE FROM watchlist WHERE user = ? AND keyword = ?", (user_id, keyword))
+    return cursor.rowcount == 1
+
+def list_watch_keywords(user_id):
+    rows = watch_db().execute("SELECT keyword FROM watchlist WHERE user = ? ORDER BY created", (user_id,))
+    return [row[0] for row in rows]
+
+def watched_keywords():
+    return [row[0] for row in watch_db().execute("SELECT DISTINCT keyword FROM watchlist")]
+
+def record_bid_point(keyword, ts, mobile_bids, pc_bids):
+    """시계열에 한 점 추가 후 WATCH_HISTORY_POINTS 개만 유지"""
+    conn = watch_db()
+    conn.execute(
+        "INSERT OR REPLACE INTO bid_history (keyword, ts, bids) VALUES (?, ?, ?)",
+        (keyword, ts, pack_bids(mobile_bids, pc_bids))
+    )
+    conn.execute(
+        "DELETE FROM bid_history WHERE keyword = ? AND ts < ("
+        "SELECT ts FROM bid_history WHERE keyword = ? ORDER BY ts DESC LIMIT 1 OFFSET ?)",
+        (keyword, keyword, WATCH_HISTORY_POINTS - 1)
+    )
+
+def get_bid_history(keyword, limit=None):
+    """[(ts, 모바일 입찰가 목록, PC 입찰가 목록)] 오래된 순"""
+    rows = watch_db().execute(
+        "SELECT ts, bids FROM bid_history WHERE keyword = ? ORDER BY ts DESC LIMIT ?",
+        (keyword, limit or WATCH_HISTORY_POINTS)
+    ).fetchall()
+    return [(ts, *unpack_bids(blob)) for ts, blob in reversed(rows)]
+
+def refresh_watched_bids(keywords=None):
+    """관심 키워드 입찰가를 묶음 단위로 조회해 시계열과 bid_ 캐시에 기록"""
+    if not validate_required_keys():
+        return 0
+    keywords = keywords if keywords is not None else watched_keywords()
+    ts = int(time.time())
+    recorded = 0
+    
+    with start_trace("watch_refresh", keywords=len(keywords)), rate_limited(watch_rate_limiter):
+        fetched = fetch_rank_bids_batch(keywords)
+    
+    for keyword, bids_by_device in fetched.items():
+        mobile_bids, pc_bids = bids_by_device['MOBILE'], bids_by_device['PC']
+        if not any(mobile_bids) and not any(pc_bids):
+            continue
+        record_bid_point(keyword, ts, mobile_bids, pc_bids)
+        store_cache_entry(f"bid_{keyword}", rank_bids_result(bids_by_device))
+        recorded += 1
+    
+    logger.info("📈 관심 키워드 입찰가 기록: %d/%d", recorded, len(keywords))
+    return recorded
+
+def claim_watch_refresh(now=None):
+    """여러 워커 중 한 곳만 이번 주기 갱신을 맡도록 sqlite 에서 선점"""
+    now = now or time.time()
+    conn = watch_db()
+    conn.execute("INSERT OR IGNORE INTO watch_meta (key, value) VALUES ('last_refresh', 0)")
+    cursor = conn.execute(
+        "UPDATE watch_meta SET value = ? WHERE key = 'last_refresh' AND value <= ?",
+        (now, now - WATCH_REFRESH_INTERVAL)
+    )
+    return cursor.rowcount == 1
+
+def watchlist_loop():
+    while True:
+        time.sleep(60)
+        try:
+            if claim_watch_refresh():
+                refresh_watched_bids()
+        except Exception as e:
+            logger.error("❌ 관심 키워드 루프 오류: %s", e, exc_info=True)
+
+def format_watch_add(user_id, keyword):
+    added = add_watch_keyword(user_id, keyword)
+    if added is None:
+        return f"⚠️ 관심 키워드는 최대 {WATCH_MAX_KEYWORDS}개까지 등록할 수 있습니다.\n\n'관심해제 키워드' 로 정리해주세요."
+    if not added:
+        return f"[{keyword}] 이미 관심 키워드입니다.\n\n'추이 {keyword}' 로 변화를 확인하세요."
+    
+    if not get_bid_history(keyword, limit=1):
+        submit_with_context(refresh_watched_bids, [keyword])
+    
+    hours = WATCH_REFRESH_INTERVAL // 3600
+    period = f"{hours}시간" if hours else f"{WATCH_REFRESH_INTERVAL // 60}분"
+    return (
+        f"✅ [{keyword}] 관심 키워드 등록\n\n"
+        f"{period}마다 순위별 입찰가를 기록합니다.\n"
+        f"'추이 {keyword}' 입력 시 변화를 볼 수 있습니다."
+    )
+
+def format_watch_list(user_id):
+    keywords = list_watch_keywords(user_id)
+    if not keywords:
+        return "등록된 관심 키워드가 없습니다.\n\n예) 관심 부평맛집"
+    lines = [f"[관심 키워드] {len(keywords)}/{WATCH_MAX_KEYWORDS}", ""]
+    lines.extend(f"{i}. {keyword}" for i, keyword in enumerate(keywords, 1))
+    lines.append("")
+    lines.append("'추이 키워드' / '관심해제 키워드'")
+    return "\n".join(lines)
+
+def format_bid_change(current, previous):
+    diff = current - previous
+    if previous <= 0 or diff == 0:
+        return "-"
+    return f"{'▲' if diff > 0 else '▼'}{abs(diff):,}원"
+
+def format_bid_trend(keyword):
+    """저장된 시계열만으로 순위별 입찰가 변화 표시 (API 호출 없음)"""
+    history = get_bid_history(keyword)
+    if not history:
+        return (
+            f"[{keyword}] 기록된 입찰가가 없습니다.\n\n"
+            f"'관심 {keyword}' 로 등록하면 주기적으로 기록합니다."
+        )
+    
+    last_ts, mobile_now, pc_now = history[-1]
+    lines = [f"[입찰가 추이] {keyword}", f"기록 {len(history)}회 · 최근 {datetime.fromtimestamp(last_ts, KST).strftime('%m/%d %H:%M')}", ""]
+    
+    if len(history) == 1:
+        lines.append("📱 모바일")
+        lines.extend(f"{rank}위: {bid:,}원" for rank, bid in enumerate(mobile_now, 1) if bid)
+        lines.append("")
+        lines.append("💡 다음 기록부터 변화가 표시됩니다.")
+        return "\n".join(lines)
+    
+    _, mobile_prev, pc_prev = history[-2]
+    first_ts, mobile_first, pc_first = history[0]
+    since = datetime.fromtimestamp(first_ts, KST).strftime('%m/%d')
+    
+    for label, now_bids, prev_bids, first_bids in (
+        ("📱 모바일", mobile_now, mobile_prev, mobile_first),
+        ("💻 PC", pc_now, pc_prev, pc_first)
+    ):
+        if not any(now_bids):
+            continue
+        lines.append(f"{label} (직전 / {since} 대비)")
+        for rank, bid in enumerate(now_bids, 1):
+            if bid:
+                lines.append(
+                    f"{rank}위: {bid:,}원 ({format_bid_change(bid, prev_bids[rank - 1])} / "
+                    f"{format_bid_change(bid, first_bids[rank - 1])})"
+                )
+        lines.append("")
+    
+    mobile_series = [mobile[0] for _, mobile, _ in history if mobile[0]]
+    if mobile_series:
+        lines.append(f"모바일 1위 범위: {min(mobile_series):,}~{max(mobile_series):,}원")
+    return "\n".join(lines).rstrip()
+
+#############################################
+# 일괄 입찰 시뮬레이션 (키워드 × 입찰가 → 열 단위 결과)
+#############################################
+SIMULATE_MAX_KEYWORDS = int(os.environ.get('SIMULATE_MAX_KEYWORDS', 500))
+SIMULATE_MAX_BIDS = int(os.environ.get('SIMULATE_MAX_BIDS', 50))
+SIMULATE_COLUMNS = ["keyword", "device", "bid", "rank", "share", "clicks", "impressions", "cost"]
+SIMULATE_WORKERS = int(os.environ.get('SIMULATE_WORKERS', 4))
+SIMULATE_RATE = float(os.environ.get('SIMULATE_RATE', 10))
+
+# 키워드 500 × 디바이스 2 = 성과 곡선 1000건이 공용 upstream_executor 를 채우면
+# 실시간 순위/전체 요청이 줄을 서서 시간 초과되므로 작은 전용 풀 + 속도 제한으로 처리
+simulate_executor = ThreadPoolExecutor(max_workers=SIMULATE_WORKERS, thread_name_prefix="simulate")
+simulate_rate_limiter = TokenBucket(SIMULATE_RATE, burst=max(1, int(SIMULATE_RATE)))
+
+def simulate_bids(keywords, bids, devices=('MOBILE',)):
+    """캐시된 입찰가 색인/성과 곡선으로 모든 (키워드, 디바이스, 입찰가) 조합 계산
+    
+    없는 입찰가 색인은 일괄 조회 한 번으로, 성과 곡선은 키워드·디바이스당 빠진 입찰가만
+    simulate_executor 에서 SIMULATE_RATE 한도로 채운다. 결과는 열 이름 → 값 목록
+    (행 순서: 키워드 → 디바이스 → 입찰가).
+    """
+    with rate_limited(simulate_rate_limiter):
+        landscapes = get_rank_bids_bulk(keywords)
+        curve_futures = {
+            (keyword, device): submit_with_context(get_performance_curve, keyword, bids, device, executor=simulate_executor)
+            for keyword in keywords
+            if landscapes[keyword].get("success")
+            for device in devices
+        }
+    
+    columns = {name: [] for name in SIMULATE_COLUMNS}
+    errors = {}
+    for keyword in keywords:
+        landscape = landscapes[keyword]
+        if not landscape.get("success"):
+            errors[keyword] = landscape.get("error", "입찰가 조회 실패")
+            continue
+        index = rank_index_of(landscape["data"])
+        
+        for device in devices:
+            curve = curve_futures[(keyword, device)].result()
+            if not curve.get("success"):
+                errors[keyword] = curve.get("error", "성과 예측 실패")
+                continue
+            estimates = {e.get("bid"): e for e in curve["data"].get("estimate", [])}
+            ranks, shares = index.lookup_many(bids, device)
+            
+            for bid, rank, share in zip(bids, ranks, shares):
+                estimate = estimates.get(bid, {})
+                clicks = estimate.get("clicks", 0)
+                cost = estimate.get("cost", 0) or int(clicks * bid * 0.8)
+                columns["keyword"].append(keyword)
+                columns["device"].append(device)
+                columns["bid"].append(bid)
+                columns["rank"].append(rank)
+                columns["share"].append(share)
+                columns["clicks"].append(clicks)
+                columns["impressions"].append(estimate.get("impressions", 0))
+                columns["cost"].append(cost)
+    
+    return columns, errors
+
+def simulation_csv(columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(SIMULATE_COLUMNS)
+    writer.writerows(zip(*(columns[name] for name in SIMULATE_COLUMNS)))
+    return buffer.getvalue()
+
+#############################################
+# 경쟁 플레이스 대표키워드 분석 (백그라운드 작업)
+#############################################
+COMPETITOR_MAX_PLACES = int(os.environ.get('COMPETITOR_MAX_PLACES', 30))
+COMPETITOR_RATE = float(os.environ.get('COMPETITOR_RATE', 10))
+COMPETITOR_MAX_JOBS = int(os.environ.get('COMPETITOR_MAX_JOBS', 4))
+COMPETITOR_JOB_TTL = int(os.environ.get('COMPETITOR_JOB_TTL', 3600))
+COMPETITOR_COLUMNS = ["rank", "keyword", "places", "share", "volume", "mine"]
+
+COMPETITOR_FETCH_WORKERS = int(os.environ.get('COMPETITOR_FETCH_WORKERS', 4))
+
+# 작업 본체 (조회 결과를 기다리기만 함)
+competitor_executor = ThreadPoolExecutor(max_workers=COMPETITOR_MAX_JOBS, thread_name_prefix="competitor")
+# 작업의 플레이스·검색량 조회 전용 풀: 실시간 요청(upstream_executor, place_probe_executor)과
+# 다른 여러 곳 조회(place_bulk_*)에는 스레드를 빌리지 않는다
+competitor_fetch_executor = ThreadPoolExecutor(max_workers=COMPETITOR_FETCH_WORKERS, thread_name_prefix="competitor-fetch")
+competitor_probe_executor = ThreadPoolExecutor(
+    max_workers=COMPETITOR_FETCH_WORKERS * len(PLACE_CATEGORIES),
+    thread_name_prefix="competitor-probe"
+)
+# 모든 작업이 나눠 쓰는 업스트림 호출 한도
+competitor_rate_limiter = TokenBucket(COMPETITOR_RATE, burst=max(1, int(COMPETITOR_RATE)))
+competitor_jobs = {}
+competitor_jobs_lock = threading.Lock()
+
+def analyze_competitor_places(own, competitors, on_progress=None):
+    """내 플레이스 + 경쟁 플레이스 대표키워드를 모아 키워드별 겹침 수·검색량으로 순위화
+    
+    키워드 정렬: 사용하는 경쟁 플레이스 수 → 월간 검색량 순.
+    """
+    inputs = list(dict.fromkeys(([own] if own else []) + list(competitors)))
+    with rate_limited(competitor_rate_limiter):
+        items = get_place_keywords_bulk(
+            inputs, on_progress, executor=competitor_fetch_executor, probe_executor=competitor_probe_executor
+        )
+    
+    own_id = extract_place_id_from_url(own) if own else None
+    own_keywords = set()
+    usage = {}
+    volumes = {}
+    competitor_count = 0
+    for item in items:
+        if not item["success"]:
+            continue
+        is_own = item["place_id"] == own_id
+        competitor_count += not is_own
+        for keyword, volume in item["keywords"]:
+            place_ids = usage.setdefault(keyword, [])
+            volumes[keyword] = volume
+            if is_own:
+                own_keywords.add(keyword)
+            else:
+                place_ids.append(item["place_id"])
+    
+    ranked = sorted(usage, key=lambda keyword: (-len(usage[keyword]), -(volumes[keyword] or 0)))
+    keywords = [{
+        "rank": rank,
+        "keyword": keyword,
+        "places": len(usage[keyword]),
+        "share": round(len(usage[keyword]) / competitor_count, 3) if competitor_count else 0.0,
+        "volume": volumes[keyword],
+        "mine": keyword in own_keywords,
+        "place_ids": usage[keyword]
+    } for rank, keyword in enumerate(ranked, 1)]
+    
+    places = [{
+        "input": item["input"],
+        "place_id": item["place_id"],
+        "own": item["place_id"] is not None and item["place_id"] == own_id,
+        "success": item["success"],
+        "category": item.get("category"),
+        "keywords": [keyword for keyword, _ in item.get("keywords", [])],
+        "error": item.get("error")
+    } for item in items]
+    
+    return {"competitors": competitor_count, "places": places, "keywords": keywords}
+
+def competitor_csv(result):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COMPETITOR_COLUMNS)
+    writer.writerows([row[name] for name in COMPETITOR_COLUMNS] for row in result["keywords"])
+    return buffer.getvalue()
+
+def run_competitor_job(job):
+    def on_progress(done, total):
+        job["progress"] = {"done": done, "total": total}
+    
+    try:
+        with start_trace("competitor_analysis", places=len(job["competitors"])):
+            job["result"] = analyze_competitor_places(job["own"], job["competitors"], on_progress)
+        job["status"] = "done"
+    except Exception as e:
+        logger.error("❌ 경쟁 분석 실패 (%s): %s", job["id"], e)
+        job["error"] = str(e)
+        job["status"] = "error"
+    job["finished_at"] = time.time()
+
+def start_competitor_job(own, competitors):
+    """작업 등록 후 id 반환, 진행 중 작업이 한도면 None"""
+    now = time.time()
+    with competitor_jobs_lock:
+        for job_id in [j for j, job in competitor_jobs.items() if job["finished_at"] and now - job["finished_at"] > COMPETITOR_JOB_TTL]:
+            del competitor_jobs[job_id]
+        if sum(1 for job in competitor_jobs.values() if job["status"] == "running") >= COMPETITOR_MAX_JOBS:
+            return None
+        
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "status": "running",
+            "own": own,
+            "competitors": competitors,
+            "progress": {"done": 0, "total": len(competitors) + (1 if own else 0)},
+            "created_at": now,
+            "finished_at": None,
+            "result": None,
+            "error": None
+        }
+        competitor_jobs[job["id"]] = job
+    
+    submit_with_context(run_competitor_job, job, executor=competitor_executor)
+    logger.info("🏁 경쟁 분석 시작: %s (%d곳)", job["id"], len(competitors))
+    return job["id"]
 
 #############################################
 # 헬스체크 엔드포인트 (슬립 방지)
@@ -1850,6 +4773,148 @@ def health():
     """UptimeRobot용"""
     return "OK", 200
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus 스크레이프용"""
+    return render_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@app.route('/warm')
+def warm():
+    """keep-alive 핑 겸 캐시 예열 트리거 (백그라운드 실행, 즉시 응답)"""
+    if CACHE_WARMER_ENABLED and not cache_warm_lock.locked():
+        threading.Thread(target=run_cache_warm_cycle, name="cache-warm", daemon=True).start()
+    return jsonify({
+        "status": "ok",
+        "last_run": cache_warmer_state["last_run"],
+        "last_result": cache_warmer_state["last_result"]
+    })
+
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+def admin_authorized():
+    """?token= 또는 X-Admin-Token 헤더가 ADMIN_TOKEN 과 같을 때만 허용 (미설정이면 항상 거부)"""
+    if not ADMIN_TOKEN:
+        return False
+    token = request.args.get("token") or request.headers.get("X-Admin-Token", "")
+    return hmac.compare_digest(token, ADMIN_TOKEN)
+
+@app.route('/admin/popular')
+def admin_popular():
+    """인기 키워드 (전체 + 명령어별). ?n=20&command=search
+    
+    사용자 검색어 목록이므로 ADMIN_TOKEN 이 없으면 열지 않는다.
+    """
+    if not admin_authorized():
+        return jsonify({"error": "forbidden"}), 403
+    
+    n = request.args.get("n", 20, type=int)
+    command = request.args.get("command")
+    if command:
+        return jsonify({"command": command, "top": keyword_popularity.top(n, command)})
+    return jsonify(keyword_popularity.snapshot(n))
+
+@app.route('/api/simulate', methods=['POST'])
+def api_simulate():
+    """키워드 × 입찰가 일괄 시뮬레이션
+    
+    {"keywords": [...], "bids": [...], "devices": ["MOBILE", "PC"], "format": "json" | "csv"}
+    """
+    if not admin_authorized():
+        return jsonify({"error": "forbidden"}), 403
+    
+    body = request.get_json(silent=True) or {}
+    keywords = list(dict.fromkeys(clean_keyword(str(k)) for k in body.get("keywords", []) if str(k).strip()))
+    try:
+        bids = sorted({int(b) for b in body.get("bids", [])})
+    except (ValueError, TypeError):
+        return jsonify({"error": "bids 는 정수 목록이어야 합니다"}), 400
+    devices = [d.upper() for d in body.get("devices", ["MOBILE"]) if d.upper() in RANK_BID_DEVICES]
+    
+    if not keywords or not bids or not devices:
+        return jsonify({"error": "keywords, bids, devices 가 필요합니다"}), 400
+    if len(keywords) > SIMULATE_MAX_KEYWORDS or len(bids) > SIMULATE_MAX_BIDS:
+        return jsonify({"error": f"최대 키워드 {SIMULATE_MAX_KEYWORDS}개, 입찰가 {SIMULATE_MAX_BIDS}개"}), 400
+    if not validate_required_keys():
+        return jsonify({"error": "API 키가 설정되지 않았습니다."}), 503
+    
+    with start_trace("simulate", keywords=len(keywords), bids=len(bids)):
+        columns, errors = simulate_bids(keywords, bids, tuple(devices))
+    
+    if body.get("format") == "csv":
+        return simulation_csv(columns), 200, {'Content-Type': 'text/csv; charset=utf-8'}
+    return jsonify({
+        "columns": SIMULATE_COLUMNS,
+        "rows": len(columns["keyword"]),
+        "data": columns,
+        "errors": errors
+    })
+
+@app.route('/api/place-keywords', methods=['POST'])
+def api_place_keywords():
+    """여러 플레이스의 대표키워드 + 검색량
+    
+    {"places": ["1234567890", "https://m.place.naver.com/restaurant/...", ...]}
+    """
+    if not admin_authorized():
+        return jsonify({"error": "forbidden"}), 403
+    
+    body = request.get_json(silent=True) or {}
+    places = list(dict.fromkeys(str(p).strip() for p in body.get("places", []) if str(p).strip()))
+    if not places:
+        return jsonify({"error": "places 가 필요합니다"}), 400
+    if len(places) > PLACE_BULK_MAX:
+        return jsonify({"error": f"최대 {PLACE_BULK_MAX}곳"}), 400
+    
+    with start_trace("place_bulk", places=len(places)):
+        items = get_place_keywords_bulk(places)
+    
+    for item in items:
+        if item["success"]:
+            item["keywords"] = [{"keyword": keyword, "volume": volume} for keyword, volume in item["keywords"]]
+    return jsonify({"places": items})
+
+@app.route('/api/competitors', methods=['POST'])
+def api_competitors():
+    """경쟁 플레이스 분석 작업 시작
+    
+    {"place": "내 플레이스 ID/URL (선택)", "competitors": ["ID 또는 URL", ...]}
+    → 202 {"job_id"}; 결과는 GET /api/competitors/<job_id>
+    """
+    if not admin_authorized():
+        return jsonify({"error": "forbidden"}), 403
+    
+    body = request.get_json(silent=True) or {}
+    own = str(body.get("place") or "").strip() or None
+    competitors = list(dict.fromkeys(str(p).strip() for p in body.get("competitors", []) if str(p).strip()))
+    if not competitors:
+        return jsonify({"error": "competitors 가 필요합니다"}), 400
+    if len(competitors) > COMPETITOR_MAX_PLACES:
+        return jsonify({"error": f"최대 {COMPETITOR_MAX_PLACES}곳"}), 400
+    
+    job_id = start_competitor_job(own, competitors)
+    if job_id is None:
+        return jsonify({"error": "진행 중인 분석이 많습니다. 잠시 후 다시 시도하세요."}), 429
+    return jsonify({"job_id": job_id, "status": "running"}), 202
+
+@app.route('/api/competitors/<job_id>')
+def api_competitor_job(job_id):
+    """작업 상태/진행률, 완료 시 키워드 순위표 (?format=csv)"""
+    if not admin_authorized():
+        return jsonify({"error": "forbidden"}), 403
+    
+    job = competitor_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "not found"}), 404
+    if job["status"] == "done" and request.args.get("format") == "csv":
+        return competitor_csv(job["result"]), 200, {'Content-Type': 'text/csv; charset=utf-8'}
+    return jsonify({
+        "job_id": job["id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "error": job["error"]
+    })
+
 @app.route('/ping')
 def ping():
     """cron-job.org용"""
@@ -1906,7 +4971,7 @@ def test_bid():
 <h2>📊 순위별 입찰가: {keyword}</h2>
 <hr>
 <h3>✅ API 응답 (RAW)</h3>
-<pre style="background:#f5f5f5; padding:20px; white-space:pre-wrap; overflow:auto;">{json.dumps(result["data"], ensure_ascii=False, indent=2)}</pre>
+<pre style="background:#f5f5f5; padding:20px; white-space:pre-wrap; overflow:auto;">{json.dumps(result["data"]["bidLandscape"], ensure_ascii=False, indent=2)}</pre>
 <hr>
 <h3>✅ 포맷팅 결과</h3>
 <pre style="background:#e8f5e9; padding:20px; white-space:pre-wrap;">{formatted}</pre>
@@ -1973,6 +5038,48 @@ def test_session():
     
     return html, 200, {'Content-Type': 'text/html; charset=utf-8'}
 
+@app.route('/test/traces')
+def test_traces():
+    """느린 요청 워터폴 (키워드/캐시 키가 담겨 있어 관리 토큰 필요)"""
+    if not admin_authorized():
+        return jsonify({"error": "forbidden"}), 403
+    
+    traces = list(slow_traces)[::-1]
+    
+    if request.args.get('format') == 'json':
+        return jsonify([trace_to_otlp(t) for t in traces])
+    
+    sections = []
+    for trace in traces:
+        total = trace.duration or 1e-9
+        rows = []
+        for item in sorted(trace.spans, key=lambda x: x["start"]):
+            left = item["start"] / total * 100
+            width = max(item["duration"] / total * 100, 0.5)
+            attrs = ", ".join(f"{k}={v}" for k, v in item["attrs"].items())
+            rows.append(
+                f'<tr><td style="white-space:nowrap; padding-right:10px;">{html.escape(item["name"])}</td>'
+                f'<td style="width:60%;"><div style="margin-left:{left:.1f}%; width:{width:.1f}%; background:#4285f4; height:14px;"></div></td>'
+                f'<td style="white-space:nowrap; padding-left:10px;">{item["duration"] * 1000:.0f}ms</td>'
+                f'<td style="color:#666;">{html.escape(attrs)}</td></tr>'
+            )
+        sections.append(
+            f'<h3>{html.escape(trace.name)} · {trace.duration:.2f}s · '
+            f'{time.strftime("%H:%M:%S", time.localtime(trace.start_wall))} · {trace.trace_id}</h3>'
+            f'<table style="width:100%; font-size:13px; border-collapse:collapse;">{"".join(rows)}</table>'
+        )
+    
+    body = "<hr>".join(sections) if sections else f"<p>{TRACE_SLOW_THRESHOLD}초 이상 걸린 요청 없음</p>"
+    
+    html_page = f"""<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>느린 요청 트레이스</title></head>
+<body style="font-family:Arial; max-width:1200px; margin:50px auto; padding:20px;">
+<h2>🐢 느린 요청 (최근 {len(traces)}건, {TRACE_SLOW_THRESHOLD}초 이상)</h2>
+{body}
+</body></html>"""
+    
+    return html_page, 200, {'Content-Type': 'text/html; charset=utf-8'}
+
 #############################################
 # 세션 정리
 #############################################
@@ -1985,12 +5092,13 @@ def cleanup_old_sessions():
     ]
     for user_id in expired_users:
         del user_sessions[user_id]
-        logger.info(f"🗑️ 세션 정리: {user_id}")
+        logger.info("🗑️ 세션 정리: %s", user_id)
 
 #############################################
 # 서버 실행
 #############################################
 if __name__ == '__main__':
+    configure_logging()
     print("=== 환경변수 확인 ===")
     print(f"검색광고 API: {'✅' if NAVER_API_KEY else '❌'}")
     print(f"DataLab API: {'✅' if NAVER_CLIENT_ID else '❌'}")
@@ -0,0 +1,778 @@
+"""ASGI 비동기 서빙 모드
+
+실행: uvicorn asgi:application --host 0.0.0.0 --port $PORT
+
+업스트림(검색광고, DataLab, 자동완성, 플레이스, Gemini) 호출은 httpx.AsyncClient 로
+이벤트 루프에서 처리해 app.py 의 api_cache 를 채우고, 응답 포맷팅과 세션 처리는
+app.handle_skill_request 를 그대로 재사용한다. 스레드에서는 캐시 히트만 발생하므로
+느린 업스트림이 워커를 점유하지 않는다.
+"""
+import asyncio
+import codecs
+import json
+import time
+
+import httpx
+from asgiref.wsgi import WsgiToAsgi
+
+import app as bot
+from app import app, logger
+
+#############################################
+# 비동기 HTTP 클라이언트
+#############################################
+_client = None
+
+def get_async_client():
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+            timeout=httpx.Timeout(5.0)
+        )
+    return _client
+
+async def close_async_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+async def async_upstream_request(endpoint, method, url, **kwargs):
+    """계측된 업스트림 HTTP 호출 (app.upstream_request 의 비동기 버전)"""
+    outcome = "ok"
+    start = time.perf_counter()
+    try:
+        with bot.span(f"upstream:{endpoint}"):
+            response = await get_async_client().request(method, url, **kwargs)
+        if response.status_code >= 400:
+            outcome = "error"
+        return response
+    except httpx.TimeoutException:
+        outcome = "timeout"
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        bot.UPSTREAM_LATENCY.observe(time.perf_counter() - start, endpoint, outcome)
+
+async def async_upstream_stream(endpoint, url, matcher, **kwargs):
+    """app.upstream_stream 의 비동기 버전: matcher 가 끝을 알리면 나머지 본문을 읽지 않고 닫음"""
+    outcome = "ok"
+    start = time.perf_counter()
+    received = 0
+    try:
+        with bot.span(f"upstream:{endpoint}"):
+            async with get_async_client().stream("GET", url, **kwargs) as response:
+                if response.status_code >= 400:
+                    outcome = "error"
+                elif response.status_code == 200:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+                    async for chunk in response.aiter_bytes(bot.STREAM_CHUNK_SIZE):
+                        received += len(chunk)
+                        if matcher.feed(decoder.decode(chunk)):
+                            break
+                return response.status_code, received
+    except httpx.TimeoutException:
+        outcome = "timeout"
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        bot.UPSTREAM_LATENCY.observe(time.perf_counter() - start, endpoint, outcome)
+
+#############################################
+# 비동기 캐시 함수
+#############################################
+_inflight = {}
+
+async def async_get_with_cache(key, fetch_func, *args, ttl=300):
+    """캐시 조회 → 없으면 fetch_func 실행 (같은 키 동시 요청은 1회만 호출)"""
+    with bot.cache_lock:
+        if key in bot.api_cache:
+            data, ts = bot.api_cache[key]
+            if time.time() - ts < ttl:
+                bot.CACHE_REQUESTS.inc(bot.cache_namespace(key), "hit")
+                logger.info("✅ 캐시 히트: %s", key, extra=bot.SAMPLED)
+                return data
+
+    if key in _inflight:
+        return await asyncio.shield(_inflight[key])
+
+    bot.CACHE_REQUESTS.inc(bot.cache_namespace(key), "miss")
+    logger.info("📡 API 호출(async): %s", key, extra=bot.SAMPLED)
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+
+    try:
+        data = await fetch_func(*args)
+        bot.store_cache_entry(key, data)
+        future.set_result(data)
+        return data
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()
+        raise
+    finally:
+        del _inflight[key]
+
+#############################################
+# 비동기 업스트림 함수
+#############################################
+async def async_get_keyword_data(keyword, retry=1):
+    """키워드 데이터 조회"""
+    if not bot.validate_required_keys():
+        return {"success": False, "error": "API 키가 설정되지 않았습니다."}
+
+    uri = "/keywordstool"
+    params = {"hintKeywords": keyword, "showDetail": "1"}
+
+    for attempt in range(retry + 1):
+        try:
+            headers = bot.get_naver_api_headers("GET", uri)
+            response = await async_upstream_request(
+                "keywordstool", "GET", bot.SEARCHAD_BASE_URL + uri,
+                headers=headers, params=params, timeout=2
+            )
+            bot.naver_signer.observe_date(response)
+
+            if response.status_code == 200:
+                keyword_list = response.json().get("keywordList", [])
+                if keyword_list:
+                    return {"success": True, "data": bot.keyword_records(keyword_list)}
+                return {"success": False, "error": "검색 결과가 없습니다."}
+
+            if attempt < retry:
+                await asyncio.sleep(0.2)
+                continue
+
+            return {"success": False, "error": f"API 오류 ({response.status_code})"}
+
+        except httpx.TimeoutException:
+            if attempt < retry:
+                await asyncio.sleep(0.2)
+                continue
+            return {"success": False, "error": "요청 시간 초과"}
+        except Exception as e:
+            logger.error("키워드 조회 오류: %s", e)
+            return {"success": False, "error": str(e)}
+
+async def async_get_performance_estimate(keyword, bids, device='MOBILE', retry=1):
+    """성과 예측 API"""
+    uri = '/estimate/performance/keyword'
+    payload = {
+        "device": device,
+        "keywordplus": False,
+        "key": keyword,
+        "bids": bids if isinstance(bids, list) else [bids]
+    }
+
+    for attempt in range(retry + 1):
+        try:
+            headers = bot.get_naver_api_headers('POST', uri)
+            response = await async_upstream_request(
+                "performance", "POST", f'{bot.SEARCHAD_BASE_URL}{uri}',
+                headers=headers, json=payload, timeout=3
+            )
+            bot.naver_signer.observe_date(response)
+
+            if response.status_code == 200:
+                return {"success": True, "data": response.json()}
+
+            if attempt < retry:
+                await asyncio.sleep(0.2)
+                continue
+
+            return {"success": False, "error": response.text}
+
+        except httpx.TimeoutException:
+            if attempt < retry:
+                await asyncio.sleep(0.2)
+                continue
+            return {"success": False, "error": "요청 시간 초과"}
+        except Exception as e:
+            logger.error("성과 예측 오류: %s", e)
+            return {"success": False, "error": str(e)}
+
+class _AsyncPerformanceBatch:
+    """app._PerformanceBatch 의 이벤트 루프 버전 (루프 스레드 하나에서만 다뤄 잠금 불필요)"""
+
+    def __init__(self):
+        self.bids = set()
+        self.sent = False
+        self.error = None
+        self.done = asyncio.Event()
+
+_performance_batches = {}
+
+async def _async_send_performance_batch(keyword, device, batch):
+    await asyncio.sleep(bot.PERF_BATCH_WINDOW)
+    batch.sent = True
+    try:
+        result = await async_get_performance_estimate(keyword, sorted(batch.bids), device)
+        if not result.get("success"):
+            batch.error = result.get("error", "성과 예측 실패")
+            return
+        bot.merge_performance_points(keyword, device, result["data"].get("estimate", []))
+    except Exception as e:
+        batch.error = str(e)
+    finally:
+        if _performance_batches.get((keyword, device)) is batch:
+            del _performance_batches[(keyword, device)]
+        batch.done.set()
+
+async def async_get_performance_curve(keyword, bids, device='MOBILE', ttl=300):
+    """app.get_performance_curve 의 비동기 버전: 같은 perf_ 캐시를 쓰고, 빠진 입찰가만 루프 안에서 병합 조회"""
+    bids = bids if isinstance(bids, list) else [bids]
+    key = bot.performance_curve_key(keyword, device)
+    points = bot.cached_performance_points(key, bids, ttl)
+    missing = [bid for bid in bids if bid not in points]
+
+    if not missing:
+        bot.CACHE_REQUESTS.inc("perf", "hit")
+        return {"success": True, "data": {"estimate": [points[bid] for bid in bids]}}
+
+    bot.CACHE_REQUESTS.inc("perf", "partial" if points else "miss")
+    batch = _performance_batches.get((keyword, device))
+    leader = batch is None or (batch.sent and not batch.bids.issuperset(missing))
+    if leader:
+        batch = _performance_batches[(keyword, device)] = _AsyncPerformanceBatch()
+    if not batch.sent:
+        batch.bids.update(missing)
+
+    if leader:
+        await _async_send_performance_batch(keyword, device, batch)
+    else:
+        try:
+            await asyncio.wait_for(batch.done.wait(), 5)
+        except asyncio.TimeoutError:
+            return {"success": False, "error": "요청 시간 초과"}
+
+    if batch.error:
+        return {"success": False, "error": batch.error}
+    points = bot.cached_performance_points(key, bids, ttl)
+    return {"success": True, "data": {"estimate": [points[bid] for bid in bids if bid in points]}}
+
+async def _async_fetch_position_bids(keyword, device):
+    uri = '/estimate/average-position-bid/keyword'
+    items = [{"key": keyword, "position": pos} for pos in range(1, 6)]
+    headers = bot.get_naver_api_headers('POST', uri)
+    response = await async_upstream_request(
+        "average-position-bid", "POST", f'{bot.SEARCHAD_BASE_URL}{uri}',
+        headers=headers, json={"device": device, "items": items}, timeout=3
+    )
+    return bot.naver_signer.observe_date(response)
+
+async def async_get_real_rank_bids(keyword):
+    """평균 순위별 입찰가 조회 (MOBILE/PC 동시 요청)"""
+    if not bot.validate_required_keys():
+        return {"success": False, "error": "API 키가 설정되지 않았습니다."}
+
+    devices = ['MOBILE', 'PC']
+    responses = await asyncio.gather(
+        *(_async_fetch_position_bids(keyword, device) for device in devices),
+        return_exceptions=True
+    )
+
+    results = {}
+    for device, response in zip(devices, responses):
+        if isinstance(response, Exception):
+            logger.error("❌ %s 예외: %s", device, response)
+            return {"success": False, "error": str(response)}
+        if response.status_code != 200:
+            logger.error("❌ %s API 오류: %s", device, response.status_code)
+            return {"success": False, "error": f"API 오류 ({response.status_code})", "detail": response.text}
+        results[device] = response.json().get("estimate", [])
+
+    return {"success": True, "data": bot.rank_bids_data(results)}
+
+async def async_get_datalab_trend(keyword, start_date, end_date):
+    """DataLab 트렌드 조회"""
+    if not bot.NAVER_CLIENT_ID or not bot.NAVER_CLIENT_SECRET:
+        return {"success": False, "error": "DataLab API 키 미설정"}
+
+    try:
+        response = await async_upstream_request(
+            "datalab", "POST", bot.DATALAB_URL,
+            headers=bot.datalab_headers(),
+            json=bot.datalab_payload(keyword, start_date, end_date),
+            timeout=10
+        )
+
+        if response.status_code == 200:
+            results = response.json().get("results", [])
+            if results and results[0].get("data"):
+                return {"success": True, "data": results[0]["data"]}
+        else:
+            logger.error("❌ DataLab API 오류 %s", response.status_code)
+
+        return {"success": False, "error": f"상태코드 {response.status_code}"}
+
+    except httpx.TimeoutException:
+        return {"success": False, "error": "요청 시간 초과"}
+    except Exception as e:
+        logger.error("❌ DataLab 예외: %s", e)
+        return {"success": False, "error": str(e)}
+
+async def async_fetch_related_keywords(keyword):
+    """네이버 검색 결과 연관검색어 스크래핑"""
+    try:
+        headers = {"User-Agent": "Mozilla/5.0", "Accept-Language": "ko-KR,ko;q=0.9"}
+        matcher = bot.RelatedKeywordMatcher(keyword)
+        status_code, _ = await async_upstream_stream(
+            "related", bot.related_keywords_url(keyword), matcher, headers=headers, timeout=5
+        )
+
+        if status_code == 200 and matcher.related:
+            return {"success": True, "data": matcher.related}
+
+        return {"success": False, "error": f"상태코드 {status_code}"}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+async def async_fetch_autocomplete(keyword):
+    """네이버 자동완성 조회"""
+    try:
+        response = await async_upstream_request(
+            "ac", "GET", bot.NAVER_AC_URL, params=bot.autocomplete_params(keyword), headers=bot.NAVER_AC_HEADERS, timeout=3
+        )
+
+        if response.status_code == 200:
+            suggestions = bot.parse_autocomplete_items(response.json(), keyword)
+            if suggestions:
+                return {"success": True, "data": suggestions}
+
+        return {"success": False, "error": f"상태코드 {response.status_code}"}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+async def async_fetch_youtube_autocomplete(keyword):
+    """유튜브 자동완성 조회"""
+    try:
+        response = await async_upstream_request(
+            "youtube-ac", "GET", bot.YOUTUBE_AC_URL, params=bot.youtube_autocomplete_params(keyword),
+            headers={"User-Agent": "Mozilla/5.0"}, timeout=3
+        )
+
+        if response.status_code == 200:
+            suggestions = bot.parse_youtube_suggestions(response.text, keyword)
+            if suggestions:
+                return {"success": True, "data": suggestions}
+
+        return {"success": False, "error": f"상태코드 {response.status_code}"}
+    except Exception as e:
+        logger.error("유튜브 자동완성 오류: %s", e)
+        return {"success": False, "error": str(e)}
+
+async def async_probe_place_category(place_id, category):
+    matcher = bot.PlaceKeywordMatcher()
+    status_code, _ = await async_upstream_stream(
+        "place", bot.place_home_url(category, place_id), matcher,
+        headers=bot.PLACE_HEADERS, timeout=bot.PLACE_PROBE_TIMEOUT
+    )
+    return category, (matcher.keywords if status_code == 200 else [])
+
+async def async_probe_place_categories(place_id, categories):
+    """카테고리 URL 동시 요청, 먼저 대표키워드가 나온 것을 채택하고 나머지 태스크는 취소"""
+    tasks = [asyncio.create_task(async_probe_place_category(place_id, category)) for category in categories]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                category, keywords = await next_done
+            except Exception:
+                continue
+            if keywords:
+                return category, keywords
+    finally:
+        for task in tasks:
+            task.cancel()
+    return None, []
+
+async def async_get_place_keywords(place_id):
+    record = await asyncio.to_thread(bot.load_place_record, place_id)
+    if record and time.time() - record["fetched_at"] < bot.PLACE_CACHE_TTL:
+        return bot.place_record_result(record)
+
+    for categories in bot.place_probe_rounds(record):
+        category, keywords = await async_probe_place_categories(place_id, categories)
+        if keywords:
+            await asyncio.to_thread(bot.save_place_record, place_id, category, keywords)
+            return {"success": True, "keywords": keywords, "category": category}
+
+    return bot.place_record_result(record) if record else bot.PLACE_NOT_FOUND
+
+def _release_late_gemini_slot(acquiring):
+    if not acquiring.cancelled() and acquiring.exception() is None and acquiring.result():
+        bot.gemini_semaphore.release()
+
+async def acquire_gemini_slot(timeout):
+    """app.gemini_semaphore 획득 (동기 경로와 한도 공유), 비어 있지 않으면 스레드에서 대기"""
+    if bot.gemini_semaphore.acquire(blocking=False):
+        return True
+    acquiring = asyncio.ensure_future(asyncio.to_thread(bot.gemini_semaphore.acquire, True, timeout))
+    try:
+        return await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        # 취소돼도 대기 스레드는 계속 돌므로 나중에 얻은 슬롯은 바로 반납
+        acquiring.add_done_callback(_release_late_gemini_slot)
+        raise
+
+async def async_gemini_text(prompt, temperature, max_output_tokens, timeout=4):
+    """Gemini 응답 텍스트, 키 없음/실패/슬롯 대기 초과 시 None"""
+    if not bot.GEMINI_API_KEY:
+        return None
+    if not await acquire_gemini_slot(timeout):
+        logger.warning("⚠️ Gemini 동시 호출 한도 (%d) 대기 초과", bot.GEMINI_MAX_CONCURRENCY)
+        return None
+    try:
+        response = await async_upstream_request(
+            "gemini", "POST", bot.gemini_url(), json=bot.gemini_payload(prompt, temperature, max_output_tokens), timeout=timeout
+        )
+        if response.status_code == 200:
+            return bot.parse_gemini_text(response.json())
+    except Exception:
+        pass
+    finally:
+        bot.gemini_semaphore.release()
+    return None
+
+#############################################
+# 비동기 분석 함수
+#############################################
+def _kw(keyword):
+    return async_get_with_cache(f"kw_{keyword}", async_get_keyword_data, keyword)
+
+def _bid(keyword):
+    return async_get_with_cache(f"bid_{keyword}", async_get_real_rank_bids, keyword)
+
+def _perf(keyword, bids, device):
+    return async_get_performance_curve(keyword, bids, device)
+
+def _keyword_name(kw_result, keyword):
+    if kw_result.get("success"):
+        return kw_result["data"][0].keyword or keyword
+    return keyword
+
+async def _fetch_and_learn_autocomplete(provider, fetch_func, keyword):
+    result = await fetch_func(keyword)
+    if result.get("success"):
+        bot.autocomplete_indexes[provider].learn(keyword, result["data"])
+    return result
+
+async def _live_autocomplete(provider, fetch_func, keyword):
+    """app.lookup_autocomplete 와 같은 규칙: 색인이 답하는 접두사는 건너뛰고, 처음 보는 접두사만 실시간 조회
+
+    이후 동기 렌더링은 (autocomplete_live=False) 색인이나 채워진 캐시로 응답한다.
+    """
+    if bot.autocomplete_indexes[provider].lookup(keyword) is not None:
+        return
+    await async_get_with_cache(
+        bot.autocomplete_cache_key(provider, keyword), _fetch_and_learn_autocomplete, provider, fetch_func, keyword
+    )
+
+async def _ac(keyword):
+    await _live_autocomplete("naver", async_fetch_autocomplete, keyword)
+
+async def _yt(keyword):
+    await _live_autocomplete("youtube", async_fetch_youtube_autocomplete, keyword)
+
+async def warm_ad_cost_full(keyword):
+    kw_result = await _kw(keyword)
+    if not kw_result.get("success"):
+        return
+    keyword_name = _keyword_name(kw_result, keyword)
+    test_bids = bot.FULL_ANALYSIS_TEST_BIDS
+    await asyncio.gather(
+        _perf(keyword_name, test_bids, 'MOBILE'),
+        _perf(keyword_name, test_bids, 'PC'),
+        _bid(keyword_name)
+    )
+
+async def warm_ad_cost_custom(keyword, user_bid):
+    kw_result = await _kw(keyword)
+    if not kw_result.get("success"):
+        return
+    keyword_name = _keyword_name(kw_result, keyword)
+    perf, _ = await asyncio.gather(_perf(keyword_name, [user_bid], 'MOBILE'), _bid(keyword_name))
+
+    estimates = perf["data"].get("estimate", []) if perf.get("success") else []
+    if estimates and estimates[0].get('clicks', 0) == 0:
+        await _perf(keyword_name, bot.CUSTOM_ANALYSIS_MIN_BIDS, 'MOBILE')
+
+async def warm_comparison(keyword):
+    periods = bot.datalab_periods()
+    await asyncio.gather(_kw(keyword), *(
+        async_get_with_cache(f"dl_{keyword}_{start}_{end}", async_get_datalab_trend, keyword, start, end)
+        for start, end in periods
+    ))
+
+# 대체값 반환 뒤에도 계속 진행 중인 primary 태스크 (GC 방지)
+_late_tasks = set()
+
+async def async_race_with_fallback(name, primary, fallback, budget=None, on_late=None):
+    """app.race_with_fallback 의 비동기 버전 (primary 는 코루틴, on_late 는 코루틴 함수)"""
+    budget = bot.LLM_LATENCY_BUDGET if budget is None else budget
+    start = time.perf_counter()
+    task = asyncio.create_task(primary)
+    fallback_value = fallback()
+
+    done, _ = await asyncio.wait({task}, timeout=max(0, budget - (time.perf_counter() - start)))
+    if not done:
+        async def finish_late():
+            try:
+                value = await task
+            except Exception:
+                value = None
+            if value and on_late is not None:
+                await on_late(value)
+            bot.finish_late_primary(name, value)
+
+        late = asyncio.create_task(finish_late())
+        _late_tasks.add(late)
+        late.add_done_callback(_late_tasks.discard)
+        bot.record_race(name, "fallback_timeout", start)
+        return fallback_value
+
+    value = None if task.exception() else task.result()
+    if value:
+        bot.record_race(name, "primary", start)
+        return value
+    bot.record_race(name, "fallback_failed", start)
+    return fallback_value
+
+async def async_get_fortune(birthdate=None):
+    """완성된 운세 응답 바이트 (캐시) 또는 텍스트"""
+    day, subject = bot.fortune_key(birthdate)
+    body = bot.fortune_responses.get((day, subject))
+    if body is not None:
+        bot.CACHE_REQUESTS.inc("fortune_rendered", "hit")
+        return body
+    bot.CACHE_REQUESTS.inc("fortune_rendered", "miss")
+    text = await asyncio.to_thread(bot.cached_fortune, day, subject)
+    if text:
+        return bot.fortune_response_body(day, subject, text)
+    if not bot.GEMINI_API_KEY:
+        return bot.get_fortune_fallback(birthdate, day)
+
+    async def generate():
+        text = await async_gemini_text(bot.build_fortune_prompt(birthdate), 0.9, 500)
+        if text:
+            return await asyncio.to_thread(bot.save_fortune, day, subject, text)
+        return text
+
+    # 대체 문구는 저장하지 않음 (app.race_fortune 과 같이 늦은 Gemini 응답이 generate 에서 저장됨)
+    return await async_race_with_fallback(
+        "fortune", generate(), lambda: bot.get_fortune_fallback(birthdate, day)
+    )
+
+async def async_get_lotto():
+    """풀의 응답 바이트, 비었으면 Gemini 와 대체 번호 경쟁 결과 텍스트"""
+    body = bot.lotto_pool.pop()
+    if body is not None:
+        return body
+    if not bot.GEMINI_API_KEY:
+        return bot.get_lotto_fallback()
+
+    async def keep_in_pool(text):
+        bot.lotto_pool.push([text])
+
+    return await async_race_with_fallback(
+        "lotto", async_gemini_text(bot.LOTTO_PROMPT, 1.0, 400), bot.get_lotto_fallback, on_late=keep_in_pool
+    )
+
+#############################################
+# 카카오 스킬 - 비동기 디스패치
+#############################################
+async def _prefetch_fortune(user_id, utterance, arg):
+    if " " not in utterance:
+        return await async_get_fortune()
+    birthdate = ''.join(filter(str.isdigit, utterance))
+    if birthdate and len(birthdate) in [6, 8]:
+        return await async_get_fortune(birthdate)
+    return None
+
+async def _prefetch_lotto(user_id, utterance, arg):
+    return await async_get_lotto()
+
+async def _prefetch_compare(user_id, utterance, arg):
+    if arg:
+        await warm_comparison(arg)
+
+async def _prefetch_youtube(user_id, utterance, arg):
+    if arg:
+        await _yt(arg)
+
+async def _prefetch_combined(user_id, utterance, arg):
+    if arg:
+        await asyncio.gather(_ac(arg), _yt(arg))
+
+async def _prefetch_autocomplete(user_id, utterance, arg):
+    if arg:
+        await _ac(arg)
+
+async def _prefetch_place(user_id, utterance, arg):
+    place_inputs = bot.split_place_inputs(arg)[:bot.PLACE_KAKAO_BULK_MAX] if arg else []
+    place_ids = dict.fromkeys(p for p in map(bot.extract_place_id_from_url, place_inputs) if p)
+    # 동기 경로 (get_place_keywords_bulk) 와 같이 요청당 PLACE_BULK_CONCURRENCY 곳씩
+    limit = asyncio.Semaphore(bot.PLACE_BULK_CONCURRENCY)
+
+    async def _place(place_id):
+        async with limit:
+            await async_get_with_cache(f"place_{place_id}", async_get_place_keywords, place_id)
+
+    await asyncio.gather(*(_place(place_id) for place_id in place_ids))
+
+async def _prefetch_related(user_id, utterance, arg):
+    keyword = bot.clean_keyword(arg)
+    if keyword:
+        result = await async_get_with_cache(f"rel_{keyword}", async_fetch_related_keywords, keyword)
+        if not result.get("success"):
+            await _kw(keyword)
+
+def _ad_session_keyword(user_id):
+    """만료되지 않은 광고 선택 대기 세션의 키워드 (만료면 동기 핸들러가 안내하므로 None)"""
+    session = bot.user_sessions.get(user_id)
+    if not session or time.time() - session.get("timestamp", 0) > 300:
+        return None
+    return session["keyword"]
+
+async def _prefetch_ad_rank(user_id, utterance, arg):
+    keyword = _ad_session_keyword(user_id)
+    if keyword:
+        await asyncio.gather(_bid(keyword), _kw(keyword))
+
+async def _prefetch_ad_full(user_id, utterance, arg):
+    keyword = _ad_session_keyword(user_id)
+    if keyword:
+        await warm_ad_cost_full(keyword)
+
+async def _prefetch_ad_custom(user_id, utterance, arg):
+    keyword = _ad_session_keyword(user_id)
+    bid_input = ''.join(filter(str.isdigit, utterance))
+    if keyword and bid_input and 70 <= int(bid_input) <= 100000:
+        await warm_ad_cost_custom(keyword, int(bid_input))
+
+async def _prefetch_search(user_id, utterance, arg):
+    await asyncio.gather(*(
+        async_get_with_cache(key, async_get_keyword_data, key[len("kw_"):])
+        for key in bot.search_volume_cache_keys(bot.clean_keyword(utterance))
+    ))
+
+# classify_skill_command 라벨 → 미리 채울 작업 (없는 라벨은 업스트림 호출이 없거나 동기 핸들러가 처리)
+SKILL_PREFETCH = {
+    "fortune": _prefetch_fortune,
+    "lotto": _prefetch_lotto,
+    "compare": _prefetch_compare,
+    "youtube": _prefetch_youtube,
+    "combined": _prefetch_combined,
+    "autocomplete": _prefetch_autocomplete,
+    "place": _prefetch_place,
+    "related": _prefetch_related,
+    "ad_rank": _prefetch_ad_rank,
+    "ad_full": _prefetch_ad_full,
+    "ad_custom": _prefetch_ad_custom,
+    "search": _prefetch_search,
+}
+
+async def prefetch_skill(command, user_id, utterance):
+    """dispatch 와 같은 분류 (classify_skill_command) 결과로 필요한 캐시를 비동기로 채움
+
+    운세/로또는 완성된 응답 (직렬화된 바이트 또는 텍스트) 을 반환한다.
+    """
+    prefetch = SKILL_PREFETCH.get(command)
+    if prefetch is None:
+        return None
+    arg = utterance.split(" ", 1)[1].strip() if " " in utterance else ""
+    return await prefetch(user_id, utterance, arg)
+
+def _handle_in_app_context(request_data):
+    with app.app_context():
+        return bot.handle_skill_request(request_data, record=False)
+
+async def handle_skill_async(request_data):
+    """업스트림은 비동기로 미리 채우고, 응답 생성은 동기 핸들러 재사용"""
+    command = bot.classify_skill_command(request_data)
+    start = time.perf_counter()
+    response = None
+    bot.note_skill_request(command, request_data)
+    try:
+        with bot.start_trace("skill_async", command=command):
+            response = await _handle_skill_async(command, request_data)
+            return response
+    finally:
+        latency = time.perf_counter() - start
+        bot.COMMAND_LATENCY.observe(latency, command)
+        bot.capture_skill_request(request_data, command, latency, response.status_code if response is not None else 500)
+
+async def _handle_skill_async(command, request_data):
+    if isinstance(request_data, dict):
+        user_request = request_data.get("userRequest", {})
+        user_id = user_request.get("user", {}).get("id", "unknown")
+        utterance = user_request.get("utterance", "").strip()
+
+        if utterance:
+            try:
+                text = await prefetch_skill(command, user_id, utterance)
+                # 자동완성은 프리페치에서 실시간 조회를 이미 기다렸으므로 동기 렌더링은 캐시/색인만 사용
+                bot.autocomplete_live.set(False)
+            except Exception as e:
+                logger.error("❌ 비동기 프리페치 오류: %s", e, exc_info=True)
+                text = None
+
+            if isinstance(text, bytes):
+                return bot.kakao_bytes_response(text)
+            if text is not None:
+                with app.app_context():
+                    return bot.create_kakao_response(text)
+
+    return await asyncio.to_thread(_handle_in_app_context, request_data)
+
+#############################################
+# ASGI 엔트리포인트
+#############################################
+_wsgi_app = WsgiToAsgi(app)
+
+async def _read_body(receive):
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            bot.configure_logging()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_async_client()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+
+    if scope["type"] == "http" and scope["path"] == "/skill" and scope["method"] == "POST":
+        body = await _read_body(receive)
+        try:
+            request_data = json.loads(body) if body else None
+        except ValueError:
+            request_data = None
+
+        response = await handle_skill_async(request_data)
+        await send({
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in response.headers.items()]
+        })
+        await send({"type": "http.response.body", "body": response.get_data()})
+        return
+
+    await _wsgi_app(scope, receive, send)
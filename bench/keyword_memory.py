@@ -0,0 +1,77 @@
+"""keywordstool 캐시 항목: dict 행 vs KeywordStat 레코드 비교
+
+스텁과 같은 합성 keywordList 를 JSON 왕복 (실제 응답 파싱과 같은 객체 구성) 으로 만든 뒤
+캐시 항목 N개를 그대로 들고 있을 때의 메모리와, 포매터가 하는 검색량 합산에 드는 시간을 비교한다.
+
+    python -m bench.keyword_memory --entries 2000 --rows 50
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from bench.run import KEYWORDS
+from bench.stubs import payload_keywordstool
+
+def build_responses(entries, rows):
+    """캐시 항목 수만큼의 keywordList (JSON 문자열)"""
+    responses = []
+    for i in range(entries):
+        keyword = f"{KEYWORDS[i % len(KEYWORDS)]}{i}"
+        hints = [keyword] + [f"{keyword}{j}" for j in range(rows - 7)]
+        _, _, payload = payload_keywordstool(None, {"hintKeywords": [",".join(hints)]}, None)
+        responses.append(json.dumps(payload["keywordList"], ensure_ascii=False))
+    return responses
+
+def measure_memory(build):
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, data
+
+def measure_time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="keywordstool 캐시 표현 메모리 벤치마크")
+    parser.add_argument("--entries", type=int, default=2000, help="캐시 항목 (키워드) 수")
+    parser.add_argument("--rows", type=int, default=50, help="항목당 keywordList 행 수")
+    parser.add_argument("--repeat", type=int, default=5, help="합산 시간 반복 횟수")
+    args = parser.parse_args(argv)
+
+    import logging
+    import app as bot
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    rows = max(args.rows, 8)
+    responses = build_responses(args.entries, rows)
+    row_count = len(responses) * rows
+
+    dict_bytes, dict_cache = measure_memory(lambda: [json.loads(r) for r in responses])
+    # 레코드만 남도록 변환 후 dict 는 버림 (fetch 시점 변환과 같은 상태)
+    record_bytes, record_cache = measure_memory(
+        lambda: [[bot.KeywordStat.from_row(row) for row in json.loads(r)] for r in responses]
+    )
+
+    dict_time = measure_time(lambda: [
+        bot.parse_count(row.get("monthlyPcQcCnt")) + bot.parse_count(row.get("monthlyMobileQcCnt"))
+        for rows in dict_cache for row in rows
+    ], args.repeat)
+    record_time = measure_time(lambda: [record.total for rows in record_cache for record in rows], args.repeat)
+
+    print(f"캐시 항목 {len(responses)}개 · 행 {row_count:,}개")
+    print("")
+    print(f"{'표현':<14}{'메모리(MB)':>12}{'행당(B)':>10}{'합산(ms)':>10}")
+    print(f"{'dict 행':<14}{dict_bytes / 1e6:>12.1f}{dict_bytes / row_count:>10.0f}{dict_time * 1000:>10.1f}")
+    print(f"{'KeywordStat':<14}{record_bytes / 1e6:>12.1f}{record_bytes / row_count:>10.0f}{record_time * 1000:>10.1f}")
+    print("")
+    print(f"메모리 {dict_bytes / record_bytes:.1f}배 감소, 합산 {dict_time / record_time:.1f}배 단축")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""순위별 입찰가: 키워드별 조회 vs 일괄 조회 비교
+
+같은 스텁 업스트림에 대해 get_real_rank_bids 를 키워드마다 부르는 방식과
+fetch_rank_bids_batch 로 묶어 부르는 방식의 호출 수와 소요 시간을 100 키워드 기준으로 비교한다.
+
+    python -m bench.rank_bids --keywords 300 --max-items 100 --concurrency 4
+"""
+import argparse
+import os
+import time
+
+from bench.run import BENCH_CREDENTIALS, KEYWORDS
+from bench.stubs import StubCluster, load_profile
+
+ENDPOINT = "average-position-bid"
+
+def measure(cluster, func):
+    cluster.reset_counts()
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, cluster.counts().get(ENDPOINT, 0), result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="순위별 입찰가 일괄 조회 벤치마크")
+    parser.add_argument("--keywords", type=int, default=100, help="조회할 키워드 수")
+    parser.add_argument("--max-items", type=int, default=100, help="요청당 items 한도 (RANK_BID_MAX_ITEMS)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 청크 요청 수 (RANK_BID_CONCURRENCY)")
+    parser.add_argument("--profile", help="엔드포인트별 지연/오류율 JSON")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    cluster = StubCluster(load_profile(args.profile), None, 0, args.seed).start()
+    try:
+        os.environ.update(BENCH_CREDENTIALS)
+        os.environ.update(cluster.env())
+        os.environ["RANK_BID_MAX_ITEMS"] = str(args.max_items)
+        os.environ["RANK_BID_CONCURRENCY"] = str(args.concurrency)
+
+        import logging
+        import app as bot
+        logging.getLogger("app").setLevel(logging.WARNING)
+
+        pool = KEYWORDS * (args.keywords // len(KEYWORDS) + 1)
+        keywords = [f"{keyword}{i // len(KEYWORDS) or ''}" for i, keyword in enumerate(pool[:args.keywords])]
+
+        single_time, single_calls, single = measure(cluster, lambda: [bot.get_real_rank_bids(k) for k in keywords])
+        batch_time, batch_calls, batch = measure(cluster, lambda: bot.fetch_rank_bids_batch(keywords))
+    finally:
+        cluster.stop()
+
+    single_ok = sum(1 for result in single if result.get("success"))
+    scale = 100 / len(keywords)
+
+    print(f"키워드 {len(keywords)}개 · 요청당 items {args.max_items} · 동시 {args.concurrency}")
+    print("")
+    print(f"{'방식':<10}{'성공':>8}{'호출':>8}{'소요(s)':>10}{'호출/100':>10}{'초/100':>10}")
+    print(f"{'키워드별':<10}{single_ok:>8}{single_calls:>8}{single_time:>10.2f}{single_calls * scale:>10.1f}{single_time * scale:>10.2f}")
+    print(f"{'일괄':<10}{len(batch):>8}{batch_calls:>8}{batch_time:>10.2f}{batch_calls * scale:>10.1f}{batch_time * scale:>10.2f}")
+    if batch_calls and batch_time:
+        print("")
+        print(f"호출 {single_calls / batch_calls:.1f}배 감소, 시간 {single_time / batch_time:.1f}배 단축")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""캡처된 /skill 트래픽 리플레이
+
+SKILL_CAPTURE_PATH 로 기록한 JSONL 을 업스트림 스텁을 붙인 로컬 서버에 다시 보낸다.
+사용자별 요청 순서는 유지하므로 '광고 → 순위' 같은 세션 흐름도 그대로 재현된다.
+
+    python -m bench.replay capture.jsonl --speed 10 --json new.json --compare old.json
+    python -m bench.replay capture.jsonl --speed max --stub-port 9100 --target http://127.0.0.1:8000
+
+--speed 는 1 (원래 간격), 10 (10배속), max (간격 무시, --concurrency 로 제한).
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from bench.run import (
+    build_report,
+    kakao_payload,
+    print_comparison,
+    print_report,
+    start_inprocess_app,
+    wait_for_target,
+)
+from bench.stubs import StubCluster, load_profile
+
+def load_capture(path, limit=None):
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("utterance"):
+                records.append(record)
+            if limit and len(records) >= limit:
+                break
+    records.sort(key=lambda r: r.get("ts", 0))
+    return records
+
+def group_by_user(records):
+    """사용자별 (상대 시각, 기록) 목록, 첫 요청 시각 순"""
+    if not records:
+        return []
+    origin = records[0].get("ts", 0)
+    users = {}
+    for record in records:
+        users.setdefault(record.get("user", "unknown"), []).append((record.get("ts", origin) - origin, record))
+    return sorted(users.values(), key=lambda steps: steps[0][0])
+
+class Replayer:
+    def __init__(self, target, user_sequences, speed, concurrency, timeout=10):
+        self.target = target.rstrip("/")
+        self.user_sequences = user_sequences
+        self.speed = speed
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.samples = []
+        self.lags = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.start = 0.0
+
+    def _session(self):
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        return session
+
+    def _replay_user(self, index_and_steps):
+        index, steps = index_and_steps
+        session = self._session()
+        user_id = f"replay-{index}"
+        samples = []
+        lags = []
+
+        for offset, record in steps:
+            if self.speed:
+                due = self.start + offset / self.speed
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                else:
+                    lags.append(-wait)
+
+            sent = time.perf_counter()
+            ok = False
+            try:
+                response = session.post(
+                    f"{self.target}/skill",
+                    json=kakao_payload(user_id, record["utterance"]),
+                    timeout=self.timeout
+                )
+                ok = response.status_code == 200
+            except requests.RequestException:
+                pass
+            samples.append((record.get("command", "unknown"), time.perf_counter() - sent, ok))
+
+        with self.lock:
+            self.samples.extend(samples)
+            self.lags.extend(lags)
+
+    def run(self):
+        self.start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            list(executor.map(self._replay_user, enumerate(self.user_sequences)))
+        return time.perf_counter() - self.start
+
+def parse_speed(value):
+    if value == "max":
+        return 0
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed 는 0보다 커야 합니다")
+    return speed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="캡처된 /skill 트래픽 리플레이")
+    parser.add_argument("capture", help="SKILL_CAPTURE_PATH 로 기록한 JSONL")
+    parser.add_argument("--speed", type=parse_speed, default=1, help="1, 10, ... 또는 max")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시에 재생할 사용자 수")
+    parser.add_argument("--limit", type=int, help="앞에서부터 N건만 재생")
+    parser.add_argument("--profile", help="엔드포인트별 지연/오류율 JSON")
+    parser.add_argument("--payload-dir", help="녹화된 업스트림 응답 디렉터리")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--target", help="이미 실행 중인 서버 주소 (생략 시 같은 프로세스에서 실행)")
+    parser.add_argument("--stub-port", type=int, default=0, help="스텁 첫 포트 (--target 사용 시 고정 포트 필요)")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON (다른 빌드의 리플레이 결과)")
+    args = parser.parse_args(argv)
+
+    records = load_capture(args.capture, args.limit)
+    if not records:
+        raise SystemExit(f"{args.capture}: 재생할 요청 없음")
+
+    cluster = StubCluster(load_profile(args.profile), args.payload_dir, args.stub_port, args.seed).start()
+    try:
+        upstream_by_command = None
+        if args.target:
+            target = args.target
+            if not wait_for_target(target):
+                raise SystemExit(f"{target}/health 응답 없음")
+        else:
+            _, target, upstream_by_command = start_inprocess_app(cluster.env())
+
+        replayer = Replayer(target, group_by_user(records), args.speed, args.concurrency)
+        duration = replayer.run()
+        report = build_report(replayer.samples, duration, cluster.counts(), upstream_by_command)
+        report["schedule_lag_max"] = max(replayer.lags, default=0.0)
+    finally:
+        cluster.stop()
+
+    speed_text = "max" if not args.speed else f"{args.speed:g}x"
+    print(f"리플레이: {args.capture} ({len(records)}건, {speed_text})")
+    if args.speed and report["schedule_lag_max"] > 0.1:
+        print(f"⚠️ 최대 {report['schedule_lag_max']:.2f}s 지연 재생 (--concurrency 를 늘리세요)")
+    print("")
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        print("")
+        print_comparison(base, report, out=sys.stdout)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""오프라인 /skill 벤치마크
+
+업스트림 스텁을 띄우고 실제 발화 분포로 /skill 을 호출해 처리량, p50/p95/p99,
+명령어별 업스트림 호출 수를 보고한다.
+
+앱을 같은 프로세스에서 실행 (기본):
+    python -m bench.run --requests 2000 --concurrency 32
+
+이미 떠 있는 서버를 측정 (gunicorn/uvicorn 프로필 비교 등):
+    python -m bench.run --stub-port 9100 --print-env      # 서버에 넣을 환경변수 출력
+    python -m bench.run --stub-port 9100 --target http://127.0.0.1:8000
+
+--json 으로 결과를 저장하면 --compare 로 두 빌드를 비교할 수 있다.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from bench.stubs import StubCluster, load_profile
+
+#############################################
+# 발화 분포
+#############################################
+REGIONS = ["강남", "부평", "홍대", "잠실", "판교", "해운대", "수원", "일산", "분당", "송도"]
+CATEGORIES = ["맛집", "카페", "헬스장", "미용실", "치과", "필라테스", "네일", "피부과", "꽃집", "술집"]
+KEYWORDS = [f"{region}{category}" for region in REGIONS for category in CATEGORIES]
+PLACE_IDS = [str(1000000000 + i * 7919) for i in range(30)]
+
+# (이름, 가중치, 키워드 → [(명령어 라벨, 발화), ...])
+SCENARIOS = [
+    ("search", 40, lambda kw, place_id: [("search", kw)]),
+    ("autocomplete", 10, lambda kw, place_id: [("autocomplete", f"자동 {kw}")]),
+    ("youtube", 5, lambda kw, place_id: [("youtube", f"유튜브 {kw}")]),
+    ("related", 8, lambda kw, place_id: [("related", f"연관 {kw}")]),
+    ("place", 5, lambda kw, place_id: [("place", f"대표 {place_id}")]),
+    ("ad_rank", 8, lambda kw, place_id: [("ad", f"광고 {kw}"), ("ad_rank", "순위")]),
+    ("ad_full", 4, lambda kw, place_id: [("ad", f"광고 {kw}"), ("ad_full", "전체")]),
+    ("ad_custom", 6, lambda kw, place_id: [("ad", f"광고 {kw}"), ("ad_custom", "3000")]),
+    ("compare", 4, lambda kw, place_id: [("compare", f"비교 {kw}")]),
+    ("fortune", 6, lambda kw, place_id: [("fortune", "운세 870114")]),
+    ("lotto", 4, lambda kw, place_id: [("lotto", "로또")]),
+]
+
+def parse_mix(value):
+    """'search=50,lotto=0' → 시나리오 가중치 덮어쓰기"""
+    weights = {name: weight for name, weight, _ in SCENARIOS}
+    if value:
+        for part in value.split(","):
+            name, weight = part.split("=")
+            if name not in weights:
+                raise SystemExit(f"알 수 없는 시나리오: {name}")
+            weights[name] = float(weight)
+    return weights
+
+def zipf_weights(n, s=1.1):
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+def kakao_payload(user_id, utterance):
+    return {"userRequest": {"utterance": utterance, "user": {"id": user_id}}}
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def summarize_latencies(values):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+
+#############################################
+# 부하 생성
+#############################################
+class LoadRunner:
+    def __init__(self, target, total_requests, concurrency, weights, seed=None, timeout=10):
+        self.target = target.rstrip("/")
+        self.total_requests = total_requests
+        self.concurrency = concurrency
+        self.names = [name for name, _, _ in SCENARIOS]
+        self.builders = {name: builder for name, _, builder in SCENARIOS}
+        self.weights = [weights[name] for name in self.names]
+        self.keyword_weights = zipf_weights(len(KEYWORDS))
+        self.seed = seed
+        self.timeout = timeout
+        self.issued = 0
+        self.issued_lock = threading.Lock()
+        self.samples = []
+        self.samples_lock = threading.Lock()
+
+    def _claim(self, n):
+        with self.issued_lock:
+            if self.issued >= self.total_requests:
+                return False
+            self.issued += n
+            return True
+
+    def _worker(self, worker_id):
+        rng = random.Random(None if self.seed is None else self.seed + worker_id)
+        session = requests.Session()
+        user_seq = 0
+        local = []
+
+        while True:
+            name = rng.choices(self.names, self.weights)[0]
+            keyword = rng.choices(KEYWORDS, self.keyword_weights)[0]
+            steps = self.builders[name](keyword, rng.choice(PLACE_IDS))
+            if not self._claim(len(steps)):
+                break
+
+            user_seq += 1
+            user_id = f"bench-{worker_id}-{user_seq}"
+            for label, utterance in steps:
+                start = time.perf_counter()
+                ok = False
+                try:
+                    response = session.post(f"{self.target}/skill", json=kakao_payload(user_id, utterance), timeout=self.timeout)
+                    ok = response.status_code == 200
+                except requests.RequestException:
+                    pass
+                local.append((label, time.perf_counter() - start, ok))
+
+        with self.samples_lock:
+            self.samples.extend(local)
+
+    def run(self):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            list(executor.map(self._worker, range(self.concurrency)))
+        return time.perf_counter() - start
+
+def build_report(samples, duration, upstream_calls, upstream_by_command=None):
+    by_label = {}
+    for label, latency, ok in samples:
+        by_label.setdefault(label, []).append(latency)
+
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, _, ok in samples if not ok),
+        "duration": duration,
+        "throughput": len(samples) / duration if duration else 0.0,
+        "latency": summarize_latencies([latency for _, latency, _ in samples]),
+        "latency_by_command": {label: summarize_latencies(values) for label, values in sorted(by_label.items())},
+        "upstream_calls": dict(sorted(upstream_calls.items())),
+        "upstream_calls_by_command": upstream_by_command or {},
+    }
+
+def print_report(report, out=sys.stdout):
+    ms = lambda v: f"{v * 1000:8.1f}"
+    print(f"요청 {report['requests']}건 / 오류 {report['errors']}건 / {report['duration']:.1f}s "
+          f"→ {report['throughput']:.1f} req/s", file=out)
+    print("", file=out)
+    print(f"{'command':<14}{'count':>7}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}", file=out)
+    rows = list(report["latency_by_command"].items()) + [("TOTAL", report["latency"])]
+    for label, stats in rows:
+        print(f"{label:<14}{stats['count']:>7}{ms(stats['p50']):>10}{ms(stats['p95']):>10}{ms(stats['p99']):>10}", file=out)
+
+    print("", file=out)
+    print("업스트림 호출 수", file=out)
+    for endpoint, count in report["upstream_calls"].items():
+        print(f"  {endpoint:<22}{count:>7}", file=out)
+
+    if report["upstream_calls_by_command"]:
+        print("", file=out)
+        print("명령어별 업스트림 호출 (요청당 평균)", file=out)
+        for command, info in report["upstream_calls_by_command"].items():
+            calls = ", ".join(f"{endpoint}={count / info['requests']:.2f}" for endpoint, count in sorted(info["calls"].items()))
+            print(f"  {command:<14}{info['requests']:>6}건  {calls or '-'}", file=out)
+
+def print_comparison(base, current, out=sys.stdout):
+    """두 보고서의 지연/오류/처리량 차이"""
+    def delta(a, b):
+        return f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+
+    print(f"처리량: {base['throughput']:.1f} → {current['throughput']:.1f} req/s ({delta(base['throughput'], current['throughput'])})", file=out)
+    print(f"오류: {base['errors']} → {current['errors']}", file=out)
+    print(f"{'command':<14}{'p50':>20}{'p99':>20}", file=out)
+    labels = sorted(set(base["latency_by_command"]) | set(current["latency_by_command"]))
+    for label in labels + ["TOTAL"]:
+        a = base["latency"] if label == "TOTAL" else base["latency_by_command"].get(label)
+        b = current["latency"] if label == "TOTAL" else current["latency_by_command"].get(label)
+        if not a or not b:
+            continue
+        print(f"{label:<14}"
+              f"{a['p50'] * 1000:7.1f}→{b['p50'] * 1000:7.1f} {delta(a['p50'], b['p50']):>6}"
+              f"{a['p99'] * 1000:7.1f}→{b['p99'] * 1000:7.1f} {delta(a['p99'], b['p99']):>6}", file=out)
+
+#############################################
+# 앱 실행 (같은 프로세스)
+#############################################
+BENCH_CREDENTIALS = {
+    "NAVER_API_KEY": "bench",
+    "NAVER_SECRET_KEY": "bench",
+    "NAVER_CUSTOMER_ID": "1",
+    "NAVER_CLIENT_ID": "bench",
+    "NAVER_CLIENT_SECRET": "bench",
+    "GEMINI_API_KEY": "bench",
+}
+
+def start_inprocess_app(env):
+    """스텁 주소로 app 을 import 해 werkzeug 스레드 서버로 실행"""
+    os.environ.update(BENCH_CREDENTIALS)
+    os.environ.update(env)
+
+    import logging
+    from werkzeug.serving import make_server
+
+    import app as bot
+    logging.getLogger("app").setLevel(logging.WARNING)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    upstream_by_command = {}
+    lock = threading.Lock()
+
+    def count_upstream_spans(trace):
+        command = trace.attrs.get("command", trace.name)
+        with lock:
+            info = upstream_by_command.setdefault(command, {"requests": 0, "calls": {}})
+            info["requests"] += 1
+            for item in trace.spans:
+                if item["name"].startswith("upstream:"):
+                    endpoint = item["name"][len("upstream:"):]
+                    info["calls"][endpoint] = info["calls"].get(endpoint, 0) + 1
+
+    bot.trace_listeners.append(count_upstream_spans)
+
+    server = make_server("127.0.0.1", 0, bot.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="bench-app", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}", upstream_by_command
+
+def wait_for_target(target, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{target.rstrip('/')}/health", timeout=1).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="/skill 오프라인 벤치마크")
+    parser.add_argument("--requests", type=int, default=1000, help="총 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 사용자 수")
+    parser.add_argument("--mix", help="시나리오 가중치 덮어쓰기 (예: search=50,lotto=0)")
+    parser.add_argument("--profile", help="엔드포인트별 지연/오류율 JSON")
+    parser.add_argument("--payload-dir", help="녹화된 업스트림 응답 디렉터리")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--target", help="이미 실행 중인 서버 주소 (생략 시 같은 프로세스에서 실행)")
+    parser.add_argument("--stub-port", type=int, default=0, help="스텁 첫 포트 (--target 사용 시 고정 포트 필요)")
+    parser.add_argument("--print-env", action="store_true", help="스텁 환경변수만 출력하고 대기")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    cluster = StubCluster(load_profile(args.profile), args.payload_dir, args.stub_port, args.seed).start()
+
+    try:
+        if args.print_env:
+            for key, value in {**BENCH_CREDENTIALS, **cluster.env()}.items():
+                print(f"export {key}={value}")
+            print("# Ctrl+C 로 종료", flush=True)
+            while True:
+                time.sleep(60)
+
+        upstream_by_command = None
+        if args.target:
+            target = args.target
+            if not wait_for_target(target):
+                raise SystemExit(f"{target}/health 응답 없음")
+        else:
+            _, target, upstream_by_command = start_inprocess_app(cluster.env())
+
+        runner = LoadRunner(target, args.requests, args.concurrency, parse_mix(args.mix), seed=args.seed)
+        duration = runner.run()
+        report = build_report(runner.samples, duration, cluster.counts(), upstream_by_command)
+    except KeyboardInterrupt:
+        return
+    finally:
+        cluster.stop()
+
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        print("")
+        print_comparison(base, report)
+
+if __name__ == "__main__":
+    main()
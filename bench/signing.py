@@ -0,0 +1,66 @@
+"""검색광고 API 서명: 호출마다 새 HMAC vs NaverAdSigner 비교
+
+이전 get_naver_api_headers (비밀키 인코딩 → hmac.new → 헤더 dict 생성) 와
+스레드별로 미리 키를 넣은 HMAC 을 copy 하는 NaverAdSigner.headers 의 호출당 시간을 잰다.
+
+    python -m bench.signing --calls 200000
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import time
+
+from bench.run import BENCH_CREDENTIALS
+
+def legacy_headers(api_key, secret_key, customer_id, method, uri):
+    timestamp = str(int(time.time() * 1000))
+    message = f"{timestamp}.{method}.{uri}"
+    signature = hmac.new(secret_key.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).digest()
+    signature_base64 = base64.b64encode(signature).decode('utf-8')
+    return {
+        "Content-Type": "application/json; charset=UTF-8",
+        "X-Timestamp": timestamp,
+        "X-API-KEY": api_key,
+        "X-Customer": str(customer_id),
+        "X-Signature": signature_base64
+    }
+
+def per_call(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="검색광고 API 서명 마이크로 벤치마크")
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--uri", default="/estimate/average-position-bid/keyword")
+    args = parser.parse_args(argv)
+
+    import app as bot
+
+    api_key, secret_key, customer_id = (
+        BENCH_CREDENTIALS["NAVER_API_KEY"], BENCH_CREDENTIALS["NAVER_SECRET_KEY"], BENCH_CREDENTIALS["NAVER_CUSTOMER_ID"]
+    )
+    signer = bot.NaverAdSigner(api_key, secret_key, customer_id, "https://api.searchad.naver.com")
+
+    # 같은 타임스탬프면 같은 서명인지 먼저 확인
+    expected = legacy_headers(api_key, secret_key, customer_id, "POST", args.uri)
+    signed = signer.headers("POST", args.uri)
+    if signed["X-Timestamp"] == expected["X-Timestamp"] and signed != expected:
+        raise SystemExit("서명이 이전 구현과 다릅니다")
+
+    legacy = per_call(lambda: legacy_headers(api_key, secret_key, customer_id, "POST", args.uri), args.calls)
+    cached = per_call(lambda: signer.headers("POST", args.uri), args.calls)
+
+    print(f"서명 {args.calls:,}회")
+    print("")
+    print(f"{'방식':<16}{'호출당(µs)':>12}")
+    print(f"{'호출마다 hmac.new':<16}{legacy * 1e6:>12.2f}")
+    print(f"{'NaverAdSigner':<16}{cached * 1e6:>12.2f}")
+    print("")
+    print(f"{legacy / cached:.2f}배")
+
+if __name__ == "__main__":
+    main()
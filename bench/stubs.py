@@ -0,0 +1,353 @@
+"""업스트림 스텁 서버
+
+검색광고, DataLab, 연관검색어, 네이버/유튜브 자동완성, 플레이스, Gemini 를 대신하는
+로컬 HTTP 서버. 엔드포인트별로 지연 분포와 오류율을 설정할 수 있고, payload_dir 에
+<엔드포인트>.json / .html / .txt 파일이 있으면 녹화된 응답을 그대로 돌려준다.
+
+단독 실행 (다른 프로세스에서 띄운 서버를 스텁에 연결할 때):
+    python -m bench.stubs --port 9100 [--profile profile.json] [--payload-dir payloads/]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+#############################################
+# 업스트림 정의
+#############################################
+# 엔드포인트 이름은 app.py 의 upstream_request 메트릭 라벨과 같다
+UPSTREAMS = {
+    "searchad": {
+        "env": "SEARCHAD_BASE_URL",
+        "routes": [
+            ("GET", r"^/keywordstool$", "keywordstool"),
+            ("POST", r"^/estimate/performance/keyword$", "performance"),
+            ("POST", r"^/estimate/average-position-bid/keyword$", "average-position-bid"),
+        ],
+    },
+    "openapi": {
+        "env": "NAVER_OPENAPI_BASE_URL",
+        "routes": [("POST", r"^/v1/datalab/search$", "datalab")],
+    },
+    "search": {
+        "env": "NAVER_SEARCH_BASE_URL",
+        "routes": [("GET", r"^/search\.naver$", "related")],
+    },
+    "ac": {
+        "env": "NAVER_AC_BASE_URL",
+        "routes": [("GET", r"^/nx/ac$", "ac")],
+    },
+    "suggest": {
+        "env": "YOUTUBE_AC_BASE_URL",
+        "routes": [("GET", r"^/complete/search$", "youtube-ac")],
+    },
+    "place": {
+        "env": "NAVER_PLACE_BASE_URL",
+        "routes": [("GET", r"^/(restaurant|place|cafe)/(\d+)/home$", "place")],
+    },
+    "gemini": {
+        "env": "GEMINI_BASE_URL",
+        "routes": [("POST", r"^/v1beta/models/[^/]+:generateContent$", "gemini")],
+    },
+}
+
+DEFAULT_PROFILE = {
+    "keywordstool": {"latency": {"dist": "lognormal", "median_ms": 180, "sigma": 0.4}, "error_rate": 0.0},
+    "performance": {"latency": {"dist": "lognormal", "median_ms": 250, "sigma": 0.4}, "error_rate": 0.0},
+    "average-position-bid": {"latency": {"dist": "lognormal", "median_ms": 220, "sigma": 0.4}, "error_rate": 0.0},
+    "datalab": {"latency": {"dist": "lognormal", "median_ms": 600, "sigma": 0.5}, "error_rate": 0.0},
+    "related": {"latency": {"dist": "lognormal", "median_ms": 300, "sigma": 0.4}, "error_rate": 0.0},
+    "ac": {"latency": {"dist": "lognormal", "median_ms": 60, "sigma": 0.3}, "error_rate": 0.0},
+    "youtube-ac": {"latency": {"dist": "lognormal", "median_ms": 80, "sigma": 0.3}, "error_rate": 0.0},
+    "place": {"latency": {"dist": "lognormal", "median_ms": 350, "sigma": 0.4}, "error_rate": 0.0},
+    "gemini": {"latency": {"dist": "lognormal", "median_ms": 1500, "sigma": 0.3}, "error_rate": 0.0},
+}
+
+def load_profile(path=None):
+    """기본 프로필에 JSON 파일의 엔드포인트별 설정을 덮어씀"""
+    profile = {name: dict(spec) for name, spec in DEFAULT_PROFILE.items()}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for name, spec in json.load(f).items():
+                profile.setdefault(name, {}).update(spec)
+    return profile
+
+def sample_latency(spec, rng):
+    """지연 시간(초) 샘플링: fixed / uniform / lognormal"""
+    if not spec:
+        return 0.0
+    dist = spec.get("dist", "fixed")
+    if dist == "fixed":
+        return spec.get("ms", 0) / 1000
+    if dist == "uniform":
+        return rng.uniform(spec["min_ms"], spec["max_ms"]) / 1000
+    if dist == "lognormal":
+        return rng.lognormvariate(0, spec.get("sigma", 0.5)) * spec["median_ms"] / 1000
+    raise ValueError(f"알 수 없는 지연 분포: {dist}")
+
+#############################################
+# 합성 응답
+#############################################
+def _seed(*parts):
+    return int(hashlib.md5("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:8], 16)
+
+def _volume(keyword):
+    return 50 + _seed(keyword) % 50000
+
+def payload_keywordstool(match, query, body):
+    hints = query.get("hintKeywords", [""])[0].split(",")
+    rows = []
+    # 힌트 키워드마다 한 행, 첫 힌트에는 연관 키워드 행을 덧붙임 (실제 API 와 같은 순서)
+    for i, keyword in enumerate(hints + [f"{hints[0]}{suffix}" for suffix in ["추천", "가격", "후기", "순위", "예약", "근처"]]):
+        volume = _volume(keyword)
+        pc = volume // 4
+        rows.append({
+            "relKeyword": keyword,
+            "monthlyPcQcCnt": pc if pc >= 10 else "< 10",
+            "monthlyMobileQcCnt": volume - pc,
+            "monthlyAvePcClkCnt": round(pc * 0.012, 1),
+            "monthlyAveMobileClkCnt": round((volume - pc) * 0.018, 1),
+            "compIdx": ["낮음", "중간", "높음"][_seed(keyword, "comp") % 3],
+        })
+    return 200, "application/json", {"keywordList": rows}
+
+def payload_performance(match, query, body):
+    keyword = body.get("key", "")
+    ceiling = 20 + _volume(keyword) // 200
+    estimates = []
+    for bid in body.get("bids", []):
+        clicks = int(ceiling * (1 - 2.718 ** (-bid / 1500)))
+        estimates.append({"bid": bid, "clicks": clicks, "impressions": clicks * 40, "cost": int(clicks * bid * 0.7)})
+    return 200, "application/json", {"device": body.get("device"), "keywordplus": False, "key": keyword, "estimate": estimates}
+
+def payload_average_position_bid(match, query, body):
+    estimates = []
+    for item in body.get("items", []):
+        top = 300 + _seed(item.get("key"), body.get("device")) % 9000
+        estimates.append({"key": item.get("key"), "position": item.get("position"), "bid": max(70, top // item.get("position", 1) // 10 * 10)})
+    return 200, "application/json", {"device": body.get("device"), "estimate": estimates}
+
+def payload_datalab(match, query, body):
+    start_year = int(body.get("startDate", "2024-01-01")[:4])
+    results = []
+    for group in body.get("keywordGroups", []):
+        data = [
+            {"period": f"{start_year}-{month:02d}-01", "ratio": 20 + _seed(group["groupName"], start_year, month) % 8000 / 100}
+            for month in range(1, 12)
+        ]
+        results.append({"title": group["groupName"], "keywords": group.get("keywords", []), "data": data})
+    return 200, "application/json", {"startDate": body.get("startDate"), "endDate": body.get("endDate"), "timeUnit": "month", "results": results}
+
+def payload_related(match, query, body):
+    keyword = query.get("query", [""])[0]
+    divs = "".join(f'<div class="tit">{keyword} 연관{i}</div>' for i in range(1, 13))
+    return 200, "text/html; charset=utf-8", f"<html><body>{'<p>filler</p>' * 200}{divs}</body></html>"
+
+def payload_ac(match, query, body):
+    keyword = query.get("q", [""])[0]
+    return 200, "application/json", {"query": [keyword], "items": [[[f"{keyword} {i}"] for i in range(1, 11)]]}
+
+def payload_youtube_ac(match, query, body):
+    keyword = query.get("q", [""])[0]
+    data = [keyword, [[f"{keyword} 브이로그 {i}", 0] for i in range(1, 11)], {"k": 1}]
+    return 200, "text/javascript; charset=utf-8", f"window.google.ac.h({json.dumps(data, ensure_ascii=False)})"
+
+def payload_place(match, query, body):
+    category, place_id = match.group(1), match.group(2)
+    if ["restaurant", "place", "cafe"][int(place_id) % 3] != category:
+        return 404, "text/html; charset=utf-8", "<html>Not Found</html>"
+    keywords = json.dumps([f"키워드{place_id[-3:]}{i}" for i in range(1, 6)], ensure_ascii=False)
+    return 200, "text/html; charset=utf-8", f'<html><script>{"x" * 20000}"keywordList":{keywords},"other":1</script></html>'
+
+def payload_gemini(match, query, body):
+    return 200, "application/json", {
+        "candidates": [{"content": {"parts": [{"text": "[오늘의 운세]\n\n총운: 스텁 응답입니다.\n행운의 숫자: 1, 2, 3"}]}}]
+    }
+
+PAYLOADS = {
+    "keywordstool": payload_keywordstool,
+    "performance": payload_performance,
+    "average-position-bid": payload_average_position_bid,
+    "datalab": payload_datalab,
+    "related": payload_related,
+    "ac": payload_ac,
+    "youtube-ac": payload_youtube_ac,
+    "place": payload_place,
+    "gemini": payload_gemini,
+}
+
+def load_recorded_payloads(payload_dir):
+    """<엔드포인트>.json|.html|.txt → (content_type, bytes)"""
+    recorded = {}
+    if not payload_dir:
+        return recorded
+    content_types = {".json": "application/json", ".html": "text/html; charset=utf-8", ".txt": "text/plain; charset=utf-8"}
+    for filename in os.listdir(payload_dir):
+        endpoint, ext = os.path.splitext(filename)
+        if endpoint in PAYLOADS and ext in content_types:
+            with open(os.path.join(payload_dir, filename), "rb") as f:
+                recorded[endpoint] = (content_types[ext], f.read())
+    return recorded
+
+#############################################
+# 스텁 서버
+#############################################
+class StubServer:
+    """업스트림 하나를 흉내내는 스레드 HTTP 서버"""
+
+    def __init__(self, name, profile, recorded=None, port=0, seed=None):
+        self.name = name
+        self.routes = [(method, re.compile(pattern), endpoint) for method, pattern, endpoint in UPSTREAMS[name]["routes"]]
+        self.profile = profile
+        self.recorded = recorded or {}
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.counts = {}
+        self.counts_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name=f"stub-{self.name}", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_counts(self):
+        with self.counts_lock:
+            self.counts = {}
+
+    def _count(self, endpoint):
+        with self.counts_lock:
+            self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+
+    def _sample(self, endpoint):
+        spec = self.profile.get(endpoint, {})
+        with self.rng_lock:
+            delay = sample_latency(spec.get("latency"), self.rng)
+            failed = self.rng.random() < spec.get("error_rate", 0)
+        return delay, failed
+
+    def respond(self, method, raw_path, raw_body):
+        parsed = urlparse(raw_path)
+        for route_method, pattern, endpoint in self.routes:
+            match = pattern.match(parsed.path)
+            if route_method != method or not match:
+                continue
+
+            self._count(endpoint)
+            delay, failed = self._sample(endpoint)
+            time.sleep(delay)
+
+            if failed:
+                return 500, "application/json", b'{"error": "stub failure"}'
+            if endpoint in self.recorded:
+                content_type, content = self.recorded[endpoint]
+                return 200, content_type, content
+
+            body = json.loads(raw_body) if raw_body else {}
+            status, content_type, content = PAYLOADS[endpoint](match, parse_qs(parsed.query), body)
+            if not isinstance(content, str):
+                content = json.dumps(content, ensure_ascii=False)
+            return status, content_type, content.encode("utf-8")
+
+        return 404, "text/plain", b"no stub route"
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw_body = self.rfile.read(length) if length else b""
+                status, content_type, content = stub.respond(method, self.path, raw_body)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+class StubCluster:
+    """업스트림 전체 스텁 묶음"""
+
+    def __init__(self, profile=None, payload_dir=None, base_port=0, seed=None):
+        profile = profile or load_profile()
+        recorded = load_recorded_payloads(payload_dir)
+        self.servers = {}
+        for i, name in enumerate(UPSTREAMS):
+            port = base_port + i if base_port else 0
+            self.servers[name] = StubServer(name, profile, recorded, port=port, seed=None if seed is None else seed + i)
+
+    def start(self):
+        for server in self.servers.values():
+            server.start()
+        return self
+
+    def stop(self):
+        for server in self.servers.values():
+            server.stop()
+
+    def env(self):
+        """app.py 가 스텁을 보도록 하는 환경변수"""
+        return {UPSTREAMS[name]["env"]: server.base_url for name, server in self.servers.items()}
+
+    def counts(self):
+        merged = {}
+        for server in self.servers.values():
+            with server.counts_lock:
+                merged.update(server.counts)
+        return merged
+
+    def reset_counts(self):
+        for server in self.servers.values():
+            server.reset_counts()
+
+def main():
+    parser = argparse.ArgumentParser(description="업스트림 스텁 서버 실행")
+    parser.add_argument("--port", type=int, default=9100, help="첫 번째 스텁 포트 (이후 연속 포트 사용)")
+    parser.add_argument("--profile", help="엔드포인트별 지연/오류율 JSON")
+    parser.add_argument("--payload-dir", help="녹화된 응답 디렉터리")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    cluster = StubCluster(load_profile(args.profile), args.payload_dir, args.port, args.seed).start()
+    for key, value in cluster.env().items():
+        print(f"export {key}={value}")
+    print("export NAVER_API_KEY=bench NAVER_SECRET_KEY=bench NAVER_CUSTOMER_ID=1 "
+          "NAVER_CLIENT_ID=bench NAVER_CLIENT_SECRET=bench GEMINI_API_KEY=bench", flush=True)
+
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        cluster.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""운영용 gunicorn 설정
+
+    gunicorn -c gunicorn.conf.py app:app
+
+모든 값은 환경변수로 덮어쓸 수 있다.
+업스트림 대기가 대부분이라 스레드 워커(gthread)를 쓰고, preload_app 으로
+부모에서 한 번만 import 한 뒤 fork 해 메모리를 공유한다.
+"""
+import os
+import threading
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# 광고 → 순위/전체/입찰가 대화 상태(user_sessions)가 프로세스 메모리에 있으므로 워커는 1개,
+# 동시성은 스레드 수(= 동시 업스트림 대기 수)로 늘린다. 워커를 늘리면 후속 메시지가
+# 세션이 없는 워커로 가서 대화가 끊긴다.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# gthread 에서 timeout 은 요청 제한 시간이 아니라 워커 무응답(하트비트) 감지 시간이다.
+# 카카오 5초 응답 제한은 업스트림 호출별 timeout 으로 지키고, 여기서는 멈춘 워커만 교체한다.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 10))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# 메모리 누수/단편화 대비 주기적 워커 교체 (동시 재시작 방지용 jitter)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG') or None
+loglevel = os.environ.get('LOG_LEVEL', 'info').lower()
+
+WARM_UPSTREAMS = os.environ.get('WARM_UPSTREAMS', '1') == '1'
+
+def post_fork(server, worker):
+    """로깅 시작 + 캐시 스냅샷 복원 + 응답 풀 채우기 + 업스트림 커넥션 예열 (요청 수락은 막지 않음)"""
+    import app as bot
+
+    bot.configure_logging()
+    bot.load_cache_snapshot()
+    for pool in bot.response_pools:
+        pool.schedule_refill()
+    if WARM_UPSTREAMS:
+        threading.Thread(target=bot.warm_upstream_connections, name="warmup", daemon=True).start()
+
+def worker_exit(server, worker):
+    """max_requests 교체/종료 시 다음 워커가 이어받을 캐시 저장 + 모아 둔 운세 대상 기록"""
+    import app as bot
+
+    bot.save_cache_snapshot()
+    bot.flush_fortune_subjects()
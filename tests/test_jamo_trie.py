@@ -0,0 +1,112 @@
+"""JamoTrie: 자모 접두사 자동완성 색인"""
+import pytest
+
+import app as bot
+
+def test_decompose_splits_syllables_and_compounds():
+    assert bot.decompose_jamo("강남 맛집") == "ㄱㅏㅇㄴㅏㅁㅁㅏㅅㅈㅣㅂ"
+    assert bot.decompose_jamo("과") == "ㄱㅗㅏ"
+    assert bot.decompose_jamo("ㅘ") == "ㅗㅏ"
+    assert bot.decompose_jamo("iPhone") == "iphone"
+
+def test_partial_syllable_matches_as_prefix():
+    trie = bot.JamoTrie(top_k=3)
+    trie.learn("강", ["강남", "강릉"])
+    assert trie.lookup("강") == ["강남", "강릉"]
+    # '가' 와 '고' 는 '강', '과' 를 치는 중간 상태
+    trie.learn("가", [])
+    assert trie.lookup("가") == ["강남", "강릉"]
+    trie.learn("고", ["과자"])
+    assert trie.lookup("고") == ["과자"]
+
+def test_only_recently_fetched_prefixes_are_answered(monkeypatch):
+    trie = bot.JamoTrie(top_k=3)
+    # keywordstool 행만으로는 답하지 않음
+    for word in ("강남", "강릉", "강원", "강화"):
+        trie.add(word, 1.0)
+    assert trie.lookup("강") is None
+    assert trie.lookup("없음") is None
+    
+    trie.learn("강", [])
+    assert len(trie.lookup("강")) == 3
+    
+    monkeypatch.setattr(bot, "AC_INDEX_TTL", 0)
+    assert trie.lookup("강") is None
+
+def test_top_k_keeps_heaviest_words():
+    trie = bot.JamoTrie(top_k=2)
+    trie.add("강남", 1.0)
+    trie.add("강릉", 3.0)
+    trie.add("강원", 2.0)
+    trie.add("강남", 5.0)
+    trie.learn("강", [])
+    assert trie.lookup("강", limit=2) == ["강남", "강릉"]
+
+def test_exact_word_is_not_suggested_for_itself():
+    trie = bot.JamoTrie()
+    trie.learn("강남", ["강남", "강남역"])
+    assert trie.lookup("강남") == ["강남역"]
+
+def test_prefix_longer_than_depth_is_not_answered():
+    trie = bot.JamoTrie(max_depth=3)
+    trie.learn("강", ["강남역"])
+    assert trie.lookup("강") == ["강남역"]
+    assert trie.lookup("강남") is None
+    # 깊이 밖 노드는 만들지 않음
+    trie.learn("강남역", ["강남역 맛집"])
+    assert trie._node(bot.decompose_jamo("강남")) is None
+
+def test_full_index_evicts_lightest_words():
+    trie = bot.JamoTrie(max_words=3, top_k=5)
+    trie.add("강남", 5.0)
+    trie.add("강릉", 1.0)
+    trie.add("강원", 3.0)
+    trie.add("강화", 0.5)
+    # 90% (2개) 까지 줄인 뒤 새 단어는 그대로 들어감
+    assert set(trie.words) == {"강남", "강원", "강화"}
+    trie.learn("강", [])
+    assert trie.lookup("강", limit=3) == ["강남", "강원", "강화"]
+
+def test_learned_prefixes_do_not_create_nodes():
+    trie = bot.JamoTrie(max_prefixes=2)
+    trie.learn("가", [])
+    trie.learn("나", [])
+    trie.learn("다", [])
+    assert trie.root.children == {}
+    assert list(trie.fetched) == [bot.decompose_jamo("나"), bot.decompose_jamo("다")]
+
+def test_learn_ranks_earlier_suggestions_higher():
+    trie = bot.JamoTrie()
+    trie.learn("서", ["서울", "서면", "서초"])
+    assert trie.lookup("서") == ["서울", "서면", "서초"]
+
+@pytest.fixture
+def fresh_indexes(monkeypatch):
+    monkeypatch.setattr(bot, "api_cache", {})
+    monkeypatch.setattr(bot, "autocomplete_indexes", {"naver": bot.JamoTrie(), "youtube": bot.JamoTrie()})
+
+def test_lookup_autocomplete_calls_live_only_for_unseen_prefixes(fresh_indexes):
+    calls = []
+    
+    def fetch(keyword):
+        calls.append(keyword)
+        return {"success": True, "data": [f"{keyword} 맛집", f"{keyword}역"]}
+    
+    assert bot.lookup_autocomplete("naver", "강남", fetch)["data"] == ["강남 맛집", "강남역"]
+    bot.api_cache.clear()
+    # 같은 접두사는 캐시가 비어도 색인이 바로 답함
+    assert bot.lookup_autocomplete("naver", "강남", fetch)["data"] == ["강남 맛집", "강남역"]
+    assert calls == ["강남"]
+    
+    bot.lookup_autocomplete("naver", "홍대", fetch)
+    assert calls == ["강남", "홍대"]
+
+def test_lookup_autocomplete_without_live_uses_cache_only(fresh_indexes):
+    def fetch(keyword):
+        raise AssertionError("실시간 조회 불가")
+    
+    token = bot.autocomplete_live.set(False)
+    try:
+        assert bot.lookup_autocomplete("youtube", "강남", fetch)["success"] is False
+    finally:
+        bot.autocomplete_live.reset(token)
@@ -0,0 +1,82 @@
+"""키워드 인기도: Count-Min Sketch, Space-Saving 과 인기도 기반 캐시 제거"""
+import app as bot
+
+def test_sketch_never_underestimates():
+    sketch = bot.CountMinSketch(width=16, depth=3)
+    counts = {f"k{i}": i % 7 + 1 for i in range(100)}
+    for key, count in counts.items():
+        for _ in range(count):
+            sketch.add(key)
+    assert all(sketch.estimate(key) >= count for key, count in counts.items())
+
+def test_sketch_is_exact_without_collisions():
+    sketch = bot.CountMinSketch()
+    assert sketch.add("강남", 3) == 3
+    sketch.add("강남")
+    assert sketch.estimate("강남") == 4
+    assert sketch.estimate("없음") == 0
+
+def test_sketch_halve():
+    sketch = bot.CountMinSketch()
+    sketch.add("강남", 5)
+    sketch.halve()
+    assert sketch.estimate("강남") == 2
+
+def test_space_saving_keeps_heavy_hitters():
+    tracker = bot.SpaceSaving(capacity=3)
+    # 전체 합 / capacity 보다 많은 키는 교체되지 않음
+    for key, count in (("a", 30), ("b", 25), ("c", 6)):
+        tracker.add(key, count)
+    for i in range(10):
+        tracker.add(f"rare{i}")
+    assert len(tracker.items) == 3
+    assert [key for key, _ in tracker.top(2)] == ["a", "b"]
+
+def test_space_saving_replacement_inherits_floor_as_error():
+    tracker = bot.SpaceSaving(capacity=2)
+    tracker.add("a", 5)
+    tracker.add("b", 2)
+    tracker.add("c")
+    assert "b" not in tracker.items
+    assert tracker.items["c"] == (3, 2)
+
+def test_space_saving_halve_drops_zeroed_items():
+    tracker = bot.SpaceSaving(capacity=3)
+    tracker.add("a", 4)
+    tracker.add("b", 1)
+    tracker.halve()
+    assert tracker.items == {"a": (2, 0)}
+
+def test_popularity_tracks_commands_and_decays():
+    popularity = bot.KeywordPopularity(top_k=5, decay_every=4)
+    popularity.record("강남", "search")
+    popularity.record("강남", "rank")
+    popularity.record("홍대", "rank")
+    assert popularity.estimate("강남") == 2
+    assert popularity.top(command="rank") in ([("강남", 1), ("홍대", 1)], [("홍대", 1), ("강남", 1)])
+    assert popularity.top(command="none") == []
+    
+    popularity.record("강남", "search")
+    assert popularity.estimate("강남") == 1
+    assert popularity.top(1) == [("강남", 1)]
+
+def test_cache_eviction_prefers_unpopular_keys(monkeypatch):
+    monkeypatch.setattr(bot, "api_cache", {})
+    monkeypatch.setattr(bot, "API_CACHE_MAX_ENTRIES", 10)
+    popularity = bot.KeywordPopularity()
+    monkeypatch.setattr(bot, "keyword_popularity", popularity)
+    for _ in range(3):
+        popularity.record("hot")
+    
+    bot.store_cache_entry("dl_hot_2024-01-01_2024-01-31", {"success": True})
+    for i in range(10):
+        bot.store_cache_entry(f"kw_cold{i}", {"success": True})
+    
+    assert len(bot.api_cache) == 9
+    assert "dl_hot_2024-01-01_2024-01-31" in bot.api_cache
+    assert "kw_cold9" in bot.api_cache
+
+def test_cache_key_keyword():
+    assert bot.cache_key_keyword("kw_강남") == "강남"
+    assert bot.cache_key_keyword("dl_강남_맛집_2024-01-01_2024-01-31") == "강남_맛집"
+    assert bot.cache_key_keyword("perf_강남_MOBILE") == "강남"
@@ -0,0 +1,73 @@
+"""RankIndex: bidLandscape → 순위/점유율 조회"""
+import pytest
+
+import app as bot
+
+LANDSCAPE = [
+    {"rank": 1, "mobileBid": 5000, "pcBid": 4000},
+    {"rank": 2, "mobileBid": 3000, "pcBid": 2500},
+    {"rank": 3, "mobileBid": 2000, "pcBid": 1500},
+    {"rank": 4, "mobileBid": 1000, "pcBid": 800},
+    {"rank": 5, "mobileBid": 500, "pcBid": 300},
+]
+
+@pytest.fixture
+def index():
+    return bot.RankIndex.from_landscape(LANDSCAPE)
+
+def test_exact_threshold_gets_that_rank(index):
+    result = index.lookup(2000)
+    assert result == {"rank": 3, "rank_text": "3위", "share": bot.IMPRESSION_SHARE_BY_RANK[3]}
+
+def test_share_interpolates_between_ranks(index):
+    # 3위(55) 와 2위(70) 기준의 중간 입찰가
+    assert index.lookup(2500)["rank"] == 3
+    assert index.lookup(2500)["share"] == 62
+
+def test_above_top_bid_is_first(index):
+    assert index.lookup(100000)["rank"] == 1
+    assert index.lookup(100000)["share"] == bot.IMPRESSION_SHARE_BY_RANK[1]
+
+def test_below_floor_reports_min_bid(index):
+    assert index.lookup(400) == {"rank": 99, "rank_text": "광고 미노출 가능", "share": 5, "min_bid": 500}
+
+def test_devices_are_indexed_separately(index):
+    assert index.lookup(1500, 'PC')["rank"] == 3
+    assert index.lookup(1500, 'MOBILE')["rank"] == 4
+
+def test_empty_landscape():
+    index = bot.RankIndex.from_landscape([])
+    assert index.lookup(1000) == {"rank": 99, "rank_text": "미확인", "share": 10}
+    assert index.lookup_many([100, 1000]) == ([99, 99], [10, 10])
+
+def test_lower_rank_with_higher_bid_uses_floor():
+    # 2위 입찰가가 1위보다 높아도 2위 기준은 1~2위 최소값
+    index = bot.RankIndex.from_landscape([
+        {"rank": 1, "mobileBid": 3000},
+        {"rank": 2, "mobileBid": 4000},
+        {"rank": 3, "mobileBid": 1000},
+    ])
+    assert index.lookup(3000)["rank"] == 1
+    assert index.lookup(2000)["rank"] == 3
+
+def test_invalid_items_are_skipped():
+    index = bot.RankIndex.from_landscape([
+        {"rank": "x", "mobileBid": 9000},
+        {"rank": 2, "mobileBid": None},
+        {"rank": 3, "mobileBid": 700},
+    ])
+    assert index.lookup(700)["rank"] == 3
+    assert index.lookup(9000)["rank"] == 3
+
+def test_lookup_many_matches_lookup(index):
+    bids = [100, 500, 750, 1000, 2500, 3000, 4999, 5000, 8000]
+    ranks, shares = index.lookup_many(bids)
+    assert ranks == [index.lookup(b)["rank"] for b in bids]
+    assert shares == [index.lookup(b)["share"] for b in bids]
+
+def test_rank_bids_data_carries_index():
+    data = bot.rank_bids_data({"MOBILE": [{"bid": 2000}, {"bid": 900}], "PC": []})
+    assert bot.rank_index_of(data).lookup(1000)["rank"] == 2
+
+def test_rank_index_of_rebuilds_for_old_cache_entries():
+    assert bot.rank_index_of({"bidLandscape": LANDSCAPE}).lookup(2000)["rank"] == 3
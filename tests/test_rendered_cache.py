@@ -0,0 +1,79 @@
+"""렌더링 응답 캐시: 의존 데이터 캐시 기준 무효화와 크기 상한"""
+import time
+
+import pytest
+
+import app as bot
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(bot, "api_cache", {})
+    monkeypatch.setattr(bot, "rendered_cache", {})
+    monkeypatch.setattr(bot, "keyword_popularity", bot.KeywordPopularity())
+
+@pytest.fixture
+def render_calls(monkeypatch):
+    """kw_<키워드> 를 채우고 렌더링 횟수를 세는 가짜 명령"""
+    calls = []
+    
+    def render(keyword):
+        calls.append(keyword)
+        bot.api_cache.setdefault(f"kw_{keyword}", ({"success": True}, time.time()))
+        return f"{keyword} 결과"
+    
+    monkeypatch.setitem(bot.RENDERED_COMMANDS, "fake", (render, lambda kw: [f"kw_{kw}"]))
+    with bot.app.app_context():
+        yield calls
+
+def test_valid_while_dependency_unchanged():
+    bot.api_cache["kw_a"] = ({"success": True}, time.time())
+    versions = bot.snapshot_cache_versions(["kw_a", "kw_missing"])
+    assert bot.is_rendered_entry_valid(versions)
+
+def test_invalid_after_dependency_refresh():
+    bot.api_cache["kw_a"] = ({"success": True}, time.time() - 10)
+    versions = bot.snapshot_cache_versions(["kw_a"])
+    bot.api_cache["kw_a"] = ({"success": True}, time.time())
+    assert not bot.is_rendered_entry_valid(versions)
+
+def test_invalid_after_dependency_eviction():
+    bot.api_cache["kw_a"] = ({"success": True}, time.time())
+    versions = bot.snapshot_cache_versions(["kw_a"])
+    del bot.api_cache["kw_a"]
+    assert not bot.is_rendered_entry_valid(versions)
+
+def test_invalid_once_ttl_passes():
+    bot.api_cache["kw_a"] = ({"success": True}, time.time() - bot.RENDERED_CACHE_TTL)
+    assert not bot.is_rendered_entry_valid(bot.snapshot_cache_versions(["kw_a"]))
+
+def test_failed_dependency_is_not_snapshotted():
+    bot.api_cache["kw_a"] = ({"success": True}, time.time())
+    bot.api_cache["kw_b"] = ({"success": False, "error": "timeout"}, time.time())
+    assert bot.snapshot_cache_versions(["kw_a", "kw_b"]) is None
+
+def test_cached_response_reused_until_dependency_changes(render_calls):
+    first = bot.create_cached_kakao_response("fake", "a").get_data()
+    assert bot.create_cached_kakao_response("fake", "a").get_data() == first
+    assert render_calls == ["a"]
+    
+    bot.api_cache["kw_a"] = ({"success": True}, time.time() + 1)
+    bot.create_cached_kakao_response("fake", "a")
+    assert render_calls == ["a", "a"]
+
+def test_response_without_cached_dependency_is_not_stored(monkeypatch):
+    monkeypatch.setitem(bot.RENDERED_COMMANDS, "fake", (lambda kw: "결과", lambda kw: [f"kw_{kw}"]))
+    with bot.app.app_context():
+        bot.create_cached_kakao_response("fake", "a")
+    assert bot.rendered_cache == {}
+
+def test_eviction_keeps_popular_entries(monkeypatch, render_calls):
+    monkeypatch.setattr(bot, "RENDERED_CACHE_MAX_ENTRIES", 10)
+    for _ in range(5):
+        bot.keyword_popularity.record("hot")
+    for keyword in ["hot"] + [f"k{i}" for i in range(10)]:
+        bot.create_cached_kakao_response("fake", keyword)
+    
+    assert len(bot.rendered_cache) == 9
+    assert ("fake", "hot") in bot.rendered_cache
+    assert ("fake", "k9") in bot.rendered_cache
+    assert ("fake", "k0") not in bot.rendered_cache
@@ -0,0 +1,93 @@
+"""ResponsePool: 미리 만든 카카오 응답 링 버퍼와 백그라운드 보충"""
+import json
+
+import pytest
+
+import app as bot
+
+@pytest.fixture
+def submitted(monkeypatch):
+    """보충 작업을 실행하지 않고 모아 두는 submit_with_context 대역"""
+    jobs = []
+    monkeypatch.setattr(bot, "response_pools", [])
+    monkeypatch.setattr(bot, "submit_with_context", lambda func, *args, executor=None: jobs.append((func, args)))
+    return jobs
+
+def make_pool(capacity=4, low_water=2):
+    requested = []
+    
+    def refill(count):
+        requested.append(count)
+        return [f"응답 {i}" for i in range(count)]
+    
+    return bot.ResponsePool("test", refill, capacity, low_water), requested
+
+def text_of(body):
+    return json.loads(body)["template"]["outputs"][0]["simpleText"]["text"]
+
+def test_empty_pool_schedules_single_refill(submitted):
+    pool, requested = make_pool()
+    assert pool.pop() is None
+    assert pool.pop() is None
+    assert len(submitted) == 1
+    
+    func, args = submitted[0]
+    func(*args)
+    assert requested == [4]
+    assert len(pool.items) == 4
+    assert pool.refilling is False
+
+def test_pop_serves_serialized_responses_in_order(submitted):
+    pool, _ = make_pool()
+    pool.push(["첫째", "둘째", "셋째"])
+    with bot.app.app_context():
+        assert pool.pop() == bot.create_kakao_response("첫째").get_data()
+    assert text_of(pool.pop()) == "둘째"
+
+def test_refill_only_below_low_water(submitted):
+    pool, requested = make_pool(capacity=4, low_water=2)
+    pool.push(["a", "b", "c", "d"])
+    pool.pop()
+    pool.pop()
+    assert submitted == []
+    pool.pop()
+    assert len(submitted) == 1
+    
+    func, args = submitted[0]
+    func(*args)
+    # 남은 1개를 빼고 capacity 까지만 채움
+    assert requested == [3]
+    assert len(pool.items) == 4
+
+def test_push_never_exceeds_capacity(submitted):
+    pool, _ = make_pool(capacity=2)
+    pool.push(["a", "b", "c"])
+    assert len(pool.items) == 2
+
+def test_failed_refill_allows_retry(submitted):
+    def refill(count):
+        raise RuntimeError("upstream down")
+    
+    pool = bot.ResponsePool("test", refill, 4, 2)
+    pool.pop()
+    func, args = submitted.pop()
+    func(*args)
+    assert pool.refilling is False
+    pool.pop()
+    assert len(submitted) == 1
+
+def test_zero_capacity_disables_refill(submitted):
+    pool, _ = make_pool(capacity=0, low_water=0)
+    assert pool.pop() is None
+    pool.schedule_refill()
+    assert submitted == []
+
+def test_pool_is_registered_for_metrics(submitted):
+    pool, _ = make_pool()
+    assert bot.response_pools == [pool]
+
+def test_lotto_batch_is_local_without_gemini(monkeypatch):
+    monkeypatch.setattr(bot, "GEMINI_API_KEY", "")
+    texts = bot.generate_lotto_batch(5)
+    assert len(texts) == 5
+    assert all(text.startswith("[로또 번호 추천]") for text in texts)
@@ -0,0 +1,64 @@
+"""NaverAdSigner: 검색광고 API 서명과 시계 차이 보정"""
+import base64
+import email.utils
+import hashlib
+import hmac
+
+import pytest
+import requests
+
+import app as bot
+
+NOW = 1700000000.0
+
+@pytest.fixture
+def signer(monkeypatch):
+    monkeypatch.setattr(bot.time, "time", lambda: NOW)
+    return bot.NaverAdSigner("key", "secret", 1234, "https://api.searchad.naver.com")
+
+class FakeResponse:
+    def __init__(self, date=None):
+        self.headers = {} if date is None else {"Date": date}
+
+def server_date(offset):
+    return email.utils.formatdate(NOW + offset, usegmt=True)
+
+def test_headers_match_plain_hmac(signer):
+    headers = signer.headers("GET", "/keywordstool")
+    assert headers["X-Timestamp"] == str(int(NOW * 1000))
+    expected = hmac.new(b"secret", f"{headers['X-Timestamp']}.GET./keywordstool".encode(), hashlib.sha256).digest()
+    assert headers["X-Signature"] == base64.b64encode(expected).decode()
+    assert headers["X-API-KEY"] == "key"
+    assert headers["X-Customer"] == "1234"
+
+def test_skew_beyond_tolerance_shifts_timestamp(signer):
+    signer.observe_date(FakeResponse(server_date(10)))
+    # Date 는 초 단위로 잘려 있어 0.5초를 더해 추정
+    assert signer.clock_offset == pytest.approx(10.5)
+    assert signer.headers("GET", "/ncc/ads")["X-Timestamp"] == str(int((NOW + 10.5) * 1000))
+    
+    signer.observe_date(FakeResponse(server_date(-30)))
+    assert signer.clock_offset == pytest.approx(-29.5)
+
+def test_skew_within_tolerance_is_ignored(signer):
+    signer.observe_date(FakeResponse(server_date(1)))
+    assert signer.clock_offset == 0.0
+
+def test_offset_resets_once_clock_agrees(signer):
+    signer.observe_date(FakeResponse(server_date(10)))
+    signer.observe_date(FakeResponse(server_date(0)))
+    assert signer.clock_offset == 0.0
+
+def test_missing_or_invalid_date_keeps_offset(signer):
+    signer.observe_date(FakeResponse(server_date(10)))
+    response = FakeResponse()
+    assert signer.observe_date(response) is response
+    signer.observe_date(FakeResponse("not a date"))
+    assert signer.clock_offset == pytest.approx(10.5)
+
+def test_auth_hook_signs_path_below_base_url(monkeypatch):
+    monkeypatch.setattr(bot.time, "time", lambda: NOW)
+    signer = bot.NaverAdSigner("key", "secret", 1234, "http://127.0.0.1:9000/searchad")
+    request = requests.Request("GET", "http://127.0.0.1:9000/searchad/keywordstool", params={"hintKeywords": "a"}, auth=signer).prepare()
+    assert request.headers["X-Signature"] == signer.headers("GET", "/keywordstool")["X-Signature"]
+    assert signer.observe_date in request.hooks["response"]
@@ -0,0 +1,82 @@
+"""TokenBucket 과 rate_limited 컨텍스트"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app as bot
+
+class FakeClock:
+    """time.monotonic/sleep 대역: sleep 하면 시계만 앞으로"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(bot.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(bot.time, "sleep", clock.sleep)
+    return clock
+
+def test_burst_is_available_immediately(clock):
+    bucket = bot.TokenBucket(rate=2, burst=3)
+    assert all(bucket.acquire(timeout=0) for _ in range(3))
+    assert clock.slept == []
+    assert bucket.acquire(timeout=0) is False
+
+def test_acquire_waits_for_refill(clock):
+    bucket = bot.TokenBucket(rate=4, burst=1)
+    assert bucket.acquire()
+    assert bucket.acquire()
+    assert clock.slept == [pytest.approx(0.25)]
+
+def test_timeout_shorter_than_refill_fails(clock):
+    bucket = bot.TokenBucket(rate=1, burst=1)
+    bucket.acquire()
+    assert bucket.acquire(timeout=0.4) is False
+    assert sum(clock.slept) == pytest.approx(0.4)
+    # 기다린 만큼 채워진 토큰은 남아 있음
+    clock.now += 0.6
+    assert bucket.acquire(timeout=0)
+
+def test_tokens_do_not_exceed_burst(clock):
+    bucket = bot.TokenBucket(rate=10, burst=2)
+    clock.now += 60
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0) is False
+
+class SpyLimiter:
+    def __init__(self):
+        self.calls = 0
+    
+    def acquire(self, timeout=None):
+        self.calls += 1
+        return True
+
+class FakeResponse:
+    status_code = 200
+
+class FakeSession:
+    def request(self, method, url, **kwargs):
+        return FakeResponse()
+
+def test_rate_limited_applies_to_submitted_upstream_calls(monkeypatch):
+    monkeypatch.setattr(bot, "upstream_session", FakeSession())
+    limiter = SpyLimiter()
+    
+    with ThreadPoolExecutor(2) as executor:
+        with bot.rate_limited(limiter):
+            bot.upstream_request("test", "GET", "http://upstream.invalid/")
+            bot.submit_with_context(bot.upstream_request, "test", "GET", "http://upstream.invalid/", executor=executor).result()
+        bot.upstream_request("test", "GET", "http://upstream.invalid/")
+    
+    assert limiter.calls == 2
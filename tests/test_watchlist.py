@@ -0,0 +1,40 @@
+"""관심 키워드 등록 한도와 입찰가 추이 표시"""
+import threading
+
+import pytest
+
+import app as bot
+
+@pytest.fixture(autouse=True)
+def watch_db(monkeypatch, tmp_path):
+    monkeypatch.setattr(bot, "WATCHLIST_DB_PATH", str(tmp_path / "watchlist.db"))
+    monkeypatch.setattr(bot, "_watch_db_local", threading.local())
+    monkeypatch.setattr(bot, "WATCH_MAX_KEYWORDS", 2)
+
+def test_add_reports_registered_duplicate_and_limit():
+    assert bot.add_watch_keyword("u", "강남") is True
+    assert bot.add_watch_keyword("u", "홍대") is True
+    # 한도에서도 이미 등록된 키워드는 False
+    assert bot.add_watch_keyword("u", "강남") is False
+    assert bot.add_watch_keyword("u", "신촌") is None
+    assert bot.list_watch_keywords("u") == ["강남", "홍대"]
+    assert bot.add_watch_keyword("other", "신촌") is True
+
+def test_concurrent_adds_stay_within_limit():
+    barrier = threading.Barrier(8)
+    
+    def add(i):
+        barrier.wait()
+        bot.add_watch_keyword("u", f"k{i}")
+    
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(bot.list_watch_keywords("u")) == 2
+
+def test_trend_times_are_kst():
+    # 2023-11-14 22:13 UTC
+    bot.record_bid_point("강남", 1700000000, [100] * 5, [50] * 5)
+    assert "최근 11/15 07:13" in bot.format_bid_trend("강남")